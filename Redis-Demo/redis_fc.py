@@ -7,293 +7,3767 @@
 """
 
 import redis
+import redis.asyncio as aioredis
 import json
+import os
+import re
+import sys
+import time
+import zlib
+import math
+import bisect
+import hashlib
+import random
+import functools
+import threading
+import contextvars
+import asyncio
+import inspect
 import logging
-from typing import Dict, Any, Optional, Union
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, Union, Iterable, Iterator, AsyncIterator, Awaitable, List, Callable
+
+# 可选的编解码与压缩库，未安装时对应的编解码器不可用
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
 
 # 配置日志
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# 字符串模式的服务端原子更新（Lua + cjson）
+# cjson 无法无损往返的文档返回 0，由客户端改用 WATCH 乐观事务：
+# 空数组或空对象（解码后都是空表，无法区分）、15 个及以上连续的数字或小数点（cjson 默认按 14 位有效数字输出）、
+# 浮点数（含小数部分、指数或 -0；cjson 会把 1.0 输出为 1、-0.0 输出为 0）。
+# 浮点数按 JSON 文本匹配：冒号、逗号或方括号之后的数字带小数点或指数，字符串中形似的内容也会回退，只影响性能。
+# cjson 重新编码时不保留键的顺序
+_LUA_LOAD_DOC = """
+local raw = redis.call('GET', KEYS[1])
+local doc = {}
+if raw then
+    if string.sub(raw, 1, 1) ~= '{' or string.find(raw, '[]', 1, true) or string.find(raw, '{}', 1, true)
+        or string.find(raw, '[%d.][%d.][%d.][%d.][%d.][%d.][%d.][%d.][%d.][%d.][%d.][%d.][%d.][%d.][%d.]')
+        or string.find(raw, '[:,%[]%s*%-?%d+[%.eE]') or string.find(raw, '[:,%[]%s*%-0[,}%]%s]') then
+        return 0
+    end
+    doc = cjson.decode(raw)
+end
+local ttl = redis.call('PTTL', KEYS[1])
+"""
+
+_LUA_SAVE_DOC = """
+redis.call('SET', KEYS[1], cjson.encode(doc))
+if ttl > 0 then
+    redis.call('PEXPIRE', KEYS[1], ttl)
+end
+"""
+
+# KEYS[1] 键名；ARGV[1] 要合并的字段（JSON 对象）；成功返回 1
+_LUA_MERGE = _LUA_LOAD_DOC + """
+for k, v in pairs(cjson.decode(ARGV[1])) do
+    doc[k] = v
+end
+""" + _LUA_SAVE_DOC + """
+return 1
+"""
+
+# KEYS[1] 键名；ARGV[1] 字段名；ARGV[2] 增量；成功返回新值的字符串形式
+_LUA_INCR = _LUA_LOAD_DOC + """
+local cur = doc[ARGV[1]]
+if cur == nil or cur == cjson.null then
+    cur = 0
+end
+if type(cur) ~= 'number' then
+    return redis.error_reply('field is not a number')
+end
+local new = cur + tonumber(ARGV[2])
+if math.abs(new) >= 1e14 or new ~= new then
+    return 0
+end
+doc[ARGV[1]] = new
+""" + _LUA_SAVE_DOC + """
+return tostring(new)
+"""
+
+# KEYS[1] 键名；ARGV[1] 大对象清单字段名；ARGV[2..] 要读取的字段
+# 键不存在返回 {0}；哈希（大对象或哈希模式）返回 {1, HMGET 结果（首项为清单）}；
+# 字符串返回 {2, 只含请求字段的 JSON 对象}；文档无法无损往返时返回 0
+# （与合并脚本共用 _LUA_LOAD_DOC 的检查：含浮点数、空表的文档交给客户端读取，避免 1.0 变成 1 等类型变化）
+_LUA_GET_FIELDS = """
+local kind = redis.call('TYPE', KEYS[1])['ok']
+if kind == 'none' then
+    return {0}
+end
+if kind == 'hash' then
+    return {1, redis.call('HMGET', KEYS[1], unpack(ARGV))}
+end
+""" + _LUA_LOAD_DOC + """
+local out = {}
+for i = 2, #ARGV do
+    local v = doc[ARGV[i]]
+    if v ~= nil then
+        out[ARGV[i]] = v
+    end
+end
+return {2, cjson.encode(out)}
+"""
+
+# 短期锁（SET NX PX）：只有持有者（令牌一致）才能释放；锁键不带字典前缀，不会出现在键列表中
+_LOCK_PREFIX = '__redis_fc__:lock:'
+_LUA_UNLOCK = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+# 与 _LUA_LOAD_DOC 相同的浮点数匹配规则（客户端检查 Lua 脚本参数）
+_JSON_FLOAT = re.compile(r'[:,\[]\s*-?\d+[.eE]|[:,\[]\s*-0[,}\]\s]')
+
+# 哈希模式下标记字典存在的保留字段（空字典也对应一个存在的键）
+_HASH_MARKER = '\x00dict'
+STORAGE_MODES = ('string', 'hash')
+
+# 字符串模式的载荷格式：
+# - JSON 文本（json / orjson 编码）且未压缩时不加头，与旧数据相同，Lua 脚本可直接合并
+# - 其他载荷首字节为头：0x01 + 格式编号 * 4 + 压缩编号，取值 0x01 ~ 0x0F，不会是 JSON 文本的首字符
+#   读取时按头选择解码方式，不同编解码器写入的数据可以混存
+FORMAT_JSON = 0
+FORMAT_MSGPACK = 1
+_HEADER_BASE = 0x01
+_HEADER_MAX = 0x0F
+
 
-class RedisStringDict:
+class DictCodec:
+    """
+    字典编解码器（可用 register_codec 注册自定义编解码器）
     """
-    基于 Redis 字符串类型的字典存储类
     
-    特点:
-    - 所有字典数据都通过 JSON 序列化为字符串存储在 Redis 中
-    - 支持字典的基本操作：存储、读取、删除、更新等
-    - 使用 Redis 字符串类型作为存储介质
+    def __init__(self, name: str, fmt: int, dumps: Callable[[Any], Union[str, bytes]],
+                 loads: Callable[[Union[str, bytes]], Any]):
+        """
+        Args:
+            name: 名称，RedisStringDict(codec=...) 按名称选择
+            fmt: 载荷格式编号（0 ~ 3），写入头字节，读取时据此选择解码函数；输出 JSON 文本的编解码器为 FORMAT_JSON
+            dumps: 编码函数，返回 str 或 bytes
+            loads: 解码函数，接收 str 或 bytes
+        """
+        if not 0 <= fmt <= 3:
+            raise ValueError(f"载荷格式编号必须在 0 ~ 3 之间: {fmt}")
+        self.name = name
+        self.fmt = fmt
+        self.dumps = dumps
+        self.loads = loads
+
+
+CODECS: Dict[str, DictCodec] = {}
+# 格式编号 -> 解码函数（同一格式取最先注册的编解码器），读取其他编解码器写入的数据时使用
+_FORMAT_LOADERS: Dict[int, Callable[[Union[str, bytes]], Any]] = {}
+
+
+def register_codec(codec: DictCodec) -> None:
+    """
+    注册编解码器
+    
+    Args:
+        codec: 编解码器
+    """
+    CODECS[codec.name] = codec
+    _FORMAT_LOADERS.setdefault(codec.fmt, codec.loads)
+
+
+register_codec(DictCodec('json', FORMAT_JSON, lambda data: json.dumps(data, ensure_ascii=False, separators=(',', ':')),
+                         json.loads))
+if orjson is not None:
+    register_codec(DictCodec('orjson', FORMAT_JSON, lambda data: orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS),
+                             orjson.loads))
+if msgpack is not None:
+    register_codec(DictCodec('msgpack', FORMAT_MSGPACK, lambda data: msgpack.packb(data, use_bin_type=True),
+                             lambda raw: msgpack.unpackb(raw, raw=False, strict_map_key=False)))
+
+# 压缩算法：名称 -> (头字节中的压缩编号, 压缩函数, 解压函数)
+COMPRESSORS: Dict[str, tuple] = {'zlib': (1, zlib.compress, zlib.decompress)}
+if lz4_frame is not None:
+    COMPRESSORS['lz4'] = (2, lz4_frame.compress, lz4_frame.decompress)
+_DECOMPRESSORS = {comp_id: decompress for comp_id, _compress, decompress in COMPRESSORS.values()}
+
+# 大对象（set_large）：字符串模式下把字典拆成一个哈希的多个字段，清单字段记录布局与版本
+# - 'fields'：每个顶层字段一个哈希字段，值按编解码器单独编码（达到阈值时压缩）
+# - 'chunks'：整份载荷按固定大小切块，字段名为块序号
+# 键本身是哈希，set_dict / delete_dict / 过期时间等整键操作不会留下孤立的子键
+LARGE_LAYOUTS = ('fields', 'chunks')
+LARGE_CHUNK_SIZE = 256 * 1024
+_LARGE_MARKER = '\x00large'
+
+
+# 近端缓存的失效方式
+NEAR_CACHE_INVALIDATION = ('auto', 'tracking', 'keyspace', 'pubsub')
+_TRACKING_CHANNEL = '__redis__:invalidate'
+_PUBSUB_CHANNEL = '__redis_fc__:invalidate:'
+
+
+class NearCache:
+    """
+    进程内 LRU + TTL 缓存（近端缓存），保存 get_dict 解码后的字典
+    
+    - 条目超过 ttl 秒或容量满时按最近最少使用淘汰
+    - 失效监听未就绪（启动中、断线重连中）时不命中也不写入，避免返回可能过期的数据
+    - 用失效序号防止竞争：读取或写入前记下 epoch，期间该键收到失效消息则放弃写入缓存
+    - 命中时返回缓存中的同一个字典对象，调用方不要修改
+    """
+    
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = 60.0):
+        """
+        Args:
+            maxsize: 最多缓存的字典数量
+            ttl: 条目存活秒数，None 表示只依赖失效消息与 LRU 淘汰
+        """
+        self.maxsize = max(1, int(maxsize))
+        self.ttl = ttl
+        self.active = False
+        self._lock = threading.Lock()
+        self._data: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._epoch = 0
+        # 最近失效过的键 -> 失效时的序号；超出容量时丢弃最旧的记录并抬高 _floor
+        self._invalidated: 'OrderedDict[str, int]' = OrderedDict()
+        self._floor = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+    
+    @property
+    def epoch(self) -> int:
+        """当前失效序号，读取或写入 Redis 前记下，放入缓存时作为 since 传入"""
+        with self._lock:
+            return self._epoch
+    
+    def peek(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        查看未过期的条目（不计入命中统计、不调整 LRU 顺序）
+        
+        Args:
+            key: 完整键名
+        
+        Returns:
+            字典，不存在时返回 None
+        """
+        with self._lock:
+            entry = self._data.get(key) if self.active else None
+            if entry is None or (self.ttl is not None and entry[1] <= time.monotonic()):
+                return None
+            return entry[0]
+    
+    def get(self, key: str) -> tuple:
+        """
+        查找缓存
+        
+        Args:
+            key: 完整键名
+        
+        Returns:
+            (是否命中, 字典)
+        """
+        with self._lock:
+            entry = self._data.get(key) if self.active else None
+            if entry is not None and self.ttl is not None and entry[1] <= time.monotonic():
+                del self._data[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return False, None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return True, entry[0]
+    
+    def put(self, key: str, value: Dict[str, Any], since: int) -> bool:
+        """
+        放入缓存；自 since 以来该键已失效（或缓存被清空）时放弃写入并移除旧条目
+        
+        Args:
+            key: 完整键名
+            value: 字典
+            since: 读取或写入 Redis 前记下的 epoch
+        
+        Returns:
+            是否写入
+        """
+        with self._lock:
+            if not self.active or since < self._floor or self._invalidated.get(key, -1) > since:
+                self._data.pop(key, None)
+                return False
+            expires = time.monotonic() + self.ttl if self.ttl is not None else None
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+            return True
+    
+    def invalidate(self, key: str) -> None:
+        """
+        移除一个键并记录失效序号
+        
+        Args:
+            key: 完整键名
+        """
+        with self._lock:
+            self._epoch += 1
+            self.invalidations += 1
+            self._data.pop(key, None)
+            self._invalidated[key] = self._epoch
+            self._invalidated.move_to_end(key)
+            if len(self._invalidated) > self.maxsize * 4:
+                _key, dropped = self._invalidated.popitem(last=False)
+                self._floor = dropped
+    
+    def clear(self) -> None:
+        """清空缓存，之前开始的读取都不再写入缓存"""
+        with self._lock:
+            self._epoch += 1
+            self._data.clear()
+            self._invalidated.clear()
+            self._floor = self._epoch
+    
+    def set_active(self, active: bool) -> None:
+        """
+        启用或暂停缓存（暂停时同时清空）
+        
+        Args:
+            active: 失效监听是否就绪
+        """
+        self.clear()
+        with self._lock:
+            self.active = active
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        统计信息
+        
+        Returns:
+            命中、未命中、命中率、条目数、淘汰、过期、失效次数
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / total, 4) if total else 0.0,
+                'size': len(self._data),
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations,
+                'active': self.active
+            }
+
+
+class _InvalidationListener(threading.Thread):
+    """
+    后台线程：用独立连接接收失效消息并清除近端缓存中的对应键
+    
+    - tracking：客户端缓存跟踪（Redis 6+），订阅 __redis__:invalidate 的连接作为重定向目标，
+      另一条连接执行 CLIENT TRACKING ON REDIRECT <id> BCAST PREFIX <前缀>，前缀下任何键被修改都会收到通知
+    - keyspace：订阅键空间通知 __keyspace@<db>__:<前缀>*，需要服务器已配置 notify-keyspace-events
+    - pubsub：订阅本库写入时发布的失效频道，只能感知同样开启 pubsub 失效的实例的写入
+    - auto：依次尝试 tracking、keyspace（已配置时），最后使用 pubsub
+    连接中断时暂停缓存，重连成功后清空并恢复
+    """
+    
+    PING_INTERVAL = 30.0
+    
+    def __init__(self, client: redis.Redis, cache: NearCache, prefix: str, db: int, mode: str, storage: str):
+        super().__init__(name='redis-near-cache', daemon=True)
+        self.pool = client.connection_pool
+        self.cache = cache
+        self.prefix = prefix
+        self.db = db
+        self.mode = mode
+        self.storage = storage
+        self.token = f"{os.getpid()}-{id(self)}"
+        self.ready = threading.Event()
+        self._stop_event = threading.Event()
+    
+    def close(self) -> None:
+        """停止监听线程并暂停缓存"""
+        self._stop_event.set()
+        self.join(timeout=2.0)
+        self.cache.set_active(False)
+    
+    def _connection(self) -> Any:
+        conn = self.pool.connection_class(**self.pool.connection_kwargs)
+        conn.connect()
+        return conn
+    
+    @staticmethod
+    def _text(value: Any) -> str:
+        return value.decode('utf-8', 'replace') if isinstance(value, bytes) else str(value)
+    
+    def _keyspace_configured(self, conn: Any) -> bool:
+        """检查服务器的 notify-keyspace-events 是否包含所需事件（K + 通用、字符串或哈希、过期）"""
+        try:
+            conn.send_command('CONFIG', 'GET', 'notify-keyspace-events')
+            reply = conn.read_response()
+        except redis.ResponseError:
+            return False
+        if isinstance(reply, dict):
+            reply = [k for kv in reply.items() for k in kv]
+        flags = self._text(reply[1]) if reply and len(reply) > 1 else ''
+        needed = 'gx' + ('$' if self.storage == 'string' else 'h')
+        return 'K' in flags and ('A' in flags or all(c in flags for c in needed))
+    
+    def _subscribe(self, conn: Any) -> Optional[Any]:
+        """
+        按失效方式订阅，auto 时确定实际使用的方式
+        
+        Returns:
+            tracking 方式下需要保持打开的跟踪连接，其他方式为 None
+        """
+        if self.mode in ('auto', 'tracking'):
+            conn.send_command('CLIENT', 'ID')
+            client_id = conn.read_response()
+            tracker = self._connection()
+            try:
+                tracker.send_command('CLIENT', 'TRACKING', 'ON', 'REDIRECT', client_id, 'BCAST', 'PREFIX', self.prefix)
+                tracker.read_response()
+                conn.send_command('SUBSCRIBE', _TRACKING_CHANNEL)
+                conn.read_response()
+                self.mode = 'tracking'
+                return tracker
+            except redis.ResponseError as e:
+                tracker.disconnect()
+                if self.mode == 'tracking':
+                    raise
+                logger.info(f"服务器不支持客户端缓存跟踪（{e}），改用其他失效方式")
+        if self.mode == 'auto':
+            self.mode = 'keyspace' if self._keyspace_configured(conn) else 'pubsub'
+        if self.mode == 'keyspace':
+            pattern = ''.join('\\' + c if c in '*?[]\\' else c for c in self.prefix)
+            conn.send_command('PSUBSCRIBE', f"__keyspace@{self.db}__:{pattern}*")
+        else:
+            conn.send_command('SUBSCRIBE', _PUBSUB_CHANNEL + self.prefix)
+        conn.read_response()
+        return None
+    
+    def _handle(self, message: Any) -> None:
+        """处理一条推送消息"""
+        if not isinstance(message, (list, tuple)) or not message:
+            return
+        kind = self._text(message[0])
+        if self.mode == 'tracking' and kind == 'message':
+            keys = message[2]
+            if keys is None:
+                # FLUSHDB / FLUSHALL
+                self.cache.clear()
+                return
+            for key in (keys if isinstance(keys, (list, tuple)) else [keys]):
+                self.cache.invalidate(self._text(key))
+        elif self.mode == 'keyspace' and kind == 'pmessage':
+            self.cache.invalidate(self._text(message[2]).split(':', 1)[1])
+        elif self.mode == 'pubsub' and kind == 'message':
+            token, _, key = self._text(message[2]).partition('\n')
+            if token == self.token:
+                return
+            if key == '*':
+                self.cache.clear()
+            else:
+                self.cache.invalidate(key)
+    
+    def run(self) -> None:
+        backoff = 0.1
+        while not self._stop_event.is_set():
+            conn = tracker = None
+            try:
+                conn = self._connection()
+                tracker = self._subscribe(conn)
+                self.cache.set_active(True)
+                if not self.ready.is_set():
+                    logger.info(f"近端缓存已启用，失效方式: {self.mode}")
+                self.ready.set()
+                backoff = 0.1
+                last_ping = time.monotonic()
+                while not self._stop_event.is_set():
+                    if conn.can_read(timeout=1.0):
+                        self._handle(conn.read_response())
+                    if tracker is not None and time.monotonic() - last_ping >= self.PING_INTERVAL:
+                        # 跟踪连接断开后服务器不再发送失效消息，定期检查
+                        tracker.send_command('PING')
+                        tracker.read_response()
+                        last_ping = time.monotonic()
+            except Exception as e:
+                self.cache.set_active(False)
+                if self._stop_event.is_set():
+                    break
+                logger.warning(f"近端缓存失效监听中断，暂停缓存并重连: {e}")
+                self._stop_event.wait(backoff)
+                backoff = min(backoff * 2, 5.0)
+            finally:
+                for c in (conn, tracker):
+                    if c is not None:
+                        try:
+                            c.disconnect()
+                        except Exception:
+                            pass
+
+
+# 操作耗时（秒）与载荷大小（字节）直方图的桶上界
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+SIZE_BUCKETS = (64, 256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+class _Histogram:
+    """固定桶直方图（各桶分别计数，导出时累加为 Prometheus 的 le 累计值）"""
+    
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+    
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+    
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+    
+    def cumulative(self) -> List[tuple]:
+        total = 0
+        rows = []
+        for bound, n in zip(self.buckets + (float('inf'),), self.counts):
+            total += n
+            rows.append(('+Inf' if bound == float('inf') else repr(bound), total))
+        return rows
+
+
+class Metrics:
+    """
+    按操作统计的指标：调用次数（按成功 / 失败）、耗时直方图、载荷大小直方图，可导出为 Prometheus 文本格式
+    
+    多个实例可以共用一个 Metrics（默认共用 default_metrics()），线程安全
+    """
+    
+    def __init__(self, latency_buckets: tuple = LATENCY_BUCKETS, size_buckets: tuple = SIZE_BUCKETS):
+        """
+        Args:
+            latency_buckets: 耗时直方图的桶上界（秒，升序）
+            size_buckets: 载荷大小直方图的桶上界（字节，升序）
+        """
+        self.latency_buckets = tuple(latency_buckets)
+        self.size_buckets = tuple(size_buckets)
+        self._lock = threading.Lock()
+        self._calls: Dict[tuple, int] = {}
+        self._latency: Dict[str, _Histogram] = {}
+        self._size: Dict[str, _Histogram] = {}
+    
+    def observe(self, op: str, seconds: float, ok: bool = True, size: Optional[int] = None) -> None:
+        """
+        记录一次操作
+        
+        Args:
+            op: 操作名（如 'get_dict'）
+            seconds: 耗时（秒）
+            ok: 是否成功
+            size: 载荷大小（字节），None 表示不记录
+        """
+        with self._lock:
+            status = 'ok' if ok else 'error'
+            self._calls[(op, status)] = self._calls.get((op, status), 0) + 1
+            hist = self._latency.get(op)
+            if hist is None:
+                hist = self._latency[op] = _Histogram(self.latency_buckets)
+            hist.observe(seconds)
+            if size is not None:
+                hist = self._size.get(op)
+                if hist is None:
+                    hist = self._size[op] = _Histogram(self.size_buckets)
+                hist.observe(size)
+    
+    def reset(self) -> None:
+        """清空所有统计"""
+        with self._lock:
+            self._calls.clear()
+            self._latency.clear()
+            self._size.clear()
+    
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        获取统计快照
+        
+        Returns:
+            {操作名: {'ok', 'error', 'latency_sum', 'latency_avg', 'size_sum'}}
+        """
+        with self._lock:
+            result: Dict[str, Dict[str, Any]] = {}
+            for op, hist in self._latency.items():
+                size = self._size.get(op)
+                result[op] = {
+                    'ok': self._calls.get((op, 'ok'), 0),
+                    'error': self._calls.get((op, 'error'), 0),
+                    'latency_sum': round(hist.sum, 6),
+                    'latency_avg': round(hist.sum / hist.count, 6) if hist.count else 0.0,
+                    'size_sum': int(size.sum) if size else 0
+                }
+            return result
+    
+    def to_prometheus(self, namespace: str = 'redis_fc') -> str:
+        """
+        导出为 Prometheus 文本格式（可直接作为 /metrics 接口的响应）
+        
+        Args:
+            namespace: 指标名前缀
+        
+        Returns:
+            Prometheus 文本格式的指标
+        """
+        lines = []
+        with self._lock:
+            lines.append(f"# HELP {namespace}_operations_total 操作次数")
+            lines.append(f"# TYPE {namespace}_operations_total counter")
+            for (op, status), n in sorted(self._calls.items()):
+                lines.append(f'{namespace}_operations_total{{op="{op}",status="{status}"}} {n}')
+            for name, unit, hists in (('operation_duration_seconds', '操作耗时（秒）', self._latency),
+                                      ('payload_bytes', '载荷大小（字节）', self._size)):
+                lines.append(f"# HELP {namespace}_{name} {unit}")
+                lines.append(f"# TYPE {namespace}_{name} histogram")
+                for op, hist in sorted(hists.items()):
+                    for le, total in hist.cumulative():
+                        lines.append(f'{namespace}_{name}_bucket{{op="{op}",le="{le}"}} {total}')
+                    lines.append(f'{namespace}_{name}_sum{{op="{op}"}} {hist.sum:.9g}')
+                    lines.append(f'{namespace}_{name}_count{{op="{op}"}} {hist.count}')
+        return "\n".join(lines) + "\n"
+
+
+_DEFAULT_METRICS: Optional[Metrics] = None
+_DEFAULT_METRICS_LOCK = threading.Lock()
+
+
+def default_metrics() -> Metrics:
+    """进程内共用的 Metrics"""
+    global _DEFAULT_METRICS
+    if _DEFAULT_METRICS is None:
+        with _DEFAULT_METRICS_LOCK:
+            if _DEFAULT_METRICS is None:
+                _DEFAULT_METRICS = Metrics()
+    return _DEFAULT_METRICS
+
+
+class _OpRecord:
+    """一次进行中的操作（由 _instrumented 创建，方法内通过 _op_failed / _op_size 标记）"""
+    
+    __slots__ = ('op', 'start', 'ok', 'size')
+    
+    def __init__(self, op: str):
+        self.op = op
+        self.start = time.perf_counter()
+        self.ok = True
+        self.size: Optional[int] = None
+
+
+# 当前线程 / 协程中正在执行的操作
+_CURRENT_OP: contextvars.ContextVar = contextvars.ContextVar('redis_fc_op', default=None)
+
+
+def _instrumented(op: str) -> Callable:
+    """
+    为公开方法记录指标：耗时、成功与否（方法内调用 _op_failed 标记失败）、载荷大小（_op_size），
+    超过慢操作阈值时记录警告；同时支持普通方法与协程方法
+    
+    Args:
+        op: 操作名
     """
+    def decorate(fn: Callable) -> Callable:
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(self, *args, **kwargs):
+                rec = _OpRecord(op)
+                token = _CURRENT_OP.set(rec)
+                try:
+                    return await fn(self, *args, **kwargs)
+                except BaseException:
+                    rec.ok = False
+                    raise
+                finally:
+                    _CURRENT_OP.reset(token)
+                    self._finish_op(rec, args)
+            return async_wrapper
+        
+        @functools.wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            rec = _OpRecord(op)
+            token = _CURRENT_OP.set(rec)
+            try:
+                return fn(self, *args, **kwargs)
+            except BaseException:
+                rec.ok = False
+                raise
+            finally:
+                _CURRENT_OP.reset(token)
+                self._finish_op(rec, args)
+        return wrapper
+    return decorate
+
+
+class _RedisDictBase:
+    """
+    同步与异步字典存储类共用的部分：键名前缀、序列化与存储模式编码、指标与日志（不涉及网络 IO）
+    """
+    
+    metrics: Optional[Metrics] = None
+    log_sample_rate = 0.0
+    slow_log_threshold: Optional[float] = None
+    _near: Optional[NearCache] = None
+    
+    def _configure(self, prefix: str, chunk_size: int, scan_count: int, storage: str, codec: str = 'json',
+                   compression: Optional[str] = None, compress_threshold: int = 1024,
+                   server_merge: bool = False) -> None:
+        """
+        校验并保存与连接无关的配置
+        
+        Args:
+            prefix: 键名前缀
+            chunk_size: 批量操作每批发送的键数量
+            scan_count: SCAN 每次迭代的 COUNT 提示值
+            storage: 存储模式
+            codec: 编解码器名称（见 CODECS）
+            compression: 压缩算法名称（见 COMPRESSORS），None 表示不压缩
+            compress_threshold: 编码后达到该字节数才压缩
+            server_merge: 字符串模式的 update_dict 是否用 Lua 脚本在服务端合并
+        """
+        if storage not in STORAGE_MODES:
+            raise ValueError(f"不支持的存储模式: {storage}，可选: {', '.join(STORAGE_MODES)}")
+        if codec not in CODECS:
+            raise ValueError(f"不支持或未安装的编解码器: {codec}，可选: {', '.join(CODECS)}")
+        if compression is not None and compression not in COMPRESSORS:
+            raise ValueError(f"不支持或未安装的压缩算法: {compression}，可选: {', '.join(COMPRESSORS)}")
+        self.storage = storage
+        self.prefix = prefix
+        self.chunk_size = max(1, int(chunk_size))
+        self.scan_count = max(1, int(scan_count))
+        self.codec = CODECS[codec]
+        self.compression = compression
+        self.compress_threshold = max(0, int(compress_threshold))
+        self._json_codec = self.codec if self.codec.fmt == FORMAT_JSON else CODECS['json']
+        # 载荷可能不是 UTF-8 文本时，客户端不能自动解码响应
+        self._binary_values = storage == 'string' and (self.codec.fmt != FORMAT_JSON or compression is not None)
+        # 只有载荷为未压缩的 JSON 文本时才交给 Lua 脚本（cjson）在服务端修改
+        self._lua_enabled = self.codec.fmt == FORMAT_JSON and compression is None
+        self.server_merge = bool(server_merge)
+    
+    def _get_full_key(self, key: str) -> str:
+        """
+        获取完整的 Redis 键名（添加前缀）
+        
+        Args:
+            key: 原始键名
+            
+        Returns:
+            完整的键名
+        """
+        return f"{self.prefix}{key}"
+    
+    def _serialize_dict(self, data: Dict[str, Any]) -> Union[str, bytes]:
+        """
+        按编解码器序列化字典，达到阈值时压缩（字符串模式的存储载荷）
+        
+        Args:
+            data: 要序列化的字典
+            
+        Returns:
+            未压缩的 JSON 文本原样返回；其他载荷为带头字节的 bytes
+        """
+        try:
+            payload = self.codec.dumps(data)
+        except (TypeError, ValueError, OverflowError) as e:
+            logger.error(f"字典序列化失败: {e}")
+            raise ValueError(f"无法序列化字典: {e}")
+        if self._lua_enabled:
+            return payload
+        if isinstance(payload, str):
+            payload = payload.encode('utf-8')
+        comp_id = 0
+        if self.compression is not None and len(payload) >= self.compress_threshold:
+            comp_id, compress, _decompress = COMPRESSORS[self.compression]
+            packed = compress(payload)
+            if len(packed) < len(payload):
+                payload = packed
+            else:
+                comp_id = 0
+        if comp_id == 0 and self.codec.fmt == FORMAT_JSON:
+            return payload
+        return bytes([_HEADER_BASE + self.codec.fmt * 4 + comp_id]) + payload
+    
+    def _deserialize_dict(self, raw: Union[str, bytes]) -> Dict[str, Any]:
+        """
+        反序列化字符串模式的载荷（按头字节识别编解码器与压缩算法，无头时按 JSON 文本解析）
+        
+        Args:
+            raw: GET 得到的载荷
+            
+        Returns:
+            反序列化后的字典
+        """
+        try:
+            if isinstance(raw, str):
+                if not raw or raw[0] > chr(_HEADER_MAX):
+                    return self._json_codec.loads(raw)
+                raw = raw.encode('utf-8')
+            if not raw or raw[0] > _HEADER_MAX:
+                return self._json_codec.loads(raw)
+            fmt, comp_id = divmod(raw[0] - _HEADER_BASE, 4)
+            body = raw[1:]
+            if comp_id:
+                body = _DECOMPRESSORS[comp_id](body)
+            loads = self.codec.loads if fmt == self.codec.fmt else _FORMAT_LOADERS[fmt]
+            return loads(body)
+        except Exception as e:
+            logger.error(f"字典反序列化失败: {e}")
+            raise ValueError(f"无法反序列化字符串为字典: {e}")
+    
+    def _dumps_json(self, value: Any) -> str:
+        """
+        将值编码为 JSON 文本（哈希模式的字段值、Lua 脚本参数，不受编解码器格式与压缩影响）
+        
+        Args:
+            value: 要编码的值
+            
+        Returns:
+            JSON 字符串
+        """
+        text = self._json_codec.dumps(value)
+        return text.decode('utf-8') if isinstance(text, bytes) else text
+    
+    def _to_hash_mapping(self, data: Dict[str, Any]) -> Dict[str, str]:
+        """
+        将字典转为哈希字段映射（哈希模式），每个值单独序列化为 JSON
+        
+        Args:
+            data: 要存储的字典
+        
+        Returns:
+            {字段: JSON 字符串}，含存在标记字段
+        """
+        try:
+            mapping = {str(k): self._dumps_json(v) for k, v in data.items()}
+        except (TypeError, ValueError, OverflowError) as e:
+            logger.error(f"字典序列化失败: {e}")
+            raise ValueError(f"无法序列化字典: {e}")
+        mapping[_HASH_MARKER] = '1'
+        return mapping
+    
+    def _from_hash_mapping(self, mapping: Dict[Any, Any]) -> Optional[Dict[str, Any]]:
+        """
+        将 HGETALL 结果还原为字典（哈希模式）
+        
+        Args:
+            mapping: {字段: JSON 字符串}
+        
+        Returns:
+            还原后的字典；键不存在（空映射）时返回 None
+        """
+        if not mapping:
+            return None
+        data = {}
+        try:
+            for field, value in mapping.items():
+                if isinstance(field, bytes):
+                    field = field.decode('utf-8')
+                if field == _HASH_MARKER:
+                    continue
+                data[field] = self._json_codec.loads(value)
+        except (ValueError, TypeError) as e:
+            logger.error(f"字典反序列化失败: {e}")
+            raise ValueError(f"无法反序列化哈希字段: {e}")
+        return data
+    
+    def _encode(self, data: Dict[str, Any]) -> Union[str, Dict[str, str]]:
+        """
+        按存储模式编码字典：字符串模式为 JSON 字符串，哈希模式为字段映射
+        
+        Args:
+            data: 要存储的字典
+        
+        Returns:
+            编码结果，交给 _queue_write 写入
+        """
+        if self.storage == 'string':
+            return self._serialize_dict(data)
+        return self._to_hash_mapping(data)
+    
+    def _queue_write(self, pipe: Any, key: str, payload: Union[str, Dict[str, str]], ex: Optional[int]) -> int:
+        """
+        将一个已编码字典的写入命令加入管道
+        
+        Args:
+            pipe: redis 管道
+            key: 存储键名
+            payload: _encode 的结果
+            ex: 过期时间（秒），None 表示不过期
+        
+        Returns:
+            加入管道的命令数量
+        """
+        full_key = self._get_full_key(key)
+        if self.storage == 'string':
+            pipe.set(full_key, payload, ex=ex)
+            return 1
+        pipe.delete(full_key)
+        pipe.hset(full_key, mapping=payload)
+        if ex:
+            pipe.expire(full_key, ex)
+            return 3
+        return 2
+    
+    @staticmethod
+    def _lua_safe(json_str: str) -> bool:
+        """
+        判断 JSON 能否在 Lua cjson 中无损往返（与 _LUA_LOAD_DOC 的检查规则一致，不含键顺序）
+        
+        Args:
+            json_str: JSON 字符串
+        
+        Returns:
+            是否可以交给 Lua 脚本处理
+        """
+        if '[]' in json_str or '{}' in json_str or _JSON_FLOAT.search(json_str):
+            return False
+        run = 0
+        for ch in json_str:
+            run = run + 1 if '0' <= ch <= '9' or ch == '.' else 0
+            if run >= 15:
+                return False
+        return True
+    
+    @staticmethod
+    def _chunks(items: List[Any], size: int) -> Iterator[List[Any]]:
+        """
+        按固定大小切分列表
+        
+        Args:
+            items: 待切分的列表
+            size: 每批数量
+            
+        Returns:
+            逐批产出的子列表
+        """
+        for i in range(0, len(items), size):
+            yield items[i:i + size]
+    
+    @staticmethod
+    def _large_misses(values: List[Any], kinds: List[Any]) -> List[int]:
+        """
+        找出 MGET 未命中且类型为哈希（大对象）的位置
+        
+        Args:
+            values: MGET 的结果
+            kinds: 同一管道中各键 TYPE 的结果
+            
+        Returns:
+            需要补读 HGETALL 的下标列表
+        """
+        return [i for i, (raw, kind) in enumerate(zip(values, kinds))
+                if raw is None and kind in ('hash', b'hash')]
+    
+    def _decode(self, raw: Any) -> Optional[Dict[str, Any]]:
+        """
+        解码 GET / HGETALL 的结果
+        
+        Args:
+            raw: 字符串载荷，或字段映射（哈希模式、大对象）
+        
+        Returns:
+            还原后的字典；键不存在时返回 None
+        """
+        if not raw:
+            return None
+        return self._decode_large(raw) if isinstance(raw, dict) else self._deserialize_dict(raw)
+    
+    def _encode_large(self, data: Dict[str, Any], layout: str, chunk_size_bytes: int) -> Dict[str, Union[str, bytes]]:
+        """
+        将字典编码为大对象的哈希字段（含新版本号的清单字段）
+        
+        Args:
+            data: 要存储的字典（'fields' 布局更新时为要更新的字段）
+            layout: 布局，见 LARGE_LAYOUTS
+            chunk_size_bytes: 'chunks' 布局每块的大小（文本载荷按字符计）
+        
+        Returns:
+            {哈希字段: 载荷}
+        """
+        if layout == 'fields':
+            parts = {str(k): self._serialize_dict(v) for k, v in data.items()}
+            manifest: Dict[str, Any] = {'layout': 'fields'}
+        else:
+            payload = self._serialize_dict(data)
+            if isinstance(payload, bytes) and not self._binary_values:
+                # 响应按文本解码时按字符切块，避免切断多字节字符
+                payload = payload.decode('utf-8')
+            size = max(1, int(chunk_size_bytes))
+            parts = {str(i): payload[pos:pos + size] for i, pos in enumerate(range(0, len(payload), size))}
+            manifest = {'layout': 'chunks', 'chunks': len(parts), 'chunk_size': size}
+        manifest['version'] = os.urandom(8).hex()
+        parts[_LARGE_MARKER] = json.dumps(manifest)
+        return parts
+    
+    @staticmethod
+    def _parse_manifest(raw: Any) -> Optional[Dict[str, Any]]:
+        """
+        解析大对象的清单字段
+        
+        Args:
+            raw: 清单字段的值
+        
+        Returns:
+            清单；不是大对象（字段不存在）时返回 None
+        """
+        if raw is None:
+            return None
+        if isinstance(raw, bytes):
+            raw = raw.decode('utf-8')
+        return json.loads(raw)
+    
+    def _decode_large(self, mapping: Dict[Any, Any]) -> Optional[Dict[str, Any]]:
+        """
+        将 HGETALL 结果还原为字典（有清单字段时按大对象布局还原，否则按哈希模式的字段映射还原）
+        
+        Args:
+            mapping: {字段: 值}
+        
+        Returns:
+            还原后的字典；键不存在（空映射）时返回 None
+        """
+        if not mapping:
+            return None
+        parts = {(f.decode('utf-8') if isinstance(f, bytes) else f): v for f, v in mapping.items()}
+        manifest = self._parse_manifest(parts.pop(_LARGE_MARKER, None))
+        if manifest is None:
+            return self._from_hash_mapping(parts)
+        if manifest['layout'] == 'fields':
+            return {field: self._deserialize_dict(raw) for field, raw in parts.items()}
+        try:
+            pieces = [parts[str(i)] for i in range(manifest['chunks'])]
+        except KeyError as e:
+            raise ValueError(f"大对象缺少分块: {e}")
+        return self._deserialize_dict(pieces[0][:0].join(pieces) if pieces else '')
+    
+    def _queue_large(self, pipe: Any, full_key: str, parts: Dict[str, Union[str, bytes]], replace: bool,
+                     px: Optional[int] = None) -> None:
+        """
+        将大对象的写入命令加入管道（每条 HSET 最多 chunk_size 个字段）
+        
+        Args:
+            pipe: redis 管道
+            full_key: 完整键名
+            parts: _encode_large 的结果
+            replace: 是否先删除旧键（整体替换）
+            px: 过期时间（毫秒），None 表示不设置
+        """
+        if replace:
+            pipe.delete(full_key)
+        for batch in self._chunks(list(parts.items()), self.chunk_size):
+            pipe.hset(full_key, mapping=dict(batch))
+        if px:
+            pipe.pexpire(full_key, px)
+    
+    @staticmethod
+    def _incr_result(reply: Any, amount: Union[int, float]) -> Union[int, float]:
+        """
+        解析 _LUA_INCR 返回的新值（整数增量且结果为整数时返回 int）
+        
+        Args:
+            reply: 脚本返回的字符串
+            amount: 增量
+        
+        Returns:
+            增量后的新值
+        """
+        if isinstance(reply, bytes):
+            reply = reply.decode('utf-8')
+        value = float(reply)
+        return int(value) if isinstance(amount, int) and value.is_integer() else value
+    
+    @staticmethod
+    def _incr_apply(field: str, amount: Union[int, float]) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+        """
+        生成 _cas_update 使用的字段自增函数（客户端回退路径）
+        
+        Args:
+            field: 字段名
+            amount: 增量
+        
+        Returns:
+            接收当前字典并返回新字典的函数；字段不是数值时抛出 ValueError
+        """
+        def apply(data: Dict[str, Any]) -> Dict[str, Any]:
+            cur = data.get(field)
+            if cur is None:
+                cur = 0
+            if isinstance(cur, bool) or not isinstance(cur, (int, float)):
+                raise ValueError(f"字段 '{field}' 不是数值")
+            data[field] = cur + amount
+            return data
+        return apply
+    
+    def _configure_observability(self, metrics: Optional[Metrics], log_sample_rate: float,
+                                 slow_log_threshold: Optional[float]) -> None:
+        """
+        保存指标与日志配置
+        
+        Args:
+            metrics: 指标收集器，None 使用进程内共用的 default_metrics()
+            log_sample_rate: 成功操作按该比例抽样记录 INFO 日志（0 为只在 DEBUG 级别记录）
+            slow_log_threshold: 耗时超过该秒数的操作记录警告，None 表示不记录
+        """
+        self.metrics = default_metrics() if metrics is None else metrics
+        self.log_sample_rate = min(1.0, max(0.0, float(log_sample_rate)))
+        self.slow_log_threshold = slow_log_threshold
+    
+    @staticmethod
+    def _op_failed() -> None:
+        """将当前操作标记为失败（方法内捕获异常后调用）"""
+        rec = _CURRENT_OP.get()
+        if rec is not None:
+            rec.ok = False
+    
+    @staticmethod
+    def _op_size(payload: Any) -> None:
+        """
+        累加当前操作的载荷大小
+        
+        Args:
+            payload: 字符串、字节串、哈希字段映射或字节数
+        """
+        rec = _CURRENT_OP.get()
+        if rec is None or payload is None:
+            return
+        if isinstance(payload, dict):
+            n = sum(len(v) for v in payload.values() if isinstance(v, (str, bytes)))
+        elif isinstance(payload, (str, bytes)):
+            n = len(payload)
+        else:
+            n = int(payload)
+        rec.size = (rec.size or 0) + n
+    
+    def _log_op(self, msg: str, *args: Any) -> None:
+        """
+        记录操作日志：DEBUG 级别开启时全部记录，否则按 log_sample_rate 抽样记录为 INFO（参数延迟格式化）
+        
+        Args:
+            msg: %-格式的日志模板
+            *args: 模板参数
+        """
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(msg, *args)
+        elif self.log_sample_rate and random.random() < self.log_sample_rate:
+            logger.info(msg, *args)
+    
+    def _finish_op(self, rec: _OpRecord, args: tuple) -> None:
+        """
+        操作结束：记录指标，超过阈值时记录慢操作警告
+        
+        Args:
+            rec: 操作记录
+            args: 方法的位置参数（第一个为键名或批量键集合）
+        """
+        elapsed = time.perf_counter() - rec.start
+        if self.metrics is not None:
+            self.metrics.observe(rec.op, elapsed, rec.ok, rec.size)
+        if self.slow_log_threshold is not None and elapsed >= self.slow_log_threshold:
+            target = args[0] if args else ''
+            if not isinstance(target, str):
+                try:
+                    target = f"{len(target)} 个键"
+                except TypeError:
+                    target = ''
+            logger.warning("慢操作: %s %s 耗时 %.1f ms%s", rec.op, target, elapsed * 1000,
+                           '' if rec.ok else '（失败）')
+    
+    def export_metrics(self, namespace: str = 'redis_fc') -> str:
+        """
+        导出 Prometheus 文本格式的指标（含近端缓存统计）
+        
+        Args:
+            namespace: 指标名前缀
+        
+        Returns:
+            Prometheus 文本格式的指标
+        """
+        text = self.metrics.to_prometheus(namespace) if self.metrics is not None else ''
+        if self._near is not None:
+            stats = self._near.stats()
+            for name, kind in (('hits', 'counter'), ('misses', 'counter'), ('evictions', 'counter'),
+                               ('expirations', 'counter'), ('invalidations', 'counter'), ('size', 'gauge')):
+                metric = f"{namespace}_near_cache_{name}" + ('_total' if kind == 'counter' else '')
+                text += f"# TYPE {metric} {kind}\n{metric}{{prefix=\"{self.prefix}\"}} {stats[name]}\n"
+        return text
+
+
+class RedisStringDict(_RedisDictBase):
+    """
+    基于 Redis 字符串类型的字典存储类
+    
+    特点:
+    - 所有字典数据都通过 JSON 序列化为字符串存储在 Redis 中
+    - 支持字典的基本操作：存储、读取、删除、更新等
+    - 使用 Redis 字符串类型作为存储介质
+    - 可选哈希模式（storage='hash'）：每个字段单独以 JSON 存为哈希字段，字段级更新只写改动的字段
+    - 部分更新（WATCH 乐观事务，可选 Lua 服务端合并）与数值自增（Lua）原子执行，并发写入不会互相覆盖
+    - 可选编解码器（json / orjson / msgpack）与超过阈值时的 zlib / lz4 压缩，载荷头字节记录格式，新旧数据可混存
+    - 可选进程内近端缓存（near_cache=True）：get_dict 命中时不访问网络，通过失效消息与其他客户端的写入保持一致
+    - 大对象模式（set_large）：按字段或固定大小分块存入哈希，get_fields / iter_fields 只传输需要的部分
+    """
+    
+    def __init__(self, host: str = '127.0.0.1', port: int = 6379, db: int = 0, 
+                 decode_responses: bool = True, prefix: str = 'dict:', chunk_size: int = 500,
+                 scan_count: int = 1000, storage: str = 'string', codec: str = 'json',
+                 compression: Optional[str] = None, compress_threshold: int = 1024,
+                 near_cache: bool = False, near_cache_size: int = 1024, near_cache_ttl: Optional[float] = 60.0,
+                 near_cache_invalidation: str = 'auto', metrics: Optional[Metrics] = None,
+                 log_sample_rate: float = 0.0, slow_log_threshold: Optional[float] = None,
+                 server_merge: bool = False):
+        """
+        初始化 Redis 连接
+        
+        Args:
+            host: Redis 服务器地址
+            port: Redis 服务器端口
+            db: Redis 数据库编号
+            decode_responses: 是否自动解码响应为字符串
+            prefix: 键名前缀，用于区分不同类型的数据
+            chunk_size: 批量操作每批发送的键数量（每批一次网络往返）
+            scan_count: SCAN 每次迭代的 COUNT 提示值
+            storage: 存储模式，'string' 为整份 JSON 字符串（默认），'hash' 为每个字段一个哈希字段
+            codec: 字符串模式的编解码器，'json'（默认）、'orjson' 或 'msgpack'（保留非字符串键，JSON 会转为字符串）；
+                哈希模式的字段值始终为 JSON 文本
+            compression: 字符串模式的压缩算法，None（默认）、'zlib' 或 'lz4'
+            compress_threshold: 编码后达到该字节数才压缩（压缩后不变小则不压缩）
+            near_cache: 是否在 get_dict 前启用进程内 LRU + TTL 近端缓存
+            near_cache_size: 近端缓存最多保存的字典数量
+            near_cache_ttl: 近端缓存条目存活秒数（失效消息丢失时的兜底），None 表示不过期
+            near_cache_invalidation: 失效方式，'auto'（默认，依次尝试）、'tracking'（Redis 6+ 客户端缓存跟踪）、
+                'keyspace'（键空间通知，需服务器配置 notify-keyspace-events）或 'pubsub'（本库写入时发布失效消息）
+            metrics: 指标收集器（调用次数、耗时与载荷大小直方图），None 使用进程内共用的 default_metrics()
+            log_sample_rate: 成功操作按该比例抽样记录 INFO 日志，默认 0（只在 DEBUG 级别记录）
+            slow_log_threshold: 耗时超过该秒数的操作记录警告，None（默认）表示不记录
+            server_merge: 字符串模式的 update_dict 是否用 Lua 脚本在服务端合并（一次往返）；
+                cjson 重新编码不保留键的顺序，默认 False，使用 WATCH 乐观事务（保留键顺序与值类型）
+            
+        载荷可能是二进制（msgpack 或压缩）时，客户端不自动解码响应（decode_responses 视为 False）；
+        使用默认 json 编解码器的实例要读取其他实例写入的二进制载荷，需传入 decode_responses=False
+        """
+        self._configure(prefix, chunk_size, scan_count, storage, codec, compression, compress_threshold,
+                        server_merge)
+        self._configure_observability(metrics, log_sample_rate, slow_log_threshold)
+        if near_cache_invalidation not in NEAR_CACHE_INVALIDATION:
+            raise ValueError(f"不支持的失效方式: {near_cache_invalidation}，可选: {', '.join(NEAR_CACHE_INVALIDATION)}")
+        try:
+            self.redis_client = redis.Redis(
+                host=host, 
+                port=port, 
+                db=db, 
+                decode_responses=decode_responses and not self._binary_values
+            )
+            # 测试连接
+            self.redis_client.ping()
+            logger.info(f"成功连接到 Redis 服务器 {host}:{port}")
+        except redis.ConnectionError as e:
+            logger.error(f"无法连接到 Redis 服务器: {e}")
+            raise
+        except Exception as e:
+            logger.error(f"Redis 连接初始化失败: {e}")
+            raise
+        self._merge_script = self.redis_client.register_script(_LUA_MERGE)
+        self._incr_script = self.redis_client.register_script(_LUA_INCR)
+        self._fields_script = self.redis_client.register_script(_LUA_GET_FIELDS)
+        self._unlock_script = self.redis_client.register_script(_LUA_UNLOCK)
+        
+        self._near: Optional[NearCache] = None
+        self._listener: Optional[_InvalidationListener] = None
+        if near_cache:
+            self._near = NearCache(near_cache_size, near_cache_ttl)
+            self._listener = _InvalidationListener(self.redis_client, self._near, prefix, db,
+                                                   near_cache_invalidation, storage)
+            self._listener.start()
+            if not self._listener.ready.wait(5.0):
+                logger.warning("近端缓存失效监听尚未就绪，就绪前读取直接访问 Redis")
+    
+    def close(self) -> None:
+        """
+        停止近端缓存的失效监听并关闭连接
+        """
+        if self._listener is not None:
+            self._listener.close()
+        self.redis_client.close()
+    
+    def near_cache_stats(self) -> Optional[Dict[str, Any]]:
+        """
+        获取近端缓存的统计信息
+        
+        Returns:
+            命中、未命中、命中率、条目数、淘汰、过期、失效次数与失效方式；未启用近端缓存时返回 None
+        """
+        if self._near is None:
+            return None
+        return {**self._near.stats(), 'invalidation': self._listener.mode}
+    
+    def _near_update(self, full_key: str, since: int, build: Callable[[], Optional[Dict[str, Any]]]) -> None:
+        """
+        写入成功后更新近端缓存（write-through），并按需发布失效消息
+        
+        Args:
+            full_key: 完整键名
+            since: 写入前记下的 epoch
+            build: 返回写入后字典的函数；返回 None 时改为使缓存失效
+        """
+        if self._near is None:
+            return
+        data = build()
+        if data is None:
+            self._near.invalidate(full_key)
+        else:
+            self._near.put(full_key, data, since)
+        self._near_publish([full_key])
+    
+    def _near_invalidate(self, full_keys: Iterable[str]) -> None:
+        """
+        写入（或写入结果未知）后使近端缓存中的键失效，并按需发布失效消息
+        
+        Args:
+            full_keys: 完整键名列表
+        """
+        if self._near is None:
+            return
+        full_keys = list(full_keys)
+        for full_key in full_keys:
+            self._near.invalidate(full_key)
+        self._near_publish(full_keys)
+    
+    def _near_publish(self, full_keys: List[str]) -> None:
+        """
+        pubsub 失效方式下，向其他实例发布被修改的键（'*' 表示全部）
+        
+        Args:
+            full_keys: 完整键名列表
+        """
+        if self._listener is None or self._listener.mode != 'pubsub' or not full_keys:
+            return
+        channel = _PUBSUB_CHANNEL + self.prefix
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for full_key in full_keys:
+                pipe.publish(channel, f"{self._listener.token}\n{full_key}")
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"发布近端缓存失效消息失败: {e}")
+    
+    def _acquire_lock(self, key: str, timeout: float) -> Optional[str]:
+        """
+        获取键的短期锁（SET NX PX），用于缓存重建等只需一个调用方执行的操作
+        
+        Args:
+            key: 存储键名
+            timeout: 锁自动过期的秒数（持有者异常退出时兜底）
+        
+        Returns:
+            获取成功返回释放锁用的令牌，锁已被其他调用方持有返回 None；Redis 出错时抛出异常
+        """
+        token = os.urandom(8).hex()
+        lock_key = _LOCK_PREFIX + self._get_full_key(key)
+        if self.redis_client.set(lock_key, token, nx=True, px=max(1, int(timeout * 1000))):
+            return token
+        return None
+    
+    def _release_lock(self, key: str, token: str) -> None:
+        """
+        释放 _acquire_lock 获取的锁（锁已过期并被他人获取时不删除）
+        
+        Args:
+            key: 存储键名
+            token: _acquire_lock 返回的令牌
+        """
+        self._unlock_script(keys=[_LOCK_PREFIX + self._get_full_key(key)], args=[token])
+    
+    @_instrumented('set_dict')
+    def set_dict(self, key: str, data: Dict[str, Any], ex: Optional[int] = None) -> bool:
+        """
+        存储字典到 Redis（字符串模式为整份 JSON，哈希模式在事务中整体替换全部字段）
+        
+        Args:
+            key: 存储键名
+            data: 要存储的字典
+            ex: 过期时间（秒），None 表示不过期
+        
+        Returns:
+            是否存储成功
+        """
+        full_key = self._get_full_key(key)
+        since = self._near.epoch if self._near is not None else 0
+        try:
+            if self.storage == 'string':
+                payload = self._serialize_dict(data)
+                self._op_size(payload)
+                result = self.redis_client.set(full_key, payload, ex=ex)
+                size = len(payload)
+            else:
+                payload = self._encode(data)
+                self._op_size(payload)
+                pipe = self.redis_client.pipeline(transaction=True)
+                self._queue_write(pipe, key, payload, ex)
+                result = all(r is not False for r in pipe.execute())
+                size = len(data)
+            
+            if result:
+                # 经过编码再解码，缓存中的字典与调用方传入的对象互不影响，且与从 Redis 读到的一致
+                self._near_update(full_key, since, lambda: self._decode(payload))
+                self._log_op("成功存储字典到键 '%s'，数据大小: %s %s", key, size,
+                             "字符" if self.storage == 'string' else "个字段")
+                return True
+            else:
+                self._op_failed()
+                logger.warning(f"存储字典到键 '{key}' 失败")
+                return False
+        
+        except Exception as e:
+            self._near_invalidate([full_key])
+            self._op_failed()
+            logger.error(f"存储字典失败: {e}")
+            return False
+    
+    @_instrumented('get_dict')
+    def get_dict(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        从 Redis 读取字典（启用近端缓存时先查缓存，命中则不访问网络）
+        
+        Args:
+            key: 存储键名
+        
+        Returns:
+            读取到的字典，如果不存在则返回 None；近端缓存命中时返回缓存中的对象，不要修改
+        """
+        try:
+            full_key = self._get_full_key(key)
+            since = 0
+            if self._near is not None:
+                hit, cached = self._near.get(full_key)
+                if hit:
+                    return cached
+                since = self._near.epoch
+            if self.storage == 'string':
+                data = self._read_string_doc(full_key)
+            else:
+                mapping = self.redis_client.hgetall(full_key)
+                self._op_size(mapping)
+                data = self._from_hash_mapping(mapping)
+            
+            if data is None:
+                self._log_op("键 '%s' 不存在", key)
+                return None
+            
+            if self._near is not None:
+                self._near.put(full_key, data, since)
+            self._log_op("成功读取键 '%s' 的字典数据", key)
+            return data
+        
+        except Exception as e:
+            self._op_failed()
+            logger.error(f"读取字典失败: {e}")
+            return None
+    
+    def _read_string_doc(self, full_key: str) -> Optional[Dict[str, Any]]:
+        """
+        字符串模式读取整份字典；键是大对象（哈希）时 GET 报 WRONGTYPE，改用 HGETALL 还原
+        
+        Args:
+            full_key: 完整键名
+        
+        Returns:
+            读取到的字典，不存在时返回 None
+        """
+        try:
+            raw = self.redis_client.get(full_key)
+        except redis.ResponseError as e:
+            if 'WRONGTYPE' not in str(e):
+                raise
+            raw = self.redis_client.hgetall(full_key)
+        self._op_size(raw)
+        return self._decode(raw)
+    
+    @_instrumented('update_dict')
+    def update_dict(self, key: str, updates: Dict[str, Any]) -> bool:
+        """
+        原子地更新字典中的部分数据（键不存在时创建，保留原有过期时间）
+        
+        - 字符串模式：WATCH 乐观事务（读取、合并后写回，保留键顺序）；
+          server_merge=True 时由 Lua 脚本在服务端合并，一次往返，文档含 cjson 无法无损往返的内容时仍用 WATCH
+        - 哈希模式：一条 HSET 只写改动的字段
+        - 大对象：'fields' 布局只写改动的字段，'chunks' 布局读出后整体重写
+        
+        Args:
+            key: 存储键名
+            updates: 要更新的键值对
+        
+        Returns:
+            是否更新成功
+        """
+        if not updates:
+            return True
+        full_key = self._get_full_key(key)
+        since = self._near.epoch if self._near is not None else 0
+        # 近端缓存只写入与服务端一致的结果；Lua 合并（cjson 重新编码）与大对象无法在本地精确复现，改为失效
+        cached: Callable[[], Optional[Dict[str, Any]]] = lambda: None
+        try:
+            if self.storage == 'hash':
+                mapping = self._to_hash_mapping(updates)
+                self._op_size(mapping)
+                self.redis_client.hset(full_key, mapping=mapping)
+                cached = lambda: self._merge_cached(full_key, updates)
+            else:
+                payload = self._dumps_json(updates)
+                self._op_size(payload)
+                try:
+                    if (not self.server_merge or not self._lua_enabled or not self._lua_safe(payload)
+                            or not self._merge_script(keys=[full_key], args=[payload])):
+                        written = self._cas_update(key, lambda data: {**data, **updates})
+                        cached = lambda: self._deserialize_dict(self._serialize_dict(written))
+                except redis.ResponseError as e:
+                    if 'WRONGTYPE' not in str(e):
+                        raise
+                    self._update_large(full_key, updates)
+            self._near_update(full_key, since, cached)
+            self._log_op("成功更新键 '%s' 的字典数据", key)
+            return True
+        
+        except Exception as e:
+            self._near_invalidate([full_key])
+            self._op_failed()
+            logger.error(f"更新字典失败: {e}")
+            return False
+    
+    def _merge_cached(self, full_key: str, updates: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        将更新合并到近端缓存中的字典（哈希模式：每个字段单独以 JSON 存储，更新值经 JSON 往返后与从 Redis 读到的一致）
+        
+        Args:
+            full_key: 完整键名
+            updates: 要更新的键值对
+        
+        Returns:
+            合并后的新字典；缓存中没有该键时返回 None
+        """
+        cached = self._near.peek(full_key)
+        if cached is None:
+            return None
+        return {**cached, **self._json_codec.loads(self._dumps_json(updates))}
+    
+    @_instrumented('incr_field')
+    def incr_field(self, key: str, field: str, amount: Union[int, float] = 1) -> Optional[Union[int, float]]:
+        """
+        原子地对字典中的数值字段做增量（字段不存在时从 0 开始，键不存在时创建）
+        
+        字符串模式的整数增量由 Lua 脚本在服务端执行（一次往返，cjson 重新编码文档，不保留键的顺序）；
+        小数增量与含浮点数的文档使用 WATCH 乐观事务
+        
+        Args:
+            key: 存储键名
+            field: 字段名
+            amount: 增量，可为负数或小数
+        
+        Returns:
+            增量后的新值，失败（字段不是数值等）返回 None
+        """
+        try:
+            full_key = self._get_full_key(key)
+            if self.storage == 'hash':
+                pipe = self.redis_client.pipeline(transaction=True)
+                if isinstance(amount, float):
+                    pipe.hincrbyfloat(full_key, field, amount)
+                else:
+                    pipe.hincrby(full_key, field, int(amount))
+                pipe.hsetnx(full_key, _HASH_MARKER, '1')
+                value = pipe.execute()[0]
+                return float(value) if isinstance(amount, float) else int(value)
+            
+            use_lua = self._lua_enabled and not isinstance(amount, float)
+            reply = self._incr_script(keys=[full_key], args=[field, repr(amount)]) if use_lua else 0
+            if reply != 0:
+                return self._incr_result(reply, amount)
+            return self._cas_update(key, self._incr_apply(field, amount))[field]
+        
+        except Exception as e:
+            self._op_failed()
+            logger.error(f"字段自增失败: {e}")
+            return None
+        finally:
+            self._near_invalidate([self._get_full_key(key)])
+    
+    def _cas_update(self, key: str, fn: Callable[[Dict[str, Any]], Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        WATCH 乐观事务：读取、在本地修改后写回，期间键被其他客户端改动则重试（字符串模式）
+        
+        Args:
+            key: 存储键名
+            fn: 接收当前字典（不存在时为空字典）并返回新字典的函数
+        
+        Returns:
+            写入后的字典
+        """
+        full_key = self._get_full_key(key)
+        with self.redis_client.pipeline() as pipe:
+            while True:
+                try:
+                    pipe.watch(full_key)
+                    raw = pipe.get(full_key)
+                    ttl = pipe.pttl(full_key)
+                    data = fn(self._deserialize_dict(raw) if raw is not None else {})
+                    pipe.multi()
+                    pipe.set(full_key, self._serialize_dict(data), px=ttl if ttl and ttl > 0 else None)
+                    pipe.execute()
+                    return data
+                except redis.WatchError:
+                    continue
+    
+    def _update_large(self, full_key: str, updates: Dict[str, Any]) -> None:
+        """
+        更新大对象（WATCH 乐观事务，期间键被其他客户端改动则重试；保留原有过期时间）
+        
+        Args:
+            full_key: 完整键名
+            updates: 要更新的键值对
+        """
+        with self.redis_client.pipeline() as pipe:
+            while True:
+                try:
+                    pipe.watch(full_key)
+                    manifest = self._parse_manifest(pipe.hget(full_key, _LARGE_MARKER))
+                    if manifest is None:
+                        raise ValueError(f"键 '{full_key}' 是哈希但不是大对象")
+                    if manifest['layout'] == 'fields':
+                        parts = self._encode_large(updates, 'fields', 0)
+                        pipe.multi()
+                        self._queue_large(pipe, full_key, parts, replace=False)
+                    else:
+                        data = {**(self._decode_large(pipe.hgetall(full_key)) or {}), **updates}
+                        parts = self._encode_large(data, 'chunks', manifest['chunk_size'])
+                        ttl = pipe.pttl(full_key)
+                        pipe.multi()
+                        self._queue_large(pipe, full_key, parts, replace=True, px=ttl if ttl and ttl > 0 else None)
+                    pipe.execute()
+                    return
+                except redis.WatchError:
+                    continue
+    
+    @_instrumented('set_large')
+    def set_large(self, key: str, data: Dict[str, Any], ex: Optional[int] = None, layout: str = 'fields',
+                  chunk_size_bytes: int = LARGE_CHUNK_SIZE) -> bool:
+        """
+        以大对象方式存储字典：拆成一个哈希的多个字段并写入清单，在事务中整体替换
+        
+        - 'fields' 布局：每个顶层字段一个哈希字段，get_fields 只传输请求的字段，update_dict 只写改动的字段
+        - 'chunks' 布局：整份载荷按 chunk_size_bytes 切块，适合单个字段就很大的字典，读取时取回全部分块
+        
+        get_dict / get_many / update_dict / delete_dict 可以直接操作大对象，incr_field 不支持；
+        顶层键按字段名存储，msgpack 编解码器的非字符串顶层键会转为字符串。
+        哈希模式本身按字段存储，'fields' 布局等同于 set_dict，不支持 'chunks' 布局
+        
+        Args:
+            key: 存储键名
+            data: 要存储的字典
+            ex: 过期时间（秒），None 表示不过期
+            layout: 'fields'（默认）或 'chunks'
+            chunk_size_bytes: 'chunks' 布局每块的大小（文本载荷按字符计）
+        
+        Returns:
+            是否存储成功
+        """
+        if layout not in LARGE_LAYOUTS or (self.storage == 'hash' and layout != 'fields'):
+            self._op_failed()
+            logger.error(f"不支持的大对象布局: {layout}（存储模式 {self.storage}）")
+            return False
+        if self.storage == 'hash':
+            return self.set_dict(key, data, ex)
+        full_key = self._get_full_key(key)
+        try:
+            parts = self._encode_large(data, layout, chunk_size_bytes)
+            self._op_size(parts)
+            pipe = self.redis_client.pipeline(transaction=True)
+            self._queue_large(pipe, full_key, parts, replace=True, px=ex * 1000 if ex else None)
+            pipe.execute()
+            self._near_invalidate([full_key])
+            self._log_op("成功以大对象方式存储键 '%s'，共 %d 个%s", key, len(parts) - 1,
+                         "字段" if layout == 'fields' else "分块")
+            return True
+        
+        except Exception as e:
+            self._near_invalidate([full_key])
+            self._op_failed()
+            logger.error(f"存储大对象失败: {e}")
+            return False
+    
+    @_instrumented('get_fields')
+    def get_fields(self, key: str, fields: Iterable[str]) -> Optional[Dict[str, Any]]:
+        """
+        只读取字典中指定的顶层字段（一次往返）
+        
+        - 大对象 'fields' 布局与哈希模式：HMGET，只传输请求的字段
+        - 字符串模式的普通字典：Lua 脚本在服务端解析，只返回请求的字段；
+          文档含 cjson 无法无损往返的内容（浮点数、空数组 / 空对象等）或为二进制载荷时，
+          取回整份后在本地筛选，保证返回值的类型与 get_dict 一致
+        - 大对象 'chunks' 布局：取回全部分块后在本地筛选
+        
+        Args:
+            key: 存储键名
+            fields: 字段名列表
+        
+        Returns:
+            {字段: 值}，不存在的字段不出现；键不存在或读取失败时返回 None
+        """
+        fields = [str(f) for f in dict.fromkeys(fields)]
+        full_key = self._get_full_key(key)
+        try:
+            reply = self._fields_script(keys=[full_key], args=[_LARGE_MARKER, *fields])
+            if reply == 0:
+                data = self._read_string_doc(full_key)
+            elif reply[0] == 1:
+                data = self._pick_hash_fields(full_key, fields, reply[1])
+            elif reply[0] == 2:
+                self._op_size(reply[1])
+                # cjson 把空表编码为 []
+                data = self._json_codec.loads(reply[1]) or {}
+            else:
+                data = None
+            
+            if data is None:
+                self._log_op("键 '%s' 不存在", key)
+                return None
+            self._log_op("成功读取键 '%s' 的 %d 个字段", key, len(fields))
+            return {f: data[f] for f in fields if f in data}
+        
+        except Exception as e:
+            self._op_failed()
+            logger.error(f"读取字典字段失败: {e}")
+            return None
+    
+    def _pick_hash_fields(self, full_key: str, fields: List[str], values: List[Any]) -> Dict[str, Any]:
+        """
+        解码 _LUA_GET_FIELDS 对哈希返回的 HMGET 结果
+        
+        Args:
+            full_key: 完整键名
+            fields: 请求的字段
+            values: HMGET 结果，首项为大对象清单
+        
+        Returns:
+            {字段: 值}（'chunks' 布局为整份字典）
+        """
+        manifest = self._parse_manifest(values[0])
+        if manifest is not None and manifest['layout'] == 'chunks':
+            mapping = self.redis_client.hgetall(full_key)
+            self._op_size(mapping)
+            return self._decode_large(mapping) or {}
+        found = {f: v for f, v in zip(fields, values[1:]) if v is not None}
+        self._op_size(found)
+        loads = self._deserialize_dict if manifest is not None else self._json_codec.loads
+        return {f: loads(v) for f, v in found.items()}
+    
+    def iter_fields(self, key: str, count: Optional[int] = None) -> Iterator[tuple]:
+        """
+        流式遍历字典的顶层字段
+        
+        大对象 'fields' 布局与哈希模式用 HSCAN 分批读取，内存中只保留一批字段；其他情况读取整份字典后逐项产出。
+        遍历期间大对象被修改时，结果可能混有修改前后的字段（会记录警告）
+        
+        Args:
+            key: 存储键名
+            count: HSCAN 每次迭代的 COUNT 提示值，None 使用实例的 scan_count
+        
+        Returns:
+            逐个产出的 (字段, 值)
+        """
+        full_key = self._get_full_key(key)
+        try:
+            kind = self.redis_client.type(full_key)
+            if isinstance(kind, bytes):
+                kind = kind.decode('utf-8')
+            manifest = self._parse_manifest(self.redis_client.hget(full_key, _LARGE_MARKER)) if kind == 'hash' else None
+            if kind != 'hash' or (manifest is not None and manifest['layout'] == 'chunks'):
+                yield from (self.get_dict(key) or {}).items()
+                return
+            loads = self._deserialize_dict if manifest is not None else self._json_codec.loads
+            for field, raw in self.redis_client.hscan_iter(full_key, count=count or self.scan_count):
+                if isinstance(field, bytes):
+                    field = field.decode('utf-8')
+                if field not in (_LARGE_MARKER, _HASH_MARKER):
+                    yield field, loads(raw)
+            if manifest is not None and self._parse_manifest(self.redis_client.hget(full_key, _LARGE_MARKER)) != manifest:
+                logger.warning(f"遍历期间键 '{key}' 被修改，结果可能混有修改前后的字段")
+        
+        except Exception as e:
+            logger.error(f"遍历字典字段失败: {e}")
+    
+    @_instrumented('delete_dict')
+    def delete_dict(self, key: str) -> bool:
+        """
+        删除字典
+        
+        Args:
+            key: 存储键名
+            
+        Returns:
+            是否删除成功
+        """
+        try:
+            full_key = self._get_full_key(key)
+            result = self.redis_client.delete(full_key)
+            self._near_invalidate([full_key])
+            
+            if result > 0:
+                self._log_op("成功删除键 '%s' 的字典数据", key)
+                return True
+            else:
+                self._log_op("键 '%s' 不存在，无需删除", key)
+                return False
+                
+        except Exception as e:
+            self._op_failed()
+            logger.error(f"删除字典失败: {e}")
+            return False
+    
+    @_instrumented('exists_dict')
+    def exists_dict(self, key: str) -> bool:
+        """
+        检查字典是否存在
+        
+        Args:
+            key: 存储键名
+            
+        Returns:
+            字典是否存在
+        """
+        try:
+            full_key = self._get_full_key(key)
+            result = self.redis_client.exists(full_key)
+            return bool(result)
+            
+        except Exception as e:
+            self._op_failed()
+            logger.error(f"检查字典存在性失败: {e}")
+            return False
+    
+    def iter_dict_keys(self, pattern: str = "*", count: Optional[int] = None) -> Iterator[str]:
+        """
+        用 SCAN 逐批遍历匹配模式的字典键（不会像 KEYS 那样阻塞 Redis 服务器）
+        
+        Args:
+            pattern: 匹配模式，默认为所有键
+            count: 每次 SCAN 的 COUNT 提示值，None 使用实例默认值
+            
+        Returns:
+            逐个产出的键名（去除前缀）；遍历期间发生 rehash 时同一个键可能出现多次
+        """
+        full_pattern = f"{self.prefix}{pattern}"
+        n = len(self.prefix)
+        for key in self.redis_client.scan_iter(match=full_pattern, count=count or self.scan_count):
+            if isinstance(key, bytes):
+                key = key.decode('utf-8')
+            yield key[n:]
+    
+    def get_dict_keys(self, pattern: str = "*", count: Optional[int] = None) -> Iterator[str]:
+        """
+        获取所有匹配模式的字典键名（基于 SCAN 流式产出，需要列表时用 list() 收集）
+        
+        Args:
+            pattern: 匹配模式，默认为所有键
+            count: 每次 SCAN 的 COUNT 提示值，None 使用实例默认值
+            
+        Returns:
+            匹配的键名迭代器（去除前缀）
+        """
+        found = 0
+        try:
+            for key in self.iter_dict_keys(pattern, count):
+                found += 1
+                yield key
+            self._log_op("找到 %d 个匹配的字典键", found)
+        except Exception as e:
+            logger.error(f"获取字典键列表失败: {e}")
+    
+    @_instrumented('get_dict_size')
+    def get_dict_size(self, key: str) -> int:
+        """
+        获取字典存储的大小（字节数；哈希模式与大对象为各字段值长度之和）
+        
+        Args:
+            key: 存储键名
+        
+        Returns:
+            字符串大小，如果不存在则返回 0
+        """
+        try:
+            full_key = self._get_full_key(key)
+            if self.storage == 'string':
+                try:
+                    return self.redis_client.strlen(full_key)
+                except redis.ResponseError as e:
+                    if 'WRONGTYPE' not in str(e):
+                        raise
+            values = self.redis_client.hvals(full_key)
+            return sum(len(v.encode('utf-8') if isinstance(v, str) else v) for v in values)
+        
+        except Exception as e:
+            self._op_failed()
+            logger.error(f"获取字典大小失败: {e}")
+            return 0
+    
+    @_instrumented('set_many')
+    def set_many(self, items: Dict[str, Dict[str, Any]], ex: Optional[int] = None,
+                 ttls: Optional[Dict[str, int]] = None, chunk_size: Optional[int] = None) -> Dict[str, bool]:
+        """
+        批量存储字典（每批一次往返：字符串模式中无过期时间的键用 MSET，其余键在同一管道中逐键写入）
+        
+        Args:
+            items: {键名: 字典}
+            ex: 默认过期时间（秒），None 表示不过期
+            ttls: 按键指定的过期时间（秒），优先于 ex
+            chunk_size: 每批键数量，None 使用实例默认值
+            
+        Returns:
+            {键名: 是否存储成功}；序列化失败的键为 False，不影响其他键
+        """
+        size = max(1, int(chunk_size or self.chunk_size))
+        ttls = ttls or {}
+        results: Dict[str, bool] = {key: False for key in items}
+        encoded: List[tuple] = []
+        for key, data in items.items():
+            try:
+                payload = self._encode(data)
+                self._op_size(payload)
+                encoded.append((key, payload, ttls.get(key, ex)))
+            except ValueError:
+                pass
+        
+        for batch in self._chunks(encoded, size):
+            if self.storage == 'hash':
+                self._set_hash_batch(batch, results)
+                continue
+            try:
+                pipe = self.redis_client.pipeline(transaction=False)
+                plain = {self._get_full_key(k): v for k, v, ttl in batch if not ttl}
+                expiring = [(k, v, ttl) for k, v, ttl in batch if ttl]
+                if plain:
+                    pipe.mset(plain)
+                for k, v, ttl in expiring:
+                    pipe.set(self._get_full_key(k), v, ex=ttl)
+                replies = pipe.execute(raise_on_error=False)
+                
+                offset = 0
+                if plain:
+                    ok = replies[0] is True
+                    for k, _v, ttl in batch:
+                        if not ttl:
+                            results[k] = ok
+                    offset = 1
+                for (k, _v, _ttl), reply in zip(expiring, replies[offset:]):
+                    results[k] = reply is True
+            except Exception as e:
+                self._op_failed()
+                logger.error(f"批量存储字典失败: {e}")
+                for k, _v, _ttl in batch:
+                    results[k] = False
+        
+        self._near_invalidate(self._get_full_key(k) for k in items)
+        ok_count = sum(1 for v in results.values() if v)
+        self._log_op("批量存储 %d 个字典，成功 %d 个", len(items), ok_count)
+        return results
+    
+    def _set_hash_batch(self, batch: List[tuple], results: Dict[str, bool]) -> None:
+        """
+        哈希模式下写入一批字典（同一事务，读者不会看到删除旧字段后、写入新字段前的中间状态）
+        
+        Args:
+            batch: [(键名, 字段映射, 过期时间)]
+            results: 写入逐键结果的字典
+        """
+        try:
+            pipe = self.redis_client.pipeline(transaction=True)
+            spans = [(k, self._queue_write(pipe, k, mapping, ttl)) for k, mapping, ttl in batch]
+            replies = pipe.execute(raise_on_error=False)
+            pos = 0
+            for k, n in spans:
+                results[k] = not any(isinstance(r, Exception) for r in replies[pos:pos + n])
+                pos += n
+        except Exception as e:
+            self._op_failed()
+            logger.error(f"批量存储字典失败: {e}")
+            for k, _mapping, _ttl in batch:
+                results[k] = False
+    
+    @_instrumented('get_many')
+    def get_many(self, keys: Iterable[str], chunk_size: Optional[int] = None) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        批量读取字典（字符串模式按批在同一管道中 MGET 并查询各键类型，只对大对象再 HGETALL；哈希模式按批在管道中 HGETALL）
+        
+        Args:
+            keys: 键名列表
+            chunk_size: 每批键数量，None 使用实例默认值
+            
+        Returns:
+            {键名: 字典}；不存在、读取或反序列化失败的键为 None
+        """
+        size = max(1, int(chunk_size or self.chunk_size))
+        keys = list(dict.fromkeys(keys))
+        results: Dict[str, Optional[Dict[str, Any]]] = {}
+        for batch in self._chunks(keys, size):
+            try:
+                if self.storage == 'string':
+                    full_keys = [self._get_full_key(k) for k in batch]
+                    pipe = self.redis_client.pipeline(transaction=False)
+                    pipe.mget(full_keys)
+                    for full_key in full_keys:
+                        pipe.type(full_key)
+                    values, *kinds = pipe.execute()
+                    large = self._large_misses(values, kinds)
+                    if large:
+                        # MGET 对大对象（哈希）返回空值，只补读类型为哈希的键
+                        pipe = self.redis_client.pipeline(transaction=False)
+                        for i in large:
+                            pipe.hgetall(full_keys[i])
+                        for i, mapping in zip(large, pipe.execute()):
+                            values[i] = mapping or None
+                else:
+                    pipe = self.redis_client.pipeline(transaction=False)
+                    for k in batch:
+                        pipe.hgetall(self._get_full_key(k))
+                    values = pipe.execute()
+            except Exception as e:
+                self._op_failed()
+                logger.error(f"批量读取字典失败: {e}")
+                values = [None] * len(batch)
+            for k, raw in zip(batch, values):
+                self._op_size(raw)
+                try:
+                    results[k] = self._decode(raw)
+                except ValueError:
+                    results[k] = None
+        
+        found = sum(1 for v in results.values() if v is not None)
+        self._log_op("批量读取 %d 个键，命中 %d 个", len(keys), found)
+        return results
+    
+    @_instrumented('delete_many')
+    def delete_many(self, keys: Iterable[str], chunk_size: Optional[int] = None) -> Dict[str, bool]:
+        """
+        批量删除字典（按批在管道中逐键 DEL，以得到每个键的结果）
+        
+        Args:
+            keys: 键名列表
+            chunk_size: 每批键数量，None 使用实例默认值
+            
+        Returns:
+            {键名: 是否删除（不存在为 False）}
+        """
+        results = self._pipeline_per_key(keys, 'delete', chunk_size)
+        self._near_invalidate(self._get_full_key(k) for k in results)
+        self._log_op("批量删除 %d 个键，实际删除 %d 个", len(results), sum(1 for v in results.values() if v))
+        return results
+    
+    @_instrumented('exists_many')
+    def exists_many(self, keys: Iterable[str], chunk_size: Optional[int] = None) -> Dict[str, bool]:
+        """
+        批量检查字典是否存在
+        
+        Args:
+            keys: 键名列表
+            chunk_size: 每批键数量，None 使用实例默认值
+            
+        Returns:
+            {键名: 是否存在}
+        """
+        return self._pipeline_per_key(keys, 'exists', chunk_size)
+    
+    def _pipeline_per_key(self, keys: Iterable[str], command: str, chunk_size: Optional[int]) -> Dict[str, bool]:
+        """
+        在管道中对每个键执行同一单键命令，返回逐键结果
+        
+        Args:
+            keys: 键名列表
+            command: redis 客户端方法名（如 'delete'、'exists'）
+            chunk_size: 每批键数量
+            
+        Returns:
+            {键名: 命令返回值是否大于 0}；该批网络失败时为 False
+        """
+        size = max(1, int(chunk_size or self.chunk_size))
+        keys = list(dict.fromkeys(keys))
+        results: Dict[str, bool] = {}
+        for batch in self._chunks(keys, size):
+            try:
+                pipe = self.redis_client.pipeline(transaction=False)
+                for k in batch:
+                    getattr(pipe, command)(self._get_full_key(k))
+                replies = pipe.execute(raise_on_error=False)
+                for k, reply in zip(batch, replies):
+                    results[k] = isinstance(reply, int) and reply > 0
+            except Exception as e:
+                self._op_failed()
+                logger.error(f"批量执行 {command} 失败: {e}")
+                for k in batch:
+                    results[k] = False
+        return results
+    
+    @_instrumented('clear_all_dicts')
+    def clear_all_dicts(self, batch_size: Optional[int] = None, count: Optional[int] = None,
+                        progress_cb: Optional[Callable[[int], None]] = None) -> int:
+        """
+        清除所有字典数据（SCAN 逐批取键，按批 UNLINK 在后台释放内存，不阻塞其他客户端）
+        
+        Args:
+            batch_size: 每批删除的键数量，None 使用实例默认的 chunk_size
+            count: 每次 SCAN 的 COUNT 提示值，None 使用实例默认值
+            progress_cb: 每批删除后回调，参数为累计删除的键数量
+            
+        Returns:
+            删除的键数量
+        """
+        size = max(1, int(batch_size or self.chunk_size))
+        pattern = f"{self.prefix}*"
+        deleted = 0
+        use_unlink = True
+        batch: List[Any] = []
+        
+        def flush() -> int:
+            nonlocal use_unlink
+            if use_unlink:
+                try:
+                    return self.redis_client.unlink(*batch)
+                except redis.ResponseError:
+                    # Redis 4.0 以下没有 UNLINK，退回 DEL
+                    use_unlink = False
+            return self.redis_client.delete(*batch)
+        
+        try:
+            for key in self.redis_client.scan_iter(match=pattern, count=count or self.scan_count):
+                batch.append(key)
+                if len(batch) >= size:
+                    deleted += flush()
+                    batch = []
+                    if progress_cb:
+                        try:
+                            progress_cb(deleted)
+                        except Exception:
+                            pass
+            if batch:
+                deleted += flush()
+                if progress_cb:
+                    try:
+                        progress_cb(deleted)
+                    except Exception:
+                        pass
+        except Exception as e:
+            self._op_failed()
+            logger.error(f"清除所有字典失败: {e}")
+            return deleted
+        finally:
+            if self._near is not None:
+                self._near.clear()
+                self._near_publish(['*'])
+        
+        if deleted:
+            logger.info(f"成功删除 {deleted} 个字典键")
+        else:
+            logger.info("没有找到要删除的字典数据")
+        return deleted
+
+
+class AsyncRedisStringDict(_RedisDictBase):
+    """
+    基于 redis.asyncio 的异步字典存储类，接口与 RedisStringDict 相同（方法均为协程），
+    但不提供大对象的写入与部分读取（set_large / get_fields / iter_fields）；
+    RedisStringDict.set_large 写入的大对象可以整份读取、更新、删除与统计大小（与同步类一样不支持 incr_field）
+    
+    特点:
+    - 不阻塞事件循环，适合在 FastAPI 等异步服务中使用
+    - 使用显式的阻塞式连接池（最大连接数、健康检查间隔、TCP keepalive），可由多个实例共享；
+      连接用尽时等待空闲连接而不是报错，多个协程可放心用 asyncio.gather 并发调用
+    - 支持 async with：进入时测试连接，退出时关闭客户端（连接池由本实例创建时一并断开）
+    - 批量操作的各批次在不同连接上并发执行，并发批次数受 concurrency 限制
+    """
+    
+    def __init__(self, host: str = '127.0.0.1', port: int = 6379, db: int = 0,
+                 decode_responses: bool = True, prefix: str = 'dict:', chunk_size: int = 500,
+                 scan_count: int = 1000, storage: str = 'string', codec: str = 'json',
+                 compression: Optional[str] = None, compress_threshold: int = 1024,
+                 pool: Optional[aioredis.ConnectionPool] = None, max_connections: int = 50,
+                 health_check_interval: int = 30, socket_keepalive: bool = True,
+                 pool_timeout: Optional[float] = 20, concurrency: int = 8, metrics: Optional[Metrics] = None,
+                 log_sample_rate: float = 0.0, slow_log_threshold: Optional[float] = None,
+                 server_merge: bool = False):
+        """
+        初始化异步客户端（不在构造函数中建立连接，首次命令或 connect() 时建立）
+        
+        Args:
+            host: Redis 服务器地址
+            port: Redis 服务器端口
+            db: Redis 数据库编号
+            decode_responses: 是否自动解码响应为字符串
+            prefix: 键名前缀，用于区分不同类型的数据
+            chunk_size: 批量操作每批发送的键数量（每批一次网络往返）
+            scan_count: SCAN 每次迭代的 COUNT 提示值
+            storage: 存储模式，'string' 或 'hash'
+            codec: 字符串模式的编解码器，同 RedisStringDict
+            compression: 字符串模式的压缩算法，同 RedisStringDict
+            compress_threshold: 编码后达到该字节数才压缩
+            pool: 共享的连接池，None 时按下面的参数创建本实例专用的连接池；
+                载荷可能是二进制（msgpack 或压缩）时，共享的连接池必须以 decode_responses=False 创建
+            max_connections: 连接池最大连接数
+            health_check_interval: 连接空闲超过该秒数后，使用前先 PING 检查
+            socket_keepalive: 是否开启 TCP keepalive
+            pool_timeout: 连接用尽时等待空闲连接的秒数，None 表示一直等待
+            concurrency: 单次批量调用中同时执行的批次数量
+            metrics: 指标收集器，None 使用进程内共用的 default_metrics()
+            log_sample_rate: 成功操作按该比例抽样记录 INFO 日志，默认 0（只在 DEBUG 级别记录）
+            slow_log_threshold: 耗时超过该秒数的操作记录警告，None（默认）表示不记录
+            server_merge: 同 RedisStringDict
+        """
+        self._configure(prefix, chunk_size, scan_count, storage, codec, compression, compress_threshold,
+                        server_merge)
+        self._configure_observability(metrics, log_sample_rate, slow_log_threshold)
+        if pool is not None and self._binary_values and pool.connection_kwargs.get('decode_responses'):
+            raise ValueError("二进制载荷（msgpack 或压缩）需要 decode_responses=False 的连接池")
+        self.host = host
+        self.port = port
+        self._owns_pool = pool is None
+        self.pool = pool if pool is not None else self.create_pool(
+            host=host,
+            port=port,
+            db=db,
+            decode_responses=decode_responses and not self._binary_values,
+            max_connections=max_connections,
+            health_check_interval=health_check_interval,
+            socket_keepalive=socket_keepalive,
+            timeout=pool_timeout
+        )
+        self.concurrency = max(1, int(concurrency))
+        self.redis_client = aioredis.Redis(connection_pool=self.pool)
+        self._merge_script = self.redis_client.register_script(_LUA_MERGE)
+        self._incr_script = self.redis_client.register_script(_LUA_INCR)
+        self._unlock_script = self.redis_client.register_script(_LUA_UNLOCK)
+    
+    @staticmethod
+    def create_pool(host: str = '127.0.0.1', port: int = 6379, db: int = 0, decode_responses: bool = True,
+                    max_connections: int = 50, health_check_interval: int = 30, socket_keepalive: bool = True,
+                    timeout: Optional[float] = 20, **kwargs: Any) -> aioredis.BlockingConnectionPool:
+        """
+        创建可在多个 AsyncRedisStringDict 实例间共享的连接池
+        
+        Args:
+            host: Redis 服务器地址
+            port: Redis 服务器端口
+            db: Redis 数据库编号
+            decode_responses: 是否自动解码响应为字符串
+            max_connections: 最大连接数
+            health_check_interval: 连接空闲超过该秒数后，使用前先 PING 检查
+            socket_keepalive: 是否开启 TCP keepalive
+            timeout: 连接用尽时等待空闲连接的秒数
+            **kwargs: 其他连接参数（如 password、socket_timeout）
+        
+        Returns:
+            阻塞式连接池
+        """
+        return aioredis.BlockingConnectionPool(
+            host=host,
+            port=port,
+            db=db,
+            decode_responses=decode_responses,
+            max_connections=max_connections,
+            health_check_interval=health_check_interval,
+            socket_keepalive=socket_keepalive,
+            timeout=timeout,
+            **kwargs
+        )
+    
+    async def connect(self) -> 'AsyncRedisStringDict':
+        """
+        测试连接
+        
+        Returns:
+            实例本身
+        """
+        try:
+            await self.redis_client.ping()
+            logger.info(f"成功连接到 Redis 服务器 {self.host}:{self.port}")
+        except redis.ConnectionError as e:
+            logger.error(f"无法连接到 Redis 服务器: {e}")
+            raise
+        except Exception as e:
+            logger.error(f"Redis 连接初始化失败: {e}")
+            raise
+        return self
+    
+    async def aclose(self) -> None:
+        """
+        关闭客户端；连接池由本实例创建时一并断开，共享的连接池留给创建者关闭
+        """
+        await self.redis_client.aclose()
+        if self._owns_pool:
+            await self.pool.disconnect()
+    
+    async def __aenter__(self) -> 'AsyncRedisStringDict':
+        return await self.connect()
+    
+    async def __aexit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        await self.aclose()
+    
+    async def _gather_batches(self, batches: List[List[Any]], fn: Callable[[List[Any]], Awaitable[None]]) -> None:
+        """
+        并发执行各批次，同时执行的批次数不超过 concurrency
+        
+        Args:
+            batches: 切分好的批次
+            fn: 处理一个批次的协程函数（自行处理异常并写入结果）
+        """
+        limit = asyncio.Semaphore(self.concurrency)
+        
+        async def run(batch: List[Any]) -> None:
+            async with limit:
+                await fn(batch)
+        
+        await asyncio.gather(*(run(batch) for batch in batches))
+    
+    async def _acquire_lock(self, key: str, timeout: float) -> Optional[str]:
+        """
+        获取键的短期锁（SET NX PX）
+        
+        Args:
+            key: 存储键名
+            timeout: 锁自动过期的秒数
+        
+        Returns:
+            获取成功返回释放锁用的令牌，锁已被其他调用方持有返回 None；Redis 出错时抛出异常
+        """
+        token = os.urandom(8).hex()
+        lock_key = _LOCK_PREFIX + self._get_full_key(key)
+        if await self.redis_client.set(lock_key, token, nx=True, px=max(1, int(timeout * 1000))):
+            return token
+        return None
+    
+    async def _release_lock(self, key: str, token: str) -> None:
+        """
+        释放 _acquire_lock 获取的锁（锁已过期并被他人获取时不删除）
+        
+        Args:
+            key: 存储键名
+            token: _acquire_lock 返回的令牌
+        """
+        await self._unlock_script(keys=[_LOCK_PREFIX + self._get_full_key(key)], args=[token])
+    
+    @_instrumented('set_dict')
+    async def set_dict(self, key: str, data: Dict[str, Any], ex: Optional[int] = None) -> bool:
+        """
+        存储字典到 Redis（字符串模式为整份 JSON，哈希模式在事务中整体替换全部字段）
+        
+        Args:
+            key: 存储键名
+            data: 要存储的字典
+            ex: 过期时间（秒），None 表示不过期
+        
+        Returns:
+            是否存储成功
+        """
+        try:
+            if self.storage == 'string':
+                json_str = self._serialize_dict(data)
+                self._op_size(json_str)
+                result = await self.redis_client.set(self._get_full_key(key), json_str, ex=ex)
+                size = len(json_str)
+            else:
+                payload = self._encode(data)
+                self._op_size(payload)
+                async with self.redis_client.pipeline(transaction=True) as pipe:
+                    self._queue_write(pipe, key, payload, ex)
+                    result = all(r is not False for r in await pipe.execute())
+                size = len(data)
+            
+            if result:
+                self._log_op("成功存储字典到键 '%s'，数据大小: %s %s", key, size,
+                             "字符" if self.storage == 'string' else "个字段")
+                return True
+            else:
+                self._op_failed()
+                logger.warning(f"存储字典到键 '{key}' 失败")
+                return False
+        
+        except Exception as e:
+            self._op_failed()
+            logger.error(f"存储字典失败: {e}")
+            return False
+    
+    @_instrumented('get_dict')
+    async def get_dict(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        从 Redis 读取字典
+        
+        Args:
+            key: 存储键名
+        
+        Returns:
+            读取到的字典，如果不存在则返回 None
+        """
+        try:
+            full_key = self._get_full_key(key)
+            if self.storage == 'string':
+                try:
+                    raw = await self.redis_client.get(full_key)
+                except redis.ResponseError as e:
+                    if 'WRONGTYPE' not in str(e):
+                        raise
+                    # 大对象（RedisStringDict.set_large 写入的哈希）
+                    raw = await self.redis_client.hgetall(full_key)
+            else:
+                raw = await self.redis_client.hgetall(full_key)
+            self._op_size(raw)
+            data = self._decode(raw)
+            
+            if data is None:
+                self._log_op("键 '%s' 不存在", key)
+                return None
+            
+            self._log_op("成功读取键 '%s' 的字典数据", key)
+            return data
+        
+        except Exception as e:
+            self._op_failed()
+            logger.error(f"读取字典失败: {e}")
+            return None
+    
+    @_instrumented('update_dict')
+    async def update_dict(self, key: str, updates: Dict[str, Any]) -> bool:
+        """
+        原子地更新字典中的部分数据（规则同 RedisStringDict.update_dict）
+        
+        Args:
+            key: 存储键名
+            updates: 要更新的键值对
+        
+        Returns:
+            是否更新成功
+        """
+        if not updates:
+            return True
+        try:
+            full_key = self._get_full_key(key)
+            if self.storage == 'hash':
+                mapping = self._to_hash_mapping(updates)
+                self._op_size(mapping)
+                await self.redis_client.hset(full_key, mapping=mapping)
+            else:
+                payload = self._dumps_json(updates)
+                self._op_size(payload)
+                try:
+                    if (not self.server_merge or not self._lua_enabled or not self._lua_safe(payload)
+                            or not await self._merge_script(keys=[full_key], args=[payload])):
+                        await self._cas_update(key, lambda data: {**data, **updates})
+                except redis.ResponseError as e:
+                    if 'WRONGTYPE' not in str(e):
+                        raise
+                    await self._update_large(full_key, updates)
+            self._log_op("成功更新键 '%s' 的字典数据", key)
+            return True
+        
+        except Exception as e:
+            self._op_failed()
+            logger.error(f"更新字典失败: {e}")
+            return False
+    
+    @_instrumented('incr_field')
+    async def incr_field(self, key: str, field: str, amount: Union[int, float] = 1) -> Optional[Union[int, float]]:
+        """
+        原子地对字典中的数值字段做增量（字段不存在时从 0 开始，键不存在时创建）
+        
+        Args:
+            key: 存储键名
+            field: 字段名
+            amount: 增量，可为负数或小数
+        
+        Returns:
+            增量后的新值，失败（字段不是数值等）返回 None
+        """
+        try:
+            full_key = self._get_full_key(key)
+            if self.storage == 'hash':
+                async with self.redis_client.pipeline(transaction=True) as pipe:
+                    if isinstance(amount, float):
+                        pipe.hincrbyfloat(full_key, field, amount)
+                    else:
+                        pipe.hincrby(full_key, field, int(amount))
+                    pipe.hsetnx(full_key, _HASH_MARKER, '1')
+                    value = (await pipe.execute())[0]
+                return float(value) if isinstance(amount, float) else int(value)
+            
+            use_lua = self._lua_enabled and not isinstance(amount, float)
+            reply = await self._incr_script(keys=[full_key], args=[field, repr(amount)]) if use_lua else 0
+            if reply != 0:
+                return self._incr_result(reply, amount)
+            return (await self._cas_update(key, self._incr_apply(field, amount)))[field]
+        
+        except Exception as e:
+            self._op_failed()
+            logger.error(f"字段自增失败: {e}")
+            return None
+    
+    async def _cas_update(self, key: str, fn: Callable[[Dict[str, Any]], Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        WATCH 乐观事务：读取、在本地修改后写回，期间键被其他客户端改动则重试（字符串模式）
+        
+        Args:
+            key: 存储键名
+            fn: 接收当前字典（不存在时为空字典）并返回新字典的函数
+        
+        Returns:
+            写入后的字典
+        """
+        full_key = self._get_full_key(key)
+        async with self.redis_client.pipeline() as pipe:
+            while True:
+                try:
+                    await pipe.watch(full_key)
+                    raw = await pipe.get(full_key)
+                    ttl = await pipe.pttl(full_key)
+                    data = fn(self._deserialize_dict(raw) if raw is not None else {})
+                    pipe.multi()
+                    pipe.set(full_key, self._serialize_dict(data), px=ttl if ttl and ttl > 0 else None)
+                    await pipe.execute()
+                    return data
+                except redis.WatchError:
+                    continue
+    
+    async def _update_large(self, full_key: str, updates: Dict[str, Any]) -> None:
+        """
+        更新大对象（规则同 RedisStringDict._update_large）
+        
+        Args:
+            full_key: 完整键名
+            updates: 要更新的键值对
+        """
+        async with self.redis_client.pipeline() as pipe:
+            while True:
+                try:
+                    await pipe.watch(full_key)
+                    manifest = self._parse_manifest(await pipe.hget(full_key, _LARGE_MARKER))
+                    if manifest is None:
+                        raise ValueError(f"键 '{full_key}' 是哈希但不是大对象")
+                    if manifest['layout'] == 'fields':
+                        parts = self._encode_large(updates, 'fields', 0)
+                        pipe.multi()
+                        self._queue_large(pipe, full_key, parts, replace=False)
+                    else:
+                        data = {**(self._decode_large(await pipe.hgetall(full_key)) or {}), **updates}
+                        parts = self._encode_large(data, 'chunks', manifest['chunk_size'])
+                        ttl = await pipe.pttl(full_key)
+                        pipe.multi()
+                        self._queue_large(pipe, full_key, parts, replace=True, px=ttl if ttl and ttl > 0 else None)
+                    await pipe.execute()
+                    return
+                except redis.WatchError:
+                    continue
+    
+    @_instrumented('delete_dict')
+    async def delete_dict(self, key: str) -> bool:
+        """
+        删除字典
+        
+        Args:
+            key: 存储键名
+            
+        Returns:
+            是否删除成功
+        """
+        try:
+            result = await self.redis_client.delete(self._get_full_key(key))
+            
+            if result > 0:
+                self._log_op("成功删除键 '%s' 的字典数据", key)
+                return True
+            else:
+                self._log_op("键 '%s' 不存在，无需删除", key)
+                return False
+                
+        except Exception as e:
+            self._op_failed()
+            logger.error(f"删除字典失败: {e}")
+            return False
+    
+    @_instrumented('exists_dict')
+    async def exists_dict(self, key: str) -> bool:
+        """
+        检查字典是否存在
+        
+        Args:
+            key: 存储键名
+            
+        Returns:
+            字典是否存在
+        """
+        try:
+            return bool(await self.redis_client.exists(self._get_full_key(key)))
+            
+        except Exception as e:
+            self._op_failed()
+            logger.error(f"检查字典存在性失败: {e}")
+            return False
+    
+    async def iter_dict_keys(self, pattern: str = "*", count: Optional[int] = None) -> AsyncIterator[str]:
+        """
+        用 SCAN 逐批遍历匹配模式的字典键（async for 使用）
+        
+        Args:
+            pattern: 匹配模式，默认为所有键
+            count: 每次 SCAN 的 COUNT 提示值，None 使用实例默认值
+            
+        Returns:
+            逐个产出的键名（去除前缀）；遍历期间发生 rehash 时同一个键可能出现多次
+        """
+        n = len(self.prefix)
+        async for key in self.redis_client.scan_iter(match=f"{self.prefix}{pattern}", count=count or self.scan_count):
+            if isinstance(key, bytes):
+                key = key.decode('utf-8')
+            yield key[n:]
+    
+    async def get_dict_keys(self, pattern: str = "*", count: Optional[int] = None) -> AsyncIterator[str]:
+        """
+        获取所有匹配模式的字典键名（基于 SCAN 流式产出，需要列表时用 [k async for k in ...] 收集）
+        
+        Args:
+            pattern: 匹配模式，默认为所有键
+            count: 每次 SCAN 的 COUNT 提示值，None 使用实例默认值
+            
+        Returns:
+            匹配的键名异步迭代器（去除前缀）
+        """
+        found = 0
+        try:
+            async for key in self.iter_dict_keys(pattern, count):
+                found += 1
+                yield key
+            self._log_op("找到 %d 个匹配的字典键", found)
+        except Exception as e:
+            logger.error(f"获取字典键列表失败: {e}")
+    
+    @_instrumented('get_dict_size')
+    async def get_dict_size(self, key: str) -> int:
+        """
+        获取字典存储的大小（字节数；哈希模式与大对象为各字段值长度之和）
+        
+        Args:
+            key: 存储键名
+        
+        Returns:
+            字符串大小，如果不存在则返回 0
+        """
+        try:
+            full_key = self._get_full_key(key)
+            if self.storage == 'string':
+                try:
+                    return await self.redis_client.strlen(full_key)
+                except redis.ResponseError as e:
+                    if 'WRONGTYPE' not in str(e):
+                        raise
+            values = await self.redis_client.hvals(full_key)
+            return sum(len(v.encode('utf-8') if isinstance(v, str) else v) for v in values)
+        
+        except Exception as e:
+            self._op_failed()
+            logger.error(f"获取字典大小失败: {e}")
+            return 0
+    
+    @_instrumented('set_many')
+    async def set_many(self, items: Dict[str, Dict[str, Any]], ex: Optional[int] = None,
+                       ttls: Optional[Dict[str, int]] = None, chunk_size: Optional[int] = None) -> Dict[str, bool]:
+        """
+        批量存储字典（写法同 RedisStringDict.set_many，各批次并发执行）
+        
+        Args:
+            items: {键名: 字典}
+            ex: 默认过期时间（秒），None 表示不过期
+            ttls: 按键指定的过期时间（秒），优先于 ex
+            chunk_size: 每批键数量，None 使用实例默认值
+            
+        Returns:
+            {键名: 是否存储成功}；序列化失败的键为 False，不影响其他键
+        """
+        size = max(1, int(chunk_size or self.chunk_size))
+        ttls = ttls or {}
+        results: Dict[str, bool] = {key: False for key in items}
+        encoded: List[tuple] = []
+        for key, data in items.items():
+            try:
+                payload = self._encode(data)
+                self._op_size(payload)
+                encoded.append((key, payload, ttls.get(key, ex)))
+            except ValueError:
+                pass
+        
+        async def write(batch: List[tuple]) -> None:
+            try:
+                if self.storage == 'hash':
+                    async with self.redis_client.pipeline(transaction=True) as pipe:
+                        spans = [(k, self._queue_write(pipe, k, mapping, ttl)) for k, mapping, ttl in batch]
+                        replies = await pipe.execute(raise_on_error=False)
+                    pos = 0
+                    for k, n in spans:
+                        results[k] = not any(isinstance(r, Exception) for r in replies[pos:pos + n])
+                        pos += n
+                    return
+                
+                plain = {self._get_full_key(k): v for k, v, ttl in batch if not ttl}
+                expiring = [(k, v, ttl) for k, v, ttl in batch if ttl]
+                async with self.redis_client.pipeline(transaction=False) as pipe:
+                    if plain:
+                        pipe.mset(plain)
+                    for k, v, ttl in expiring:
+                        pipe.set(self._get_full_key(k), v, ex=ttl)
+                    replies = await pipe.execute(raise_on_error=False)
+                
+                offset = 0
+                if plain:
+                    ok = replies[0] is True
+                    for k, _v, ttl in batch:
+                        if not ttl:
+                            results[k] = ok
+                    offset = 1
+                for (k, _v, _ttl), reply in zip(expiring, replies[offset:]):
+                    results[k] = reply is True
+            except Exception as e:
+                self._op_failed()
+                logger.error(f"批量存储字典失败: {e}")
+                for k, _v, _ttl in batch:
+                    results[k] = False
+        
+        await self._gather_batches(list(self._chunks(encoded, size)), write)
+        ok_count = sum(1 for v in results.values() if v)
+        self._log_op("批量存储 %d 个字典，成功 %d 个", len(items), ok_count)
+        return results
+    
+    @_instrumented('get_many')
+    async def get_many(self, keys: Iterable[str], chunk_size: Optional[int] = None) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        批量读取字典（字符串模式按批在同一管道中 MGET 并查询各键类型，只对大对象再 HGETALL；哈希模式按批在管道中 HGETALL；各批次并发执行）
+        
+        Args:
+            keys: 键名列表
+            chunk_size: 每批键数量，None 使用实例默认值
+            
+        Returns:
+            {键名: 字典}，顺序与传入的键一致；不存在、读取或反序列化失败的键为 None
+        """
+        size = max(1, int(chunk_size or self.chunk_size))
+        keys = list(dict.fromkeys(keys))
+        results: Dict[str, Optional[Dict[str, Any]]] = {k: None for k in keys}
+        
+        async def read(batch: List[str]) -> None:
+            try:
+                if self.storage == 'string':
+                    full_keys = [self._get_full_key(k) for k in batch]
+                    async with self.redis_client.pipeline(transaction=False) as pipe:
+                        pipe.mget(full_keys)
+                        for full_key in full_keys:
+                            pipe.type(full_key)
+                        values, *kinds = await pipe.execute()
+                    large = self._large_misses(values, kinds)
+                    if large:
+                        # MGET 对大对象（哈希）返回空值，只补读类型为哈希的键
+                        async with self.redis_client.pipeline(transaction=False) as pipe:
+                            for i in large:
+                                pipe.hgetall(full_keys[i])
+                            mappings = await pipe.execute()
+                        for i, mapping in zip(large, mappings):
+                            values[i] = mapping or None
+                else:
+                    async with self.redis_client.pipeline(transaction=False) as pipe:
+                        for k in batch:
+                            pipe.hgetall(self._get_full_key(k))
+                        values = await pipe.execute()
+            except Exception as e:
+                self._op_failed()
+                logger.error(f"批量读取字典失败: {e}")
+                return
+            for k, raw in zip(batch, values):
+                self._op_size(raw)
+                try:
+                    results[k] = self._decode(raw)
+                except ValueError:
+                    results[k] = None
+        
+        await self._gather_batches(list(self._chunks(keys, size)), read)
+        found = sum(1 for v in results.values() if v is not None)
+        self._log_op("批量读取 %d 个键，命中 %d 个", len(keys), found)
+        return results
+    
+    @_instrumented('delete_many')
+    async def delete_many(self, keys: Iterable[str], chunk_size: Optional[int] = None) -> Dict[str, bool]:
+        """
+        批量删除字典（按批在管道中逐键 DEL，以得到每个键的结果）
+        
+        Args:
+            keys: 键名列表
+            chunk_size: 每批键数量，None 使用实例默认值
+            
+        Returns:
+            {键名: 是否删除（不存在为 False）}
+        """
+        results = await self._pipeline_per_key(keys, 'delete', chunk_size)
+        self._log_op("批量删除 %d 个键，实际删除 %d 个", len(results), sum(1 for v in results.values() if v))
+        return results
+    
+    @_instrumented('exists_many')
+    async def exists_many(self, keys: Iterable[str], chunk_size: Optional[int] = None) -> Dict[str, bool]:
+        """
+        批量检查字典是否存在
+        
+        Args:
+            keys: 键名列表
+            chunk_size: 每批键数量，None 使用实例默认值
+            
+        Returns:
+            {键名: 是否存在}
+        """
+        return await self._pipeline_per_key(keys, 'exists', chunk_size)
+    
+    async def _pipeline_per_key(self, keys: Iterable[str], command: str, chunk_size: Optional[int]) -> Dict[str, bool]:
+        """
+        在管道中对每个键执行同一单键命令，返回逐键结果（各批次并发执行）
+        
+        Args:
+            keys: 键名列表
+            command: redis 客户端方法名（如 'delete'、'exists'）
+            chunk_size: 每批键数量
+            
+        Returns:
+            {键名: 命令返回值是否大于 0}；该批网络失败时为 False
+        """
+        size = max(1, int(chunk_size or self.chunk_size))
+        keys = list(dict.fromkeys(keys))
+        results: Dict[str, bool] = {k: False for k in keys}
+        
+        async def run(batch: List[str]) -> None:
+            try:
+                async with self.redis_client.pipeline(transaction=False) as pipe:
+                    for k in batch:
+                        getattr(pipe, command)(self._get_full_key(k))
+                    replies = await pipe.execute(raise_on_error=False)
+                for k, reply in zip(batch, replies):
+                    results[k] = isinstance(reply, int) and reply > 0
+            except Exception as e:
+                self._op_failed()
+                logger.error(f"批量执行 {command} 失败: {e}")
+        
+        await self._gather_batches(list(self._chunks(keys, size)), run)
+        return results
+    
+    @_instrumented('clear_all_dicts')
+    async def clear_all_dicts(self, batch_size: Optional[int] = None, count: Optional[int] = None,
+                              progress_cb: Optional[Callable[[int], Any]] = None) -> int:
+        """
+        清除所有字典数据（SCAN 逐批取键，按批 UNLINK 在后台释放内存）
+        
+        Args:
+            batch_size: 每批删除的键数量，None 使用实例默认的 chunk_size
+            count: 每次 SCAN 的 COUNT 提示值，None 使用实例默认值
+            progress_cb: 每批删除后回调，参数为累计删除的键数量；可以是普通函数或协程函数
+            
+        Returns:
+            删除的键数量
+        """
+        size = max(1, int(batch_size or self.chunk_size))
+        pattern = f"{self.prefix}*"
+        deleted = 0
+        use_unlink = True
+        batch: List[Any] = []
+        
+        async def flush() -> int:
+            nonlocal use_unlink
+            if use_unlink:
+                try:
+                    return await self.redis_client.unlink(*batch)
+                except redis.ResponseError:
+                    # Redis 4.0 以下没有 UNLINK，退回 DEL
+                    use_unlink = False
+            return await self.redis_client.delete(*batch)
+        
+        async def report() -> None:
+            if progress_cb:
+                try:
+                    result = progress_cb(deleted)
+                    if inspect.isawaitable(result):
+                        await result
+                except Exception:
+                    pass
+        
+        try:
+            async for key in self.redis_client.scan_iter(match=pattern, count=count or self.scan_count):
+                batch.append(key)
+                if len(batch) >= size:
+                    deleted += await flush()
+                    batch = []
+                    await report()
+            if batch:
+                deleted += await flush()
+                await report()
+        except Exception as e:
+            self._op_failed()
+            logger.error(f"清除所有字典失败: {e}")
+            return deleted
+        
+        if deleted:
+            logger.info(f"成功删除 {deleted} 个字典键")
+        else:
+            logger.info("没有找到要删除的字典数据")
+        return deleted
+
+
+# 客户端分片：每个节点在哈希环上的默认虚拟节点数
+SHARD_REPLICAS = 160
+
+
+class HashRing:
+    """
+    一致性哈希环（虚拟节点）
+    
+    每个节点在环上占 replicas 个点，键归属顺时针方向的第一个点，增删一个节点只改变约 1/N 的键的归属。
+    键名含 {...} 时只按花括号内的部分计算（与 Redis Cluster 的哈希标签相同），相关的键可以落在同一节点
+    """
+    
+    def __init__(self, nodes: Iterable[str] = (), replicas: int = SHARD_REPLICAS):
+        """
+        Args:
+            nodes: 节点名列表
+            replicas: 每个节点的虚拟节点数
+        """
+        self.replicas = max(1, int(replicas))
+        self.nodes: List[str] = []
+        self._points: List[int] = []
+        self._owners: List[str] = []
+        for node in nodes:
+            self.add(node)
+    
+    @staticmethod
+    def _hash(value: str) -> int:
+        return int.from_bytes(hashlib.md5(value.encode('utf-8')).digest()[:8], 'big')
+    
+    @staticmethod
+    def _routing_key(key: str) -> str:
+        start = key.find('{')
+        if start != -1:
+            end = key.find('}', start + 1)
+            if end > start + 1:
+                return key[start + 1:end]
+        return key
+    
+    def add(self, node: str) -> None:
+        """
+        添加节点
+        
+        Args:
+            node: 节点名
+        """
+        if node in self.nodes:
+            raise ValueError(f"节点已存在: {node}")
+        self.nodes.append(node)
+        for i in range(self.replicas):
+            point = self._hash(f"{node}#{i}")
+            pos = bisect.bisect(self._points, point)
+            self._points.insert(pos, point)
+            self._owners.insert(pos, node)
+    
+    def remove(self, node: str) -> None:
+        """
+        移除节点
+        
+        Args:
+            node: 节点名
+        """
+        if node not in self.nodes:
+            raise ValueError(f"节点不存在: {node}")
+        self.nodes.remove(node)
+        kept = [(point, owner) for point, owner in zip(self._points, self._owners) if owner != node]
+        self._points = [point for point, _owner in kept]
+        self._owners = [owner for _point, owner in kept]
+    
+    def copy(self) -> 'HashRing':
+        """
+        复制哈希环（增删节点前先在副本上计算新的归属）
+        """
+        ring = HashRing(replicas=self.replicas)
+        ring.nodes = list(self.nodes)
+        ring._points = list(self._points)
+        ring._owners = list(self._owners)
+        return ring
+    
+    def get_node(self, key: str) -> str:
+        """
+        获取键所属的节点
+        
+        Args:
+            key: 键名
+        
+        Returns:
+            节点名
+        """
+        if not self._points:
+            raise ValueError("哈希环上没有节点")
+        pos = bisect.bisect(self._points, self._hash(self._routing_key(key)))
+        return self._owners[pos % len(self._points)]
+
+
+class ShardedRedisStringDict:
+    """
+    客户端分片的字典存储：按一致性哈希把键分布到多个 Redis 节点，每个节点由一个 RedisStringDict 负责
+    
+    特点:
+    - 单键操作路由到键所属的节点，接口与 RedisStringDict 相同
+    - 批量操作按节点分组，各节点在线程池中并行执行
+    - add_node / remove_node 只迁移改变归属的键（DUMP / RESTORE，保留过期时间与存储结构）
+    - 键名中的 {...} 哈希标签可让相关的键落在同一节点
+    """
+    
+    def __init__(self, nodes: Union[Iterable[Union[str, Dict[str, Any]]], Dict[str, RedisStringDict]],
+                 replicas: int = SHARD_REPLICAS, max_workers: Optional[int] = None, **options: Any):
+        """
+        初始化各节点的连接
+        
+        Args:
+            nodes: 节点列表，每项为 'host:port[/db]' 字符串或连接参数字典（host / port / db，可选 name 指定节点名）；
+                也可以是 {节点名: RedisStringDict} 映射，直接使用已创建的实例
+            replicas: 每个节点在哈希环上的虚拟节点数
+            max_workers: 批量操作并行执行的线程数上限，None 为 32
+            **options: 创建节点时传给 RedisStringDict 的其他参数（prefix、storage、codec、near_cache 等）
+        
+        节点名参与哈希计算，同一组数据的所有客户端应使用相同的节点名与 replicas
+        """
+        self.options = options
+        self.nodes: Dict[str, RedisStringDict] = {}
+        self._owned: set = set()
+        try:
+            if isinstance(nodes, dict):
+                self.nodes.update(nodes)
+            else:
+                for spec in nodes:
+                    name, node = self._create_node(spec)
+                    self._owned.add(name)
+                    if name in self.nodes:
+                        raise ValueError(f"节点已存在: {name}")
+                    self.nodes[name] = node
+            if not self.nodes:
+                raise ValueError("至少需要一个节点")
+        except Exception:
+            for name in self._owned:
+                self.nodes[name].close()
+            raise
+        self._ring = HashRing(self.nodes, replicas)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers or 32, thread_name_prefix='redis-fc-shard')
+    
+    def _create_node(self, spec: Union[str, Dict[str, Any]]) -> tuple:
+        """
+        按连接参数创建节点
+        
+        Args:
+            spec: 'host:port[/db]' 字符串或连接参数字典（可含 name，其余参数覆盖 options）
+        
+        Returns:
+            (节点名, RedisStringDict)
+        """
+        if isinstance(spec, str):
+            address, _sep, db = spec.partition('/')
+            host, sep, port = address.rpartition(':')
+            spec = {'host': host if sep else address, 'port': int(port) if sep else 6379, 'db': int(db or 0)}
+        params = dict(spec)
+        name = params.pop('name', None)
+        if not name:
+            name = f"{params.get('host', '127.0.0.1')}:{params.get('port', 6379)}/{params.get('db', 0)}"
+        return name, RedisStringDict(**{**self.options, **params})
+    
+    def close(self) -> None:
+        """
+        停止线程池并关闭由本实例创建的节点
+        """
+        self._executor.shutdown(wait=True)
+        for name in self._owned:
+            self.nodes[name].close()
+    
+    def node_for(self, key: str) -> str:
+        """
+        获取键所属的节点名
+        
+        Args:
+            key: 存储键名
+        
+        Returns:
+            节点名
+        """
+        return self._ring.get_node(key)
+    
+    def _node(self, key: str) -> RedisStringDict:
+        return self.nodes[self._ring.get_node(key)]
+    
+    def _acquire_lock(self, key: str, timeout: float) -> Optional[str]:
+        return self._node(key)._acquire_lock(key, timeout)
+    
+    def _release_lock(self, key: str, token: str) -> None:
+        self._node(key)._release_lock(key, token)
+    
+    def set_dict(self, key: str, data: Dict[str, Any], ex: Optional[int] = None) -> bool:
+        """存储字典（见 RedisStringDict.set_dict）"""
+        return self._node(key).set_dict(key, data, ex)
+    
+    def get_dict(self, key: str) -> Optional[Dict[str, Any]]:
+        """读取字典（见 RedisStringDict.get_dict）"""
+        return self._node(key).get_dict(key)
+    
+    def update_dict(self, key: str, updates: Dict[str, Any]) -> bool:
+        """原子地更新字典中的部分数据（见 RedisStringDict.update_dict）"""
+        return self._node(key).update_dict(key, updates)
+    
+    def incr_field(self, key: str, field: str, amount: Union[int, float] = 1) -> Optional[Union[int, float]]:
+        """原子地对数值字段做增量（见 RedisStringDict.incr_field）"""
+        return self._node(key).incr_field(key, field, amount)
+    
+    def delete_dict(self, key: str) -> bool:
+        """删除字典（见 RedisStringDict.delete_dict）"""
+        return self._node(key).delete_dict(key)
+    
+    def exists_dict(self, key: str) -> bool:
+        """检查字典是否存在（见 RedisStringDict.exists_dict）"""
+        return self._node(key).exists_dict(key)
+    
+    def get_dict_size(self, key: str) -> int:
+        """获取字典存储的大小（见 RedisStringDict.get_dict_size）"""
+        return self._node(key).get_dict_size(key)
     
-    def __init__(self, host: str = '127.0.0.1', port: int = 6379, db: int = 0, 
-                 decode_responses: bool = True, prefix: str = 'dict:'):
+    def set_large(self, key: str, data: Dict[str, Any], ex: Optional[int] = None, layout: str = 'fields',
+                  chunk_size_bytes: int = LARGE_CHUNK_SIZE) -> bool:
+        """以大对象方式存储字典（见 RedisStringDict.set_large）"""
+        return self._node(key).set_large(key, data, ex, layout, chunk_size_bytes)
+    
+    def get_fields(self, key: str, fields: Iterable[str]) -> Optional[Dict[str, Any]]:
+        """只读取指定的顶层字段（见 RedisStringDict.get_fields）"""
+        return self._node(key).get_fields(key, fields)
+    
+    def iter_fields(self, key: str, count: Optional[int] = None) -> Iterator[tuple]:
+        """流式遍历字典的顶层字段（见 RedisStringDict.iter_fields）"""
+        return self._node(key).iter_fields(key, count)
+    
+    def iter_dict_keys(self, pattern: str = "*", count: Optional[int] = None) -> Iterator[str]:
         """
-        初始化 Redis 连接
+        依次遍历各节点上匹配模式的字典键（见 RedisStringDict.iter_dict_keys）
         
         Args:
-            host: Redis 服务器地址
-            port: Redis 服务器端口
-            db: Redis 数据库编号
-            decode_responses: 是否自动解码响应为字符串
-            prefix: 键名前缀，用于区分不同类型的数据
+            pattern: 匹配模式，默认为所有键
+            count: 每次 SCAN 的 COUNT 提示值，None 使用节点的默认值
+        
+        Returns:
+            逐个产出的键名（去除前缀）
         """
-        self.prefix = prefix
-        try:
-            self.redis_client = redis.Redis(
-                host=host, 
-                port=port, 
-                db=db, 
-                decode_responses=decode_responses
-            )
-            # 测试连接
-            self.redis_client.ping()
-            logger.info(f"成功连接到 Redis 服务器 {host}:{port}")
-        except redis.ConnectionError as e:
-            logger.error(f"无法连接到 Redis 服务器: {e}")
-            raise
-        except Exception as e:
-            logger.error(f"Redis 连接初始化失败: {e}")
-            raise
+        for node in list(self.nodes.values()):
+            yield from node.iter_dict_keys(pattern, count)
     
-    def _get_full_key(self, key: str) -> str:
+    def get_dict_keys(self, pattern: str = "*", count: Optional[int] = None) -> Iterator[str]:
+        """获取所有节点上匹配模式的字典键（与 iter_dict_keys 相同）"""
+        return self.iter_dict_keys(pattern, count)
+    
+    def _group(self, keys: Iterable[str]) -> Dict[str, List[str]]:
         """
-        获取完整的 Redis 键名（添加前缀）
+        按所属节点分组（去重并保持顺序）
         
         Args:
-            key: 原始键名
-            
+            keys: 键名列表
+        
         Returns:
-            完整的键名
+            {节点名: 键名列表}
         """
-        return f"{self.prefix}{key}"
+        groups: Dict[str, List[str]] = {}
+        for key in dict.fromkeys(keys):
+            groups.setdefault(self._ring.get_node(key), []).append(key)
+        return groups
     
-    def _serialize_dict(self, data: Dict[str, Any]) -> str:
+    def _run_parallel(self, groups: Dict[str, Any], fn: Callable[[RedisStringDict, Any], Any]) -> Dict[str, Any]:
         """
-        将字典序列化为 JSON 字符串
+        在各节点上并行执行操作（只涉及一个节点时直接在当前线程执行）
         
         Args:
-            data: 要序列化的字典
-            
+            groups: {节点名: 该节点的参数}
+            fn: 接收节点与参数，返回该节点的结果
+        
         Returns:
-            JSON 字符串
+            {节点名: 结果}；执行出错的节点不出现
         """
-        try:
-            return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
-        except (TypeError, ValueError) as e:
-            logger.error(f"字典序列化失败: {e}")
-            raise ValueError(f"无法序列化字典: {e}")
+        futures = {name: self._executor.submit(fn, self.nodes[name], arg)
+                   for name, arg in groups.items()} if len(groups) > 1 else {}
+        results: Dict[str, Any] = {}
+        for name, arg in groups.items():
+            try:
+                results[name] = futures[name].result() if futures else fn(self.nodes[name], arg)
+            except Exception as e:
+                logger.error(f"节点 '{name}' 执行批量操作失败: {e}")
+        return results
     
-    def _deserialize_dict(self, json_str: str) -> Dict[str, Any]:
+    def set_many(self, items: Dict[str, Dict[str, Any]], ex: Optional[int] = None,
+                 ttls: Optional[Dict[str, int]] = None, chunk_size: Optional[int] = None) -> Dict[str, bool]:
         """
-        将 JSON 字符串反序列化为字典
+        批量存储字典：按节点分组，各节点并行执行（见 RedisStringDict.set_many）
         
-        Args:
-            json_str: JSON 字符串
-            
         Returns:
-            反序列化后的字典
+            {键名: 是否存储成功}
         """
-        try:
-            return json.loads(json_str)
-        except (json.JSONDecodeError, TypeError) as e:
-            logger.error(f"字典反序列化失败: {e}")
-            raise ValueError(f"无法反序列化字符串为字典: {e}")
+        ttls = ttls or {}
+        groups = {name: {k: items[k] for k in keys} for name, keys in self._group(items).items()}
+        replies = self._run_parallel(groups, lambda node, sub: node.set_many(
+            sub, ex, {k: ttls[k] for k in sub if k in ttls}, chunk_size))
+        results = {key: False for key in items}
+        for reply in replies.values():
+            results.update(reply)
+        return results
     
-    def set_dict(self, key: str, data: Dict[str, Any], ex: Optional[int] = None) -> bool:
+    def get_many(self, keys: Iterable[str], chunk_size: Optional[int] = None) -> Dict[str, Optional[Dict[str, Any]]]:
         """
-        存储字典到 Redis（使用字符串类型）
+        批量读取字典：按节点分组，各节点并行执行（见 RedisStringDict.get_many）
         
-        Args:
-            key: 存储键名
-            data: 要存储的字典
-            ex: 过期时间（秒），None 表示不过期
-            
         Returns:
-            是否存储成功
+            {键名: 字典}，顺序与传入的键一致；不存在或读取失败的键为 None
         """
-        try:
-            full_key = self._get_full_key(key)
-            json_str = self._serialize_dict(data)
-            
-            result = self.redis_client.set(full_key, json_str, ex=ex)
-            
-            if result:
-                logger.info(f"成功存储字典到键 '{key}'，数据大小: {len(json_str)} 字符")
-                return True
-            else:
-                logger.warning(f"存储字典到键 '{key}' 失败")
-                return False
-                
-        except Exception as e:
-            logger.error(f"存储字典失败: {e}")
-            return False
+        keys = list(dict.fromkeys(keys))
+        results: Dict[str, Optional[Dict[str, Any]]] = {key: None for key in keys}
+        for reply in self._run_parallel(self._group(keys), lambda node, sub: node.get_many(sub, chunk_size)).values():
+            results.update(reply)
+        return results
     
-    def get_dict(self, key: str) -> Optional[Dict[str, Any]]:
+    def delete_many(self, keys: Iterable[str], chunk_size: Optional[int] = None) -> Dict[str, bool]:
         """
-        从 Redis 读取字典（从字符串类型）
+        批量删除字典：按节点分组，各节点并行执行（见 RedisStringDict.delete_many）
         
-        Args:
-            key: 存储键名
-            
         Returns:
-            读取到的字典，如果不存在则返回 None
+            {键名: 是否删除成功}
         """
-        try:
-            full_key = self._get_full_key(key)
-            json_str = self.redis_client.get(full_key)
-            
-            if json_str is None:
-                logger.info(f"键 '{key}' 不存在")
-                return None
-            
-            data = self._deserialize_dict(json_str)
-            logger.info(f"成功读取键 '{key}' 的字典数据")
-            return data
-            
-        except Exception as e:
-            logger.error(f"读取字典失败: {e}")
-            return None
+        keys = list(dict.fromkeys(keys))
+        results = {key: False for key in keys}
+        for reply in self._run_parallel(self._group(keys), lambda node, sub: node.delete_many(sub, chunk_size)).values():
+            results.update(reply)
+        return results
     
-    def update_dict(self, key: str, updates: Dict[str, Any]) -> bool:
+    def exists_many(self, keys: Iterable[str], chunk_size: Optional[int] = None) -> Dict[str, bool]:
+        """
+        批量检查字典是否存在：按节点分组，各节点并行执行（见 RedisStringDict.exists_many）
+        
+        Returns:
+            {键名: 是否存在}
+        """
+        keys = list(dict.fromkeys(keys))
+        results = {key: False for key in keys}
+        for reply in self._run_parallel(self._group(keys), lambda node, sub: node.exists_many(sub, chunk_size)).values():
+            results.update(reply)
+        return results
+    
+    def clear_all_dicts(self, batch_size: Optional[int] = None, count: Optional[int] = None,
+                        progress_cb: Optional[Callable[[int], None]] = None) -> int:
         """
-        更新字典中的部分数据
+        清除所有节点上的字典数据，各节点并行执行（见 RedisStringDict.clear_all_dicts）
         
         Args:
-            key: 存储键名
-            updates: 要更新的键值对
-            
+            batch_size: 每批删除的键数量，None 使用节点的默认值
+            count: 每次 SCAN 的 COUNT 提示值，None 使用节点的默认值
+            progress_cb: 每批删除后回调，参数为所有节点累计删除的键数量（在线程池中调用）
+        
         Returns:
-            是否更新成功
+            删除的键数量
         """
-        try:
-            # 先读取现有数据
-            existing_data = self.get_dict(key)
-            if existing_data is None:
-                logger.info(f"键 '{key}' 不存在，创建新字典")
-                existing_data = {}
-            
-            # 更新数据
-            existing_data.update(updates)
-            
-            # 保存更新后的数据
-            result = self.set_dict(key, existing_data)
-            if result:
-                logger.info(f"成功更新键 '{key}' 的字典数据")
-            return result
-            
-        except Exception as e:
-            logger.error(f"更新字典失败: {e}")
-            return False
+        lock = threading.Lock()
+        done: Dict[str, int] = {}
+        
+        def report(name: str, deleted: int) -> None:
+            with lock:
+                done[name] = deleted
+                progress_cb(sum(done.values()))
+        
+        replies = self._run_parallel({name: name for name in self.nodes}, lambda node, name: node.clear_all_dicts(
+            batch_size, count, functools.partial(report, name) if progress_cb else None))
+        return sum(replies.values())
     
-    def delete_dict(self, key: str) -> bool:
+    def add_node(self, node: Union[str, Dict[str, Any], RedisStringDict], name: Optional[str] = None,
+                 migrate: bool = True) -> int:
         """
-        删除字典
+        添加节点：约 1/N 的键改为归属新节点，migrate=True 时把这些键从原节点迁移过去
+        
+        迁移先复制再切换路由，最后删除原节点上的旧键；复制期间其他客户端对这些键的写入可能丢失，建议在低峰期执行。
+        复制失败时抛出异常，路由保持不变。其他进程中的分片实例需要以相同的节点名、migrate=False 添加同一节点
         
         Args:
-            key: 存储键名
-            
+            node: 'host:port[/db]' 字符串、连接参数字典或已创建的 RedisStringDict
+            name: 节点名，None 时按连接参数生成（传入 RedisStringDict 时必填）
+            migrate: 是否迁移改变归属的键
+        
         Returns:
-            是否删除成功
+            迁移的键数量
         """
+        owned = not isinstance(node, RedisStringDict)
+        if owned:
+            generated, node = self._create_node(node)
+            name = name or generated
+        elif not name:
+            raise ValueError("传入 RedisStringDict 实例时需要指定节点名")
+        if name in self.nodes:
+            if owned:
+                node.close()
+            raise ValueError(f"节点已存在: {name}")
+        ring = self._ring.copy()
+        ring.add(name)
+        nodes = {**self.nodes, name: node}
         try:
-            full_key = self._get_full_key(key)
-            result = self.redis_client.delete(full_key)
-            
-            if result > 0:
-                logger.info(f"成功删除键 '{key}' 的字典数据")
-                return True
-            else:
-                logger.info(f"键 '{key}' 不存在，无需删除")
-                return False
-                
-        except Exception as e:
-            logger.error(f"删除字典失败: {e}")
-            return False
+            copied = {src: self._copy_moved(src, ring, nodes) for src in self.nodes} if migrate else {}
+        except Exception:
+            if owned:
+                node.close()
+            raise
+        self.nodes = nodes
+        self._ring = ring
+        if owned:
+            self._owned.add(name)
+        moved = self._drop_moved(copied)
+        logger.info(f"添加节点 '{name}'，迁移 {moved} 个键")
+        return moved
     
-    def exists_dict(self, key: str) -> bool:
+    def remove_node(self, name: str, migrate: bool = True) -> int:
         """
-        检查字典是否存在
+        移除节点：migrate=True 时把该节点上的键迁移到新的归属节点（过程与 add_node 相同）
         
         Args:
-            key: 存储键名
-            
+            name: 节点名
+            migrate: 是否迁移该节点上的键
+        
         Returns:
-            字典是否存在
+            迁移的键数量
         """
-        try:
-            full_key = self._get_full_key(key)
-            result = self.redis_client.exists(full_key)
-            return bool(result)
-            
-        except Exception as e:
-            logger.error(f"检查字典存在性失败: {e}")
-            return False
+        if name not in self.nodes:
+            raise ValueError(f"节点不存在: {name}")
+        if len(self.nodes) == 1:
+            raise ValueError("不能移除最后一个节点")
+        ring = self._ring.copy()
+        ring.remove(name)
+        copied = {name: self._copy_moved(name, ring, self.nodes)} if migrate else {}
+        self._ring = ring
+        moved = self._drop_moved(copied)
+        node = self.nodes[name]
+        self.nodes = {k: v for k, v in self.nodes.items() if k != name}
+        if name in self._owned:
+            self._owned.discard(name)
+            node.close()
+        logger.info(f"移除节点 '{name}'，迁移 {moved} 个键")
+        return moved
     
-    def get_dict_keys(self, pattern: str = "*") -> list:
+    def _copy_moved(self, src_name: str, ring: HashRing, nodes: Dict[str, RedisStringDict]) -> List[str]:
         """
-        获取所有匹配模式的字典键名
+        把节点上在新哈希环中归属其他节点的键复制过去
         
         Args:
-            pattern: 匹配模式，默认为所有键
-            
+            src_name: 源节点名
+            ring: 新的哈希环
+            nodes: 包含新节点的 {节点名: RedisStringDict}
+        
         Returns:
-            匹配的键名列表（去除前缀）
+            已复制的键名（不含前缀）
         """
-        try:
-            full_pattern = f"{self.prefix}{pattern}"
-            keys = self.redis_client.keys(full_pattern)
-            
-            # 去除前缀
-            result = [key[len(self.prefix):] for key in keys]
-            logger.info(f"找到 {len(result)} 个匹配的字典键")
-            return result
-            
-        except Exception as e:
-            logger.error(f"获取字典键列表失败: {e}")
-            return []
+        src = nodes[src_name]
+        copied: List[str] = []
+        pending: Dict[str, Dict[str, None]] = {}
+        for key in src.iter_dict_keys():
+            owner = ring.get_node(key)
+            if owner == src_name:
+                continue
+            pending.setdefault(owner, {})[key] = None
+            if len(pending[owner]) >= src.chunk_size:
+                copied.extend(self._copy_batch(src, nodes[owner], list(pending.pop(owner))))
+        for owner, keys in pending.items():
+            copied.extend(self._copy_batch(src, nodes[owner], list(keys)))
+        return list(dict.fromkeys(copied))
     
-    def get_dict_size(self, key: str) -> int:
+    @staticmethod
+    def _copy_batch(src: RedisStringDict, dst: RedisStringDict, keys: List[str]) -> List[str]:
         """
-        获取字典存储的字符串大小（字节数）
+        用 DUMP / RESTORE 复制一批键（两次往返，保留剩余过期时间，覆盖目标节点上的同名键）
         
         Args:
-            key: 存储键名
-            
+            src: 源节点
+            dst: 目标节点
+            keys: 键名（不含前缀）
+        
         Returns:
-            字符串大小，如果不存在则返回 0
+            已复制的键名；复制前已过期或被删除的键不出现
         """
-        try:
-            full_key = self._get_full_key(key)
-            size = self.redis_client.strlen(full_key)
-            return size
-            
-        except Exception as e:
-            logger.error(f"获取字典大小失败: {e}")
-            return 0
+        pipe = src.redis_client.pipeline(transaction=False)
+        for key in keys:
+            full_key = src._get_full_key(key)
+            pipe.dump(full_key)
+            pipe.pttl(full_key)
+        replies = pipe.execute()
+        copied = []
+        pipe = dst.redis_client.pipeline(transaction=False)
+        for key, dumped, ttl in zip(keys, replies[0::2], replies[1::2]):
+            if dumped is None:
+                continue
+            pipe.restore(dst._get_full_key(key), ttl if ttl > 0 else 0, dumped, replace=True)
+            copied.append(key)
+        if copied:
+            pipe.execute()
+            dst._near_invalidate(dst._get_full_key(key) for key in copied)
+        return copied
     
-    def clear_all_dicts(self) -> int:
+    def _drop_moved(self, copied: Dict[str, List[str]]) -> int:
         """
-        清除所有字典数据
+        路由切换后删除源节点上已复制的键
+        
+        Args:
+            copied: {源节点名: 已复制的键名}
         
         Returns:
-            删除的键数量
+            迁移的键数量
         """
-        try:
-            pattern = f"{self.prefix}*"
-            keys = self.redis_client.keys(pattern)
-            
-            if not keys:
-                logger.info("没有找到要删除的字典数据")
-                return 0
+        moved = 0
+        for src_name, keys in copied.items():
+            src = self.nodes[src_name]
+            for batch in src._chunks(keys, src.chunk_size):
+                full_keys = [src._get_full_key(key) for key in batch]
+                src.redis_client.delete(*full_keys)
+                src._near_invalidate(full_keys)
+            moved += len(keys)
+        return moved
+
+
+# 缓存装饰器：等待其他调用方重建缓存时的轮询间隔（秒）
+_CACHE_POLL_INTERVAL = 0.05
+
+
+def _cache_key(namespace: str, args: tuple, kwargs: Dict[str, Any]) -> str:
+    """
+    按函数参数生成缓存键（参数经 JSON 序列化后取摘要，无法序列化的参数使用 repr）
+    
+    Args:
+        namespace: 键名前缀
+        args: 位置参数
+        kwargs: 关键字参数
+    
+    Returns:
+        缓存键名
+    """
+    raw = json.dumps([args, kwargs], sort_keys=True, default=repr, ensure_ascii=False)
+    return f"{namespace}:{hashlib.md5(raw.encode('utf-8')).hexdigest()}"
+
+
+def _cache_fresh(entry: Dict[str, Any], now: float, beta: float) -> bool:
+    """
+    判断缓存条目是否可以直接使用
+    
+    概率提前刷新（XFetch）：越接近逻辑过期时间、重建越耗时，越可能提前判定为需要刷新，
+    热点键由某个调用方在过期前重建，不会在过期瞬间集中重算
+    
+    Args:
+        entry: 缓存条目 {'v': 值, 'exp': 逻辑过期时间戳, 'delta': 上次重建耗时}
+        now: 当前时间戳
+        beta: 提前刷新的系数，0 表示不提前刷新
+    
+    Returns:
+        是否无需刷新
+    """
+    exp = entry.get('exp')
+    if not isinstance(exp, (int, float)):
+        return False
+    delta = entry.get('delta') or 0
+    if beta > 0 and delta > 0:
+        return now - delta * beta * math.log(1.0 - random.random()) < exp
+    return now < exp
+
+
+def _cache_entry(value: Any, ttl: float, jitter: float, stale_ttl: Optional[float], delta: float) -> tuple:
+    """
+    生成缓存条目及其在 Redis 中的过期时间
+    
+    Args:
+        value: 函数返回值
+        ttl: 逻辑过期秒数
+        jitter: 过期时间的随机浮动比例（同时写入的键不会同时过期）
+        stale_ttl: 逻辑过期后继续保留旧值的秒数，None 与 ttl 相同
+        delta: 本次重建耗时（秒）
+    
+    Returns:
+        (条目, Redis 过期秒数)
+    """
+    ttl = ttl * (1 + random.uniform(-jitter, jitter)) if jitter else ttl
+    entry = {'v': value, 'exp': time.time() + ttl, 'delta': round(delta, 6)}
+    return entry, max(1, math.ceil(ttl + (ttl if stale_ttl is None else stale_ttl)))
+
+
+def get_or_compute(store: Union[RedisStringDict, ShardedRedisStringDict], key: str, compute: Callable[[], Any],
+                   ttl: float = 300, jitter: float = 0.1, stale_ttl: Optional[float] = None, beta: float = 1.0,
+                   lock_timeout: float = 10.0, wait_timeout: float = 2.0) -> Any:
+    """
+    读取缓存，不存在或需要刷新时调用 compute 重建（cache-aside，带击穿保护）
+    
+    - 缓存条目在逻辑过期后仍保留 stale_ttl 秒；需要重建时用短期锁（SET NX PX）保证只有一个调用方执行 compute
+    - 未获得锁的调用方有旧值时直接返回旧值，没有旧值时最多等待 wait_timeout 秒，超时后自行计算
+    - 临近过期时按 XFetch 概率提前刷新，重建耗时越长越早刷新
+    - 获取锁时 Redis 出错则直接调用 compute，不等待
+    
+    Args:
+        store: RedisStringDict 或 ShardedRedisStringDict
+        key: 缓存键名
+        compute: 无参数的重建函数，返回值需能被 store 的编解码器序列化
+        ttl: 逻辑过期秒数
+        jitter: 过期时间的随机浮动比例，默认 ±10%
+        stale_ttl: 逻辑过期后继续保留旧值的秒数，None 与 ttl 相同
+        beta: 提前刷新的系数，越大越早刷新，0 表示不提前刷新
+        lock_timeout: 重建锁自动过期的秒数
+        wait_timeout: 没有旧值时等待其他调用方重建的最长秒数
+    
+    Returns:
+        缓存的值或 compute 的返回值；近端缓存命中时为缓存中的对象，不要修改
+    """
+    entry = store.get_dict(key)
+    if entry is not None and _cache_fresh(entry, time.time(), beta):
+        return entry.get('v')
+    try:
+        token = store._acquire_lock(key, lock_timeout)
+    except Exception as e:
+        logger.warning(f"获取缓存重建锁失败，直接计算: {e}")
+        token = ''
+    if token is None:
+        if entry is not None:
+            return entry.get('v')
+        deadline = time.monotonic() + wait_timeout
+        while time.monotonic() < deadline:
+            time.sleep(_CACHE_POLL_INTERVAL)
+            entry = store.get_dict(key)
+            if entry is not None:
+                return entry.get('v')
+        logger.warning(f"等待缓存 '{key}' 重建超时，自行计算")
+    try:
+        start = time.perf_counter()
+        value = compute()
+        entry, ex = _cache_entry(value, ttl, jitter, stale_ttl, time.perf_counter() - start)
+        store.set_dict(key, entry, ex=ex)
+        return value
+    finally:
+        if token:
+            try:
+                store._release_lock(key, token)
+            except Exception as e:
+                logger.warning(f"释放缓存重建锁失败: {e}")
+
+
+async def async_get_or_compute(store: AsyncRedisStringDict, key: str, compute: Callable[[], Awaitable[Any]],
+                               ttl: float = 300, jitter: float = 0.1, stale_ttl: Optional[float] = None,
+                               beta: float = 1.0, lock_timeout: float = 10.0, wait_timeout: float = 2.0) -> Any:
+    """
+    get_or_compute 的异步版本（compute 为无参数、返回协程的函数，其余参数相同）
+    """
+    entry = await store.get_dict(key)
+    if entry is not None and _cache_fresh(entry, time.time(), beta):
+        return entry.get('v')
+    try:
+        token = await store._acquire_lock(key, lock_timeout)
+    except Exception as e:
+        logger.warning(f"获取缓存重建锁失败，直接计算: {e}")
+        token = ''
+    if token is None:
+        if entry is not None:
+            return entry.get('v')
+        deadline = time.monotonic() + wait_timeout
+        while time.monotonic() < deadline:
+            await asyncio.sleep(_CACHE_POLL_INTERVAL)
+            entry = await store.get_dict(key)
+            if entry is not None:
+                return entry.get('v')
+        logger.warning(f"等待缓存 '{key}' 重建超时，自行计算")
+    try:
+        start = time.perf_counter()
+        value = await compute()
+        entry, ex = _cache_entry(value, ttl, jitter, stale_ttl, time.perf_counter() - start)
+        await store.set_dict(key, entry, ex=ex)
+        return value
+    finally:
+        if token:
+            try:
+                await store._release_lock(key, token)
+            except Exception as e:
+                logger.warning(f"释放缓存重建锁失败: {e}")
+
+
+def cached(store: Union[RedisStringDict, ShardedRedisStringDict, AsyncRedisStringDict], ttl: float = 300,
+           jitter: float = 0.1, stale_ttl: Optional[float] = None, beta: float = 1.0, lock_timeout: float = 10.0,
+           wait_timeout: float = 2.0, key: Optional[Callable[..., str]] = None,
+           namespace: Optional[str] = None) -> Callable:
+    """
+    缓存装饰器：按参数缓存函数返回值（见 get_or_compute），同时支持普通函数与协程函数
+    
+    被装饰的函数增加 invalidate(*args, **kwargs) 删除对应的缓存，cache_key(*args, **kwargs) 返回缓存键名
+    
+    Args:
+        store: 普通函数使用 RedisStringDict 或 ShardedRedisStringDict，协程函数使用 AsyncRedisStringDict
+        ttl / jitter / stale_ttl / beta / lock_timeout / wait_timeout: 见 get_or_compute
+        key: 按函数参数返回缓存键名的函数，None 时由 namespace 与参数摘要生成（方法的 self 按 repr 参与摘要）
+        namespace: 默认缓存键名的前缀，None 为 'cache:模块名.函数名'
+    
+    Returns:
+        装饰器
+    """
+    options = dict(ttl=ttl, jitter=jitter, stale_ttl=stale_ttl, beta=beta, lock_timeout=lock_timeout,
+                   wait_timeout=wait_timeout)
+    
+    def decorate(fn: Callable) -> Callable:
+        is_async = inspect.iscoroutinefunction(fn)
+        if is_async != isinstance(store, AsyncRedisStringDict):
+            raise TypeError("协程函数需要 AsyncRedisStringDict，普通函数需要 RedisStringDict 或 ShardedRedisStringDict")
+        prefix = namespace or f"cache:{fn.__module__}.{fn.__qualname__}"
+        
+        def cache_key(*args: Any, **kwargs: Any) -> str:
+            return key(*args, **kwargs) if key is not None else _cache_key(prefix, args, kwargs)
+        
+        if is_async:
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                return await async_get_or_compute(store, cache_key(*args, **kwargs),
+                                                  lambda: fn(*args, **kwargs), **options)
             
-            result = self.redis_client.delete(*keys)
-            logger.info(f"成功删除 {result} 个字典键")
-            return result
+            async def async_invalidate(*args: Any, **kwargs: Any) -> bool:
+                return await store.delete_dict(cache_key(*args, **kwargs))
             
-        except Exception as e:
-            logger.error(f"清除所有字典失败: {e}")
-            return 0
+            async_wrapper.invalidate = async_invalidate
+            async_wrapper.cache_key = cache_key
+            return async_wrapper
+        
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            return get_or_compute(store, cache_key(*args, **kwargs), lambda: fn(*args, **kwargs), **options)
+        
+        def invalidate(*args: Any, **kwargs: Any) -> bool:
+            return store.delete_dict(cache_key(*args, **kwargs))
+        
+        wrapper.invalidate = invalidate
+        wrapper.cache_key = cache_key
+        return wrapper
+    return decorate
+
+
+def _benchmark_sample(records: int = 500) -> Dict[str, Any]:
+    """
+    生成基准测试用的嵌套字典（中英文混合字符串、数值、列表）
+    
+    Args:
+        records: 记录数量
+    
+    Returns:
+        测试字典
+    """
+    return {
+        "name": "基准测试",
+        "version": 3,
+        "records": [
+            {
+                "id": i,
+                "user": f"用户{i:05d}",
+                "email": f"user{i}@example.com",
+                "score": round(i * 1.37, 2),
+                "active": i % 3 != 0,
+                "tags": ["redis", "python", f"分组{i % 10}"],
+                "profile": {"city": ["北京", "上海", "深圳"][i % 3], "level": i % 7, "note": None}
+            }
+            for i in range(records)
+        ]
+    }
+
+
+def benchmark_codecs(data: Optional[Dict[str, Any]] = None, rounds: int = 50,
+                     compressions: Iterable[Optional[str]] = (None, 'zlib', 'lz4'),
+                     compress_threshold: int = 1024) -> List[Dict[str, Any]]:
+    """
+    比较各编解码器与压缩算法组合的编码、解码耗时和存储大小（本地计算，不需要 Redis 服务器）
+    
+    Args:
+        data: 测试字典，None 使用内置样例
+        rounds: 每个组合重复编码、解码的次数
+        compressions: 参与比较的压缩算法，未安装的自动跳过
+        compress_threshold: 压缩阈值（字节）
+    
+    Returns:
+        每个组合一行：{'codec', 'compression', 'size', 'encode_ms', 'decode_ms'}，耗时为单次平均毫秒数
+    """
+    data = _benchmark_sample() if data is None else data
+    rows = []
+    for codec in CODECS:
+        for compression in compressions:
+            if compression is not None and compression not in COMPRESSORS:
+                continue
+            coder = _RedisDictBase()
+            coder._configure('', 1, 1, 'string', codec, compression, compress_threshold)
+            t0 = time.perf_counter()
+            for _ in range(rounds):
+                payload = coder._serialize_dict(data)
+            t1 = time.perf_counter()
+            for _ in range(rounds):
+                coder._deserialize_dict(payload)
+            t2 = time.perf_counter()
+            size = len(payload.encode('utf-8') if isinstance(payload, str) else payload)
+            rows.append({
+                'codec': codec,
+                'compression': compression or '-',
+                'size': size,
+                'encode_ms': round((t1 - t0) * 1000 / rounds, 3),
+                'decode_ms': round((t2 - t1) * 1000 / rounds, 3)
+            })
+    return rows
+
+
+def print_codec_benchmark(rounds: int = 50) -> None:
+    """
+    打印编解码器基准测试结果（python redis_fc.py --benchmark）
+    
+    Args:
+        rounds: 每个组合重复的次数
+    """
+    rows = benchmark_codecs(rounds=rounds)
+    base = next((r['size'] for r in rows if r['codec'] == 'json' and r['compression'] == '-'), 0)
+    print(f"{'codec':<12}{'compress':<10}{'bytes':>10}{'vs json':>10}{'encode ms':>12}{'decode ms':>12}")
+    for r in rows:
+        ratio = f"{r['size'] / base:.0%}" if base else '-'
+        print(f"{r['codec']:<12}{r['compression']:<10}{r['size']:>10}{ratio:>10}{r['encode_ms']:>12}{r['decode_ms']:>12}")
+
+
+async def async_demo():
+    """
+    测试函数 - 演示 AsyncRedisStringDict 的使用（共享连接池 + 并发调用）
+    """
+    pool = AsyncRedisStringDict.create_pool(max_connections=10)
+    try:
+        async with AsyncRedisStringDict(pool=pool) as redis_dict:
+            batch = {f"user:{3000 + i}": {"id": 3000 + i, "name": f"用户{i}"} for i in range(5)}
+            set_result, _ = await asyncio.gather(
+                redis_dict.set_many(batch),
+                redis_dict.set_dict("counter:async", {"views": 0})
+            )
+            print(f"异步批量存储结果: {set_result}")
+            await asyncio.gather(*(redis_dict.incr_field("counter:async", "views") for _ in range(10)))
+            print(f"并发自增后数据: {await redis_dict.get_dict('counter:async')}")
+            print(f"异步批量读取结果: {await redis_dict.get_many(batch)}")
+            await redis_dict.delete_many(list(batch) + ["counter:async"])
+    finally:
+        await pool.disconnect()
 
 
 def main():
@@ -347,7 +3821,7 @@ def main():
         print(f"字典存储大小: {size} 字节")
         
         print("\n7. 获取所有字典键:")
-        keys = redis_dict.get_dict_keys()
+        keys = list(redis_dict.get_dict_keys())
         print(f"所有字典键: {keys}")
         
         print("\n8. 删除字典:")
@@ -358,6 +3832,74 @@ def main():
         final_data = redis_dict.get_dict("user:1001")
         print(f"删除后读取: {final_data}")
         
+        print("\n10. 批量存储与读取:")
+        batch = {f"user:{2000 + i}": {"id": 2000 + i, "name": f"用户{i}"} for i in range(5)}
+        set_result = redis_dict.set_many(batch, ttls={"user:2000": 60})
+        print(f"批量存储结果: {set_result}")
+        print(f"批量读取结果: {redis_dict.get_many(list(batch) + ['user:missing'])}")
+        print(f"批量存在性: {redis_dict.exists_many(['user:2001', 'user:missing'])}")
+        print(f"批量删除结果: {redis_dict.delete_many(batch)}")
+        
+        print("\n11. 原子字段自增:")
+        redis_dict.set_dict("counter:page", {"views": 0, "title": "首页"})
+        for _ in range(3):
+            redis_dict.incr_field("counter:page", "views")
+        print(f"自增后数据: {redis_dict.get_dict('counter:page')}")
+        redis_dict.delete_dict("counter:page")
+        
+        print("\n12. 异步客户端:")
+        asyncio.run(async_demo())
+        
+        print("\n13. 近端缓存:")
+        cached_dict = RedisStringDict(near_cache=True, near_cache_ttl=30)
+        cached_dict.set_dict("config:app", {"theme": "dark", "page_size": 20})
+        for _ in range(5):
+            cached_dict.get_dict("config:app")
+        # 另一个实例的写入通过失效消息清除本实例的缓存（pubsub 方式下写入方也需开启近端缓存）
+        other_dict = RedisStringDict(near_cache=True)
+        other_dict.update_dict("config:app", {"page_size": 50})
+        time.sleep(0.1)
+        print(f"其他实例更新后读取: {cached_dict.get_dict('config:app')}")
+        print(f"近端缓存统计: {cached_dict.near_cache_stats()}")
+        cached_dict.delete_dict("config:app")
+        cached_dict.close()
+        other_dict.close()
+        
+        print("\n14. 大对象与部分读取:")
+        report = {"title": "日志汇总", "owner": "运维", "records": [{"id": i, "msg": f"事件{i}"} for i in range(2000)]}
+        redis_dict.set_large("report:big", report)
+        print(f"只读取部分字段: {redis_dict.get_fields('report:big', ['title', 'owner', 'missing'])}")
+        print(f"流式遍历字段: {[field for field, _value in redis_dict.iter_fields('report:big')]}")
+        redis_dict.set_large("report:chunked", report, layout='chunks', chunk_size_bytes=16 * 1024)
+        print(f"分块存储后完整读取: {len(redis_dict.get_dict('report:chunked')['records'])} 条记录")
+        redis_dict.delete_many(["report:big", "report:chunked"])
+        
+        print("\n15. 客户端分片:")
+        sharded = ShardedRedisStringDict(["127.0.0.1:6379/1", "127.0.0.1:6379/2"], prefix="shard:")
+        items = {f"item:{i}": {"id": i} for i in range(100)}
+        sharded.set_many(items)
+        counts = {name: sum(1 for k in items if sharded.node_for(k) == name) for name in sharded.nodes}
+        print(f"各节点键数量: {counts}")
+        moved = sharded.add_node("127.0.0.1:6379/3")
+        print(f"添加节点后迁移 {moved} 个键，全部可读: {all(v is not None for v in sharded.get_many(items).values())}")
+        sharded.clear_all_dicts()
+        sharded.close()
+        
+        print("\n16. 缓存装饰器:")
+        calls = []
+        
+        @cached(redis_dict, ttl=30, namespace="demo:square")
+        def slow_square(x: int) -> Dict[str, int]:
+            calls.append(x)
+            time.sleep(0.1)
+            return {"x": x, "square": x * x}
+        
+        print(f"首次调用: {slow_square(12)}，再次调用: {slow_square(12)}，实际计算 {len(calls)} 次")
+        slow_square.invalidate(12)
+        
+        print("\n17. 操作指标（Prometheus 文本格式，节选）:")
+        print("\n".join(line for line in redis_dict.export_metrics().splitlines() if "_operations_total{" in line))
+        
     except Exception as e:
         print(f"测试过程中发生错误: {e}")
     
@@ -367,4 +3909,7 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if "--benchmark" in sys.argv:
+        print_codec_benchmark()
+    else:
+        main()
\ No newline at end of file
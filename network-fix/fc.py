@@ -1,12 +1,39 @@
 import sys
 import os
+import hashlib
+import threading
 import webbrowser
-import urllib.request
 import urllib.parse
 
 from PyQt5.QtWidgets import QApplication, QLabel, QMainWindow, QProgressBar, QVBoxLayout, QWidget
-from PyQt5.QtCore import Qt, QSize, QTimer
-from PyQt5.QtGui import QPixmap, QPainter, QLinearGradient, QColor, QFont
+from PyQt5.QtCore import Qt, QSize, QTimer, QObject, pyqtSignal
+from PyQt5.QtGui import QPixmap, QPainter, QLinearGradient, QColor, QFont, QImage
+
+from asset_cache import default_cache, is_remote
+
+
+def _clean_src(s: str) -> str:
+    return (s or "").strip().strip("`")
+
+
+def _load_pixmap_now(src: str):
+    """只读本地：本地路径 / file:// / 网络图片的磁盘缓存，不访问网络。"""
+    if is_remote(src):
+        path = default_cache().cached_path(src)
+    elif src.startswith("file://"):
+        path = urllib.parse.urlparse(src).path
+    else:
+        path = src
+    if path and os.path.exists(path):
+        p = QPixmap(path)
+        if not p.isNull():
+            return p
+    return None
+
+
+class _AssetNotifier(QObject):
+    # 后台线程发射，主线程槽函数接收（跨线程自动排队）
+    loaded = pyqtSignal(str, str)
 
 
 class ImageCoverWidget(QWidget):
@@ -62,11 +89,20 @@ class FullScreenImageWindow(QMainWindow):
         self.setCentralWidget(container)
         self.setCursor(Qt.PointingHandCursor)
 
+        # 先用磁盘缓存或占位图立即显示，网络图片在后台条件刷新后再替换
+        self._src = _clean_src(image_path_or_url or "")
+        self._is_placeholder = False
         pixmap = self.load_image(image_path_or_url)
         self.original_pixmap = pixmap
         self.adjust_initial_size_and_center(pixmap)
         self.image.setPixmap(self.original_pixmap)
 
+        self._notifier = _AssetNotifier(self)
+        self._notifier.loaded.connect(self._on_image_loaded)
+        if is_remote(self._src):
+            notifier = self._notifier
+            default_cache().fetch_async(self._src, lambda url, path: notifier.loaded.emit(url, path or ""))
+
         # 倒计时（3秒）在窗口显示时启动
         self._countdown_ms = 3000
         self._interval_ms = 50
@@ -78,60 +114,29 @@ class FullScreenImageWindow(QMainWindow):
         screen = QApplication.primaryScreen()
         size = screen.size() if screen else QSize(1920, 1080)
 
-
-        def _clean_src(s: str) -> str:
-            return (s or "").strip().strip("`")
-
-        def _fetch_image_bytes(url: str) -> bytes | None:
-            try:
-                req = urllib.request.Request(url, headers={
-                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36",
-                    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8",
-                })
-                with urllib.request.urlopen(req, timeout=8) as resp:
-                    ct = resp.headers.get("Content-Type", "").lower()
-                    data = resp.read()
-                    if "image" in ct:
-                        return data
-                    # 尝试从 HTML 中提取 og:image
-                    try:
-                        html = data.decode("utf-8", errors="ignore")
-                        import re
-                        m = re.search(r"<meta[^>]+property=[\"']og:image[\"'][^>]+content=[\"']([^\"']+)[\"']", html, re.I)
-                        if not m:
-                            m = re.search(r"<meta[^>]+content=[\"']([^\"']+)[\"'][^>]+property=[\"']og:image[\"']", html, re.I)
-                        if m:
-                            img_url = urllib.parse.urljoin(url, m.group(1))
-                            return _fetch_image_bytes(img_url)
-                    except Exception:
-                        pass
-                    return None
-            except Exception:
-                return None
-
-        pixmap = None
         src = _clean_src(image_path_or_url or "")
-        if src:
-            if src.startswith("http://") or src.startswith("https://"):
-                data = _fetch_image_bytes(src)
-                if data:
-                    p = QPixmap()
-                    if p.loadFromData(data):
-                        pixmap = p
-            else:
-                # 支持 file:// 协议与本地路径
-                if src.startswith("file://"):
-                    local_path = urllib.parse.urlparse(src).path
-                    if os.path.exists(local_path):
-                        pixmap = QPixmap(local_path)
-                elif os.path.exists(src):
-                    pixmap = QPixmap(src)
-
-        if not pixmap or pixmap.isNull():
+        pixmap = _load_pixmap_now(src) if src else None
+
+        self._is_placeholder = not pixmap or pixmap.isNull()
+        if self._is_placeholder:
             pixmap = self._create_placeholder_pixmap(size)
 
         return pixmap
 
+    def _on_image_loaded(self, url: str, path: str):
+        if url != self._src or not path:
+            return
+        p = QPixmap(path)
+        if p.isNull():
+            return
+        was_placeholder = self._is_placeholder
+        self._is_placeholder = False
+        self.original_pixmap = p
+        # 已显示的窗口不再改尺寸，避免跳动；占位图阶段按真实图片比例重新居中
+        if was_placeholder and not self.isVisible():
+            self.adjust_initial_size_and_center(p)
+        self.image.setPixmap(p)
+
     def _create_placeholder_pixmap(self, size: QSize) -> QPixmap:
         pixmap = QPixmap(size)
         pixmap.fill(Qt.black)
@@ -214,38 +219,60 @@ def show_fullscreen_image_and_open_url(image_path_or_url: str, target_url: str)
 
 
 def _prepare_icon_path(icon_path_or_url: str | None, resize_to: int | None = None) -> str | None:
-    if not icon_path_or_url:
+    """准备 Toast 图标的本地 PNG 路径；网络图标走磁盘缓存，命中时在后台刷新供下次使用。"""
+    src = _clean_src(icon_path_or_url or "")
+    if not src:
         return None
     try:
-        img: Image.Image | None = None
-        if icon_path_or_url.startswith("http://") or icon_path_or_url.startswith("https://"):
-            data = urllib.request.urlopen(icon_path_or_url, timeout=6).read()
-            bio = io.BytesIO(data)
-            img = Image.open(bio)
+        cache = default_cache()
+        if is_remote(src):
+            path = cache.cached_path(src)
+            if path:
+                cache.fetch_async(src)
+            else:
+                path = cache.fetch(src, timeout=6)
+            if not path:
+                return None
         else:
-            if not os.path.exists(icon_path_or_url):
+            if not os.path.exists(src):
                 return None
-            img = Image.open(icon_path_or_url)
-
-        if img is None:
+            path = src
+
+        # 转换结果按内容哈希 + 尺寸命名，内容不变时直接复用
+        with open(path, "rb") as f:
+            digest = hashlib.sha1(f.read()).hexdigest()[:16]
+        out_dir = os.path.join(cache.root, "icons")
+        out = os.path.join(out_dir, f"{digest}_{int(resize_to or 0)}.png")
+        if os.path.exists(out):
+            return out
+
+        # 本项目未打包 Pillow，用 QImage 完成格式转换与缩放（可在非 GUI 线程使用）
+        img = QImage(path)
+        if img.isNull():
             return None
-
-        if img.mode not in ("RGB", "RGBA"):
-            img = img.convert("RGBA")
-
         if resize_to and resize_to > 0:
-            img = img.resize((resize_to, resize_to), Image.LANCZOS)
+            img = img.scaled(resize_to, resize_to, Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
 
-        tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".png")
-        img.save(tmp, format="PNG")
-        tmp.flush()
-        tmp.close()
-        return tmp.name
+        os.makedirs(out_dir, exist_ok=True)
+        tmp = out + ".tmp"
+        if not img.save(tmp, "PNG"):
+            return None
+        os.replace(tmp, out)
+        return out
     except Exception:
         return None
 
 
 def show_windows_toast(title: str, message: str, duration: int = 5, icon: str | None = None, url: str | None = None, button_label: str | None = None, icon_size: int | None = None) -> None:
+    """后台线程准备图标并发送通知，调用方（通常是 GUI 线程）不会被网络下载阻塞。"""
+    threading.Thread(
+        target=_send_toast,
+        args=(title, message, duration, icon, url, button_label, icon_size),
+        name="toast", daemon=True,
+    ).start()
+
+
+def _send_toast(title: str, message: str, duration: int, icon: str | None, url: str | None, button_label: str | None, icon_size: int | None) -> None:
     icon_path = _prepare_icon_path(icon, resize_to=icon_size)
     try:
         from winotify import Notification, audio
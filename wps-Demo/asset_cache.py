@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+网络图片资源的磁盘缓存（启动图、Toast 图标共用，不依赖 Qt）
+
+- 条件请求（ETag / Last-Modified），未变化时服务器返回 304，不重复下载
+- 支持 HTML 页面的 og:image 跳转，页面与最终图片一并缓存
+- 缓存目录总大小有上限，超出时按最近使用时间淘汰
+- fetch_async 在后台线程下载，调用方先用缓存或占位图，新图到达后再回调替换
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+import threading
+import urllib.error
+import urllib.request
+import urllib.parse
+from typing import Callable, Optional
+
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+DEFAULT_TIMEOUT = 8
+
+_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8",
+}
+_OG_RE_1 = re.compile(r"<meta[^>]+property=[\"']og:image[\"'][^>]+content=[\"']([^\"']+)[\"']", re.I)
+_OG_RE_2 = re.compile(r"<meta[^>]+content=[\"']([^\"']+)[\"'][^>]+property=[\"']og:image[\"']", re.I)
+
+
+def _default_root() -> str:
+    base = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "LZ-Studio", "asset_cache")
+
+
+def is_remote(src: str) -> bool:
+    return src.startswith("http://") or src.startswith("https://")
+
+
+class AssetCache:
+    def __init__(self, root: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = root or _default_root()
+        self.max_bytes = int(max_bytes)
+        self._lock = threading.Lock()
+        self._inflight: dict[str, threading.Thread] = {}
+
+    # ---- 路径与元数据 ----
+    def _key(self, url: str) -> str:
+        return hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+    def _data_path(self, url: str) -> str:
+        return os.path.join(self.root, self._key(url) + ".bin")
+
+    def _meta_path(self, url: str) -> str:
+        return os.path.join(self.root, self._key(url) + ".json")
+
+    def _read_meta(self, url: str) -> dict:
+        try:
+            with open(self._meta_path(url), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            return {}
+
+    def _write(self, url: str, data: bytes, meta: dict) -> str:
+        os.makedirs(self.root, exist_ok=True)
+        path = self._data_path(url)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        with open(self._meta_path(url), "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+        self._evict()
+        return path
+
+    def _touch(self, path: str) -> None:
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+
+    def _evict(self) -> None:
+        """按最近使用时间（mtime）淘汰，直至总大小不超过上限。"""
+        try:
+            files = []
+            total = 0
+            for name in os.listdir(self.root):
+                if not name.endswith(".bin"):
+                    continue
+                p = os.path.join(self.root, name)
+                st = os.stat(p)
+                files.append((st.st_mtime, st.st_size, p))
+                total += st.st_size
+            files.sort()
+            for _mtime, size, p in files:
+                if total <= self.max_bytes:
+                    break
+                for q in (p, p[:-4] + ".json"):
+                    try:
+                        os.remove(q)
+                    except OSError:
+                        pass
+                total -= size
+        except Exception:
+            pass
+
+    # ---- 对外接口 ----
+    def cached_path(self, url: str) -> Optional[str]:
+        """仅查本地缓存（不访问网络），命中时返回数据文件路径。"""
+        p = self._data_path(url)
+        if os.path.exists(p):
+            self._touch(p)
+            return p
+        return None
+
+    def fetch(self, url: str, timeout: float = DEFAULT_TIMEOUT, _hops: int = 1) -> Optional[str]:
+        """条件请求下载到缓存；未变化（304）或网络失败时返回已有缓存。"""
+        meta = self._read_meta(url)
+        cached = self.cached_path(url)
+        headers = dict(_HEADERS)
+        if cached:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+        try:
+            req = urllib.request.Request(url, headers=headers)
+            with urllib.request.urlopen(req, timeout=timeout) as resp:
+                ct = resp.headers.get("Content-Type", "").lower()
+                data = resp.read()
+                new_meta = {
+                    "url": url,
+                    "etag": resp.headers.get("ETag"),
+                    "last_modified": resp.headers.get("Last-Modified"),
+                    "fetched_at": time.time(),
+                }
+                if "image" in ct:
+                    return self._write(url, data, new_meta)
+                # 尝试从 HTML 中提取 og:image
+                if _hops <= 0:
+                    return cached
+                html = data.decode("utf-8", errors="ignore")
+                m = _OG_RE_1.search(html) or _OG_RE_2.search(html)
+                if not m:
+                    return cached
+                img_url = urllib.parse.urljoin(url, m.group(1))
+                img_path = self.fetch(img_url, timeout=timeout, _hops=_hops - 1)
+                if not img_path:
+                    return cached
+                with open(img_path, "rb") as f:
+                    img_data = f.read()
+                new_meta["og_image"] = img_url
+                return self._write(url, img_data, new_meta)
+        except urllib.error.HTTPError:
+            # 304 Not Modified 也以 HTTPError 抛出：沿用缓存
+            return cached
+        except Exception:
+            return cached
+
+    def fetch_async(self, url: str, callback: Optional[Callable[[str, Optional[str]], None]] = None,
+                    timeout: float = DEFAULT_TIMEOUT) -> None:
+        """后台线程刷新缓存；完成后回调 callback(url, path)（在后台线程中调用）。"""
+        def _run():
+            path = None
+            try:
+                path = self.fetch(url, timeout=timeout)
+            finally:
+                with self._lock:
+                    self._inflight.pop(url, None)
+            if callback:
+                try:
+                    callback(url, path)
+                except Exception:
+                    pass
+
+        with self._lock:
+            if url in self._inflight and callback is None:
+                return
+            t = threading.Thread(target=_run, name="asset-fetch", daemon=True)
+            self._inflight[url] = t
+        t.start()
+
+
+_DEFAULT_CACHE: Optional[AssetCache] = None
+
+
+def default_cache() -> AssetCache:
+    global _DEFAULT_CACHE
+    if _DEFAULT_CACHE is None:
+        _DEFAULT_CACHE = AssetCache()
+    return _DEFAULT_CACHE
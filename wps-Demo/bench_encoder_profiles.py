@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+编码档位基准测试：对同一批渲染结果，分别用各档位 × 各格式编码，记录吞吐与体积
+
+用法：
+    python bench_encoder_profiles.py 测试材料/xxx.pdf --zoom 2 --pages 10 --out bench_profiles.json
+    python bench_encoder_profiles.py            # 不传 PDF 时生成一份图文混排的示例文档
+
+只统计编码耗时（渲染结果预先生成并复用），便于直接比较各档位的差异。
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from typing import List
+
+import fitz  # PyMuPDF
+
+from encoder_profiles import PROFILE_NAMES, encode_pixmap
+
+
+def _sample_document(pages: int) -> "fitz.Document":
+    doc = fitz.open()
+    for i in range(pages):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Encoder profile benchmark - page {i + 1}", fontsize=18)
+        for line in range(40):
+            page.insert_text((72, 110 + line * 16), "示例正文 Sample body text " * 3, fontsize=10)
+        # 彩色块模拟插图
+        page.draw_rect(fitz.Rect(300, 500, 540, 760), color=(0.2, 0.4, 0.8), fill=(0.85, 0.3, 0.2))
+    return doc
+
+
+def run(pdf_path: str, zoom: float, pages: int, formats: List[str], quality: int, repeat: int) -> dict:
+    doc = fitz.open(pdf_path) if pdf_path else _sample_document(pages)
+    try:
+        n = min(pages, len(doc))
+        mat = fitz.Matrix(zoom, zoom)
+        pixmaps = [doc[i].get_pixmap(matrix=mat) for i in range(n)]
+    finally:
+        doc.close()
+
+    results = []
+    for fmt in formats:
+        for profile in PROFILE_NAMES:
+            best = None
+            total_bytes = 0
+            for _ in range(max(1, repeat)):
+                t0 = time.perf_counter()
+                total_bytes = sum(len(encode_pixmap(p, fmt, quality, profile)) for p in pixmaps)
+                dt = time.perf_counter() - t0
+                best = dt if best is None else min(best, dt)
+            results.append({
+                "format": fmt,
+                "profile": profile,
+                "pages": n,
+                "seconds": round(best, 4),
+                "pages_per_sec": round(n / best, 2) if best else None,
+                "avg_kb": round(total_bytes / 1024.0 / max(1, n), 1),
+            })
+    return {
+        "source": os.path.basename(pdf_path) if pdf_path else "<sample>",
+        "zoom": zoom,
+        "quality": quality,
+        "results": results,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="编码档位吞吐/体积基准")
+    parser.add_argument("pdf", nargs="?", default="", help="测试用 PDF（留空则生成示例文档）")
+    parser.add_argument("--zoom", type=float, default=2.0)
+    parser.add_argument("--pages", type=int, default=8)
+    parser.add_argument("--formats", default="PNG,JPEG,WEBP")
+    parser.add_argument("--quality", type=int, default=85)
+    parser.add_argument("--repeat", type=int, default=2, help="重复次数，取最快一次")
+    parser.add_argument("--out", default="", help="结果写入 JSON 文件")
+    args = parser.parse_args(argv)
+
+    report = run(args.pdf, args.zoom, args.pages, [f.strip().upper() for f in args.formats.split(",") if f.strip()],
+                 args.quality, args.repeat)
+    print(f"{'格式':<6}{'档位':<10}{'页/秒':>10}{'平均KB':>10}")
+    for r in report["results"]:
+        print(f"{r['format']:<6}{r['profile']:<10}{r['pages_per_sec']:>10}{r['avg_kb']:>10}")
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
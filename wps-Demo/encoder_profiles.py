@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+图片编码档位（各转换工具共用，不依赖 Qt）
+
+- fast：PNG 直接用 PyMuPDF 原生编码（pix.tobytes，跳过 Pillow）、JPEG 不做 Huffman 优化
+- balanced：PNG 默认压缩级别、JPEG 优化 Huffman 表
+- smallest：PNG optimize（最慢）、JPEG 渐进式 + 优化、WebP 最高压缩方法
+
+输出格式：PNG / JPEG / WEBP。JPEG 始终走 Pillow：实测 PyMuPDF 原生 JPEG 编码比 Pillow 慢数倍
+（见 bench_encoder_profiles.py）。
+"""
+
+import io
+from typing import Dict, Optional
+
+import fitz  # PyMuPDF
+from PIL import Image
+
+PROFILE_NAMES = ("fast", "balanced", "smallest")
+PROFILE_LABELS: Dict[str, str] = {"fast": "快速", "balanced": "均衡", "smallest": "最小体积"}
+DEFAULT_PROFILE = "balanced"
+
+PROFILES: Dict[str, dict] = {
+    "fast": {
+        "png_compress_level": 1,
+        "png_optimize": False,
+        "jpeg_subsampling": "4:2:0",
+        "jpeg_progressive": False,
+        "jpeg_optimize": False,
+        "webp_method": 0,
+        "native_png": True,
+    },
+    "balanced": {
+        "png_compress_level": 6,
+        "png_optimize": False,
+        "jpeg_subsampling": "4:2:0",
+        "jpeg_progressive": False,
+        "jpeg_optimize": True,
+        "webp_method": 4,
+        "native_png": False,
+    },
+    "smallest": {
+        "png_compress_level": 9,
+        "png_optimize": True,
+        "jpeg_subsampling": "4:2:0",
+        "jpeg_progressive": True,
+        "jpeg_optimize": True,
+        "webp_method": 6,
+        "native_png": False,
+    },
+}
+
+_FORMAT_ALIASES = {"PNG": "PNG", "JPG": "JPEG", "JPEG": "JPEG", "WEBP": "WEBP"}
+_EXTENSIONS = {"PNG": "png", "JPEG": "jpg", "WEBP": "webp"}
+
+
+def normalize_profile(profile: Optional[str]) -> str:
+    name = (profile or DEFAULT_PROFILE).strip().lower()
+    if name not in PROFILES:
+        raise ValueError(f"不支持的编码档位: {profile}，仅支持: {', '.join(PROFILE_NAMES)}")
+    return name
+
+
+def normalize_format(fmt: str) -> str:
+    f = _FORMAT_ALIASES.get((fmt or "").upper())
+    if f is None:
+        raise ValueError(f"不支持的图片格式: {fmt}，仅支持: PNG, JPEG, WEBP")
+    return f
+
+
+def extension_for(fmt: str) -> str:
+    return _EXTENSIONS[normalize_format(fmt)]
+
+
+def pil_save_options(fmt: str, quality: int = 95, profile: Optional[str] = None) -> dict:
+    """返回 Image.save 的关键字参数（含 format）。"""
+    fmt = normalize_format(fmt)
+    p = PROFILES[normalize_profile(profile)]
+    if fmt == "PNG":
+        return {"format": "PNG", "compress_level": p["png_compress_level"], "optimize": p["png_optimize"]}
+    if fmt == "JPEG":
+        return {
+            "format": "JPEG",
+            "quality": int(quality),
+            "subsampling": p["jpeg_subsampling"],
+            "progressive": p["jpeg_progressive"],
+            "optimize": p["jpeg_optimize"],
+        }
+    return {"format": "WEBP", "quality": int(quality), "method": p["webp_method"]}
+
+
+def pixmap_to_image(pix: "fitz.Pixmap") -> Image.Image:
+    """直接用像素数据构造 PIL 图像，避免 tobytes("png") 再解码的一次往返。"""
+    if pix.alpha:
+        mode = "RGBA" if pix.n == 4 else "LA"
+    else:
+        mode = {1: "L", 3: "RGB", 4: "CMYK"}.get(pix.n, "RGB")
+    if pix.stride == pix.width * pix.n:
+        return Image.frombytes(mode, (pix.width, pix.height), pix.samples)
+    return Image.frombuffer(mode, (pix.width, pix.height), pix.samples, "raw", mode, pix.stride, 1)
+
+
+def encode_image(img: Image.Image, fmt: str, quality: int = 95, profile: Optional[str] = None) -> bytes:
+    opts = pil_save_options(fmt, quality, profile)
+    if opts["format"] == "JPEG" and img.mode not in ("RGB", "L", "CMYK"):
+        img = img.convert("RGB")
+    buf = io.BytesIO()
+    img.save(buf, **opts)
+    return buf.getvalue()
+
+
+def encode_pixmap(pix: "fitz.Pixmap", fmt: str, quality: int = 95, profile: Optional[str] = None) -> bytes:
+    """编码 PyMuPDF 渲染结果；fast 档位的 PNG 直接使用 PyMuPDF 原生编码。"""
+    fmt = normalize_format(fmt)
+    if fmt == "PNG" and PROFILES[normalize_profile(profile)]["native_png"]:
+        try:
+            return pix.tobytes("png")
+        except Exception:
+            pass
+    return encode_image(pixmap_to_image(pix), fmt, quality, profile)
@@ -1,14 +1,16 @@
 import sys
 import os
+import hashlib
+import threading
 import webbrowser
-import urllib.request
 import urllib.parse
-from functools import lru_cache
 
 from PySide6.QtWidgets import QApplication, QLabel, QMainWindow, QProgressBar, QVBoxLayout, QWidget
-from PySide6.QtCore import Qt, QSize, QTimer
+from PySide6.QtCore import Qt, QSize, QTimer, QObject, Signal
 from PySide6.QtGui import QPixmap, QPainter, QLinearGradient, QColor, QFont
 
+from asset_cache import default_cache, is_remote
+
 
 # 简单的 Pixmap 内存缓存，避免重复加载图片导致启动慢
 _PIXMAP_CACHE: dict[str, QPixmap] = {}
@@ -16,61 +18,39 @@ _PIXMAP_CACHE: dict[str, QPixmap] = {}
 def _clean_src(s: str) -> str:
     return (s or "").strip().strip("`")
 
-@lru_cache(maxsize=16)
-def _fetch_image_bytes(url: str) -> bytes | None:
-    try:
-        req = urllib.request.Request(url, headers={
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36",
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8",
-        })
-        with urllib.request.urlopen(req, timeout=8) as resp:
-            ct = resp.headers.get("Content-Type", "").lower()
-            data = resp.read()
-            if "image" in ct:
-                return data
-            # 尝试从 HTML 中提取 og:image
-            try:
-                html = data.decode("utf-8", errors="ignore")
-                import re
-                m = re.search(r"<meta[^>]+property=[\"']og:image[\"'][^>]+content=[\"']([^\"']+)[\"']", html, re.I)
-                if not m:
-                    m = re.search(r"<meta[^>]+content=[\"']([^\"']+)[\"'][^>]+property=[\"']og:image[\"']", html, re.I)
-                if m:
-                    img_url = urllib.parse.urljoin(url, m.group(1))
-                    return _fetch_image_bytes(img_url)
-            except Exception:
-                pass
-            return None
-    except Exception:
-        return None
+def _load_pixmap_now(src: str) -> QPixmap | None:
+    """只读本地：本地路径 / file:// / 网络图片的磁盘缓存，不访问网络。"""
+    path = None
+    if is_remote(src):
+        path = default_cache().cached_path(src)
+    elif src.startswith("file://"):
+        path = urllib.parse.urlparse(src).path
+    else:
+        path = src
+    if path and os.path.exists(path):
+        p = QPixmap(path)
+        if not p.isNull():
+            return p
+    return None
 
 def preload_image(image_path_or_url: str) -> None:
-    """预加载图片到内存缓存，加速后续显示。"""
+    """预加载图片到内存缓存，加速后续显示（网络图片只读磁盘缓存，刷新由窗口在后台完成）。"""
     try:
         src = _clean_src(image_path_or_url or "")
         if not src or src in _PIXMAP_CACHE:
             return
-        p: QPixmap | None = None
-        if src.startswith("http://") or src.startswith("https://"):
-            data = _fetch_image_bytes(src)
-            if data:
-                q = QPixmap()
-                if q.loadFromData(data):
-                    p = q
-        else:
-            # 支持 file:// 协议与本地路径
-            if src.startswith("file://"):
-                local_path = urllib.parse.urlparse(src).path
-                if os.path.exists(local_path):
-                    p = QPixmap(local_path)
-            elif os.path.exists(src):
-                p = QPixmap(src)
-        if p and not p.isNull():
+        p = _load_pixmap_now(src)
+        if p is not None:
             _PIXMAP_CACHE[src] = p
     except Exception:
         pass
 
 
+class _AssetNotifier(QObject):
+    # 后台线程发射，主线程槽函数接收（跨线程自动排队）
+    loaded = Signal(str, str)
+
+
 class ImageCoverWidget(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -124,17 +104,20 @@ class FullScreenImageWindow(QMainWindow):
         self.setCentralWidget(container)
         self.setCursor(Qt.PointingHandCursor)
 
-        # 优先使用缓存，加速显示
-        s = _clean_src(image_path_or_url or "")
-        pixmap = _PIXMAP_CACHE.get(s)
-        if pixmap is None or pixmap.isNull():
-            pixmap = self.load_image(image_path_or_url)
-            if pixmap and not pixmap.isNull():
-                _PIXMAP_CACHE[s] = pixmap
+        # 先用内存/磁盘缓存或占位图立即显示，网络图片在后台条件刷新后再替换
+        self._src = _clean_src(image_path_or_url or "")
+        self._is_placeholder = False
+        pixmap = self.load_image(image_path_or_url)
         self.original_pixmap = pixmap
         self.adjust_initial_size_and_center(pixmap)
         self.image.setPixmap(self.original_pixmap)
 
+        self._notifier = _AssetNotifier(self)
+        self._notifier.loaded.connect(self._on_image_loaded)
+        if is_remote(self._src):
+            notifier = self._notifier
+            default_cache().fetch_async(self._src, lambda url, path: notifier.loaded.emit(url, path or ""))
+
         # 倒计时（3秒）在窗口显示时启动
         self._countdown_ms = 3000
         self._interval_ms = 50
@@ -146,32 +129,36 @@ class FullScreenImageWindow(QMainWindow):
         screen = QApplication.primaryScreen()
         size = screen.size() if screen else QSize(1920, 1080)
 
-
-        # 顶层缓存与下载函数已重构到模块级，以便复用与预加载
-
         pixmap = None
         src = _clean_src(image_path_or_url or "")
         if src:
-            if src.startswith("http://") or src.startswith("https://"):
-                data = _fetch_image_bytes(src)
-                if data:
-                    p = QPixmap()
-                    if p.loadFromData(data):
-                        pixmap = p
-            else:
-                # 支持 file:// 协议与本地路径
-                if src.startswith("file://"):
-                    local_path = urllib.parse.urlparse(src).path
-                    if os.path.exists(local_path):
-                        pixmap = QPixmap(local_path)
-                elif os.path.exists(src):
-                    pixmap = QPixmap(src)
-
-        if not pixmap or pixmap.isNull():
+            pixmap = _PIXMAP_CACHE.get(src)
+            if pixmap is None or pixmap.isNull():
+                pixmap = _load_pixmap_now(src)
+                if pixmap is not None:
+                    _PIXMAP_CACHE[src] = pixmap
+
+        self._is_placeholder = not pixmap or pixmap.isNull()
+        if self._is_placeholder:
             pixmap = self._create_placeholder_pixmap(size)
 
         return pixmap
 
+    def _on_image_loaded(self, url: str, path: str):
+        if url != self._src or not path:
+            return
+        p = QPixmap(path)
+        if p.isNull():
+            return
+        _PIXMAP_CACHE[url] = p
+        was_placeholder = self._is_placeholder
+        self._is_placeholder = False
+        self.original_pixmap = p
+        # 已显示的窗口不再改尺寸，避免跳动；占位图阶段按真实图片比例重新居中
+        if was_placeholder and not self.isVisible():
+            self.adjust_initial_size_and_center(p)
+        self.image.setPixmap(p)
+
     def _create_placeholder_pixmap(self, size: QSize) -> QPixmap:
         pixmap = QPixmap(size)
         pixmap.fill(Qt.black)
@@ -269,38 +256,61 @@ def show_fullscreen_image_and_open_url(image_path_or_url: str, target_url: str,
             pass
 
 def _prepare_icon_path(icon_path_or_url: str | None, resize_to: int | None = None) -> str | None:
-    if not icon_path_or_url:
+    """准备 Toast 图标的本地 PNG 路径；网络图标走磁盘缓存，命中时在后台刷新供下次使用。"""
+    src = _clean_src(icon_path_or_url or "")
+    if not src:
         return None
     try:
-        img: Image.Image | None = None
-        if icon_path_or_url.startswith("http://") or icon_path_or_url.startswith("https://"):
-            data = urllib.request.urlopen(icon_path_or_url, timeout=6).read()
-            bio = io.BytesIO(data)
-            img = Image.open(bio)
+        from PIL import Image
+
+        cache = default_cache()
+        if is_remote(src):
+            path = cache.cached_path(src)
+            if path:
+                cache.fetch_async(src)
+            else:
+                path = cache.fetch(src, timeout=6)
+            if not path:
+                return None
         else:
-            if not os.path.exists(icon_path_or_url):
+            if not os.path.exists(src):
                 return None
-            img = Image.open(icon_path_or_url)
+            path = src
 
-        if img is None:
-            return None
+        # 转换结果按内容哈希 + 尺寸命名，内容不变时直接复用
+        with open(path, "rb") as f:
+            digest = hashlib.sha1(f.read()).hexdigest()[:16]
+        out_dir = os.path.join(cache.root, "icons")
+        out = os.path.join(out_dir, f"{digest}_{int(resize_to or 0)}.png")
+        if os.path.exists(out):
+            return out
 
+        img = Image.open(path)
         if img.mode not in ("RGB", "RGBA"):
             img = img.convert("RGBA")
 
         if resize_to and resize_to > 0:
             img = img.resize((resize_to, resize_to), Image.LANCZOS)
 
-        tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".png")
+        os.makedirs(out_dir, exist_ok=True)
+        tmp = out + ".tmp"
         img.save(tmp, format="PNG")
-        tmp.flush()
-        tmp.close()
-        return tmp.name
+        os.replace(tmp, out)
+        return out
     except Exception:
         return None
 
 
 def show_windows_toast(title: str, message: str, duration: int = 5, icon: str | None = None, url: str | None = None, button_label: str | None = None, icon_size: int | None = None) -> None:
+    """后台线程准备图标并发送通知，调用方（通常是 GUI 线程）不会被网络下载阻塞。"""
+    threading.Thread(
+        target=_send_toast,
+        args=(title, message, duration, icon, url, button_label, icon_size),
+        name="toast", daemon=True,
+    ).start()
+
+
+def _send_toast(title: str, message: str, duration: int, icon: str | None, url: str | None, button_label: str | None, icon_size: int | None) -> None:
     icon_path = _prepare_icon_path(icon, resize_to=icon_size)
     try:
         from winotify import Notification, audio
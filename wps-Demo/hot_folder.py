@@ -0,0 +1,540 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+热文件夹：常驻监视指定文件夹，新文件写入完成后自动转换（不依赖 Qt）
+
+用法：
+    python hot_folder.py hot_folder.json
+    python hot_folder.py --watch D:/扫描件 --op shrink --metrics-port 8765
+
+配置文件（JSON）：
+    {
+      "workers": 2,
+      "settle_seconds": 2.0,
+      "max_retries": 2,
+      "metrics_port": 8765,
+      "watches": [
+        {"folder": "D:/扫描件", "operation": "shrink", "options": {"jpeg_quality": 60}},
+        {"folder": "D:/表格截图", "operation": "table", "output": "D:/表格结果"}
+      ]
+    }
+
+- 事件源：安装 watchdog 时使用系统通知（Linux inotify / Windows ReadDirectoryChangesW），
+  另以较长间隔轮询兜底；未安装时仅轮询
+- 防抖：文件大小与修改时间在 settle_seconds 内不再变化、且能以读方式打开，才视为写入完成
+- 处理：有界进程池执行，排队中的文件不会一次性全部提交；失败按指数退避重试，
+  仍失败则连同错误说明移入 .failed（死信）文件夹；成功的源文件移入 .done，重启后不会重复处理
+  源文件被占用无法移走时记下（路径、大小、修改时间）不再转换，并在每次扫描时重试移动
+- 指标：累计处理/失败/重试数、队列深度、处理中数量、近一分钟吞吐与平均耗时，
+  通过 http://127.0.0.1:<端口>/metrics（Prometheus 文本）与 /status（JSON）查看
+- 只监视文件夹本层，输出默认写入其下的 out 子文件夹
+"""
+
+import os
+import sys
+import csv
+import json
+import time
+import shutil
+import argparse
+import threading
+import traceback
+import multiprocessing
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Deque, Dict, List, Optional, Tuple
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except Exception:
+    Observer = None  # 未安装 watchdog 时退回轮询
+    FileSystemEventHandler = object
+
+PDF_EXTS = (".pdf",)
+IMAGE_EXTS = (".png", ".jpg", ".jpeg", ".bmp")
+
+# 操作名 -> 可处理的扩展名
+OPERATIONS: Dict[str, Tuple[str, ...]] = {
+    "shrink": PDF_EXTS,
+    "imagepdf": PDF_EXTS,
+    "images": PDF_EXTS,
+    "table": IMAGE_EXTS,
+}
+
+DONE_DIR = ".done"
+FAILED_DIR = ".failed"
+DEFAULT_SETTLE_SECONDS = 2.0
+DEFAULT_POLL_INTERVAL = 1.0
+# 有系统通知时的兜底轮询间隔（网络盘等场景可能丢事件）
+EVENT_RESCAN_INTERVAL = 30.0
+DEFAULT_MAX_RETRIES = 2
+RETRY_BASE_DELAY = 2.0
+_TEMP_SUFFIXES = (".tmp", ".part", ".crdownload", ".partial")
+
+
+def _log(msg: str) -> None:
+    try:
+        print(f"[HotFolder] {time.strftime('%H:%M:%S')} {msg}", flush=True)
+    except Exception:
+        pass
+
+
+# ----------------- 转换任务（在子进程中执行） -----------------
+def run_operation(operation: str, src: str, out_dir: str, options: dict) -> List[str]:
+    """执行单个文件的转换，返回输出路径列表；功能模块在子进程内按需导入。"""
+    stem = os.path.splitext(os.path.basename(src))[0]
+    os.makedirs(out_dir, exist_ok=True)
+    if operation == "shrink":
+        from pdf_shrink import shrink_pdf_to_image_pdf
+        return [shrink_pdf_to_image_pdf(src, os.path.join(out_dir, f"{stem}_shrink.pdf"), **options)]
+    if operation == "imagepdf":
+        from pdf2imagepdf import convert_pdf_to_image_only_pdf
+        return [convert_pdf_to_image_only_pdf(src, os.path.join(out_dir, f"{stem}_image.pdf"), **options)]
+    if operation == "images":
+        from pdf2images import convert_pdf_to_images
+        return [convert_pdf_to_images(src, output_dir=os.path.join(out_dir, stem), **options)]
+    if operation == "table":
+        from png2excel import extract_table
+        table = extract_table(src)
+        if not table:
+            raise ValueError("未识别到表格")
+        out_path = os.path.join(out_dir, f"{stem}.csv")
+        # utf-8-sig 便于 Excel 直接打开
+        with open(out_path, "w", encoding="utf-8-sig", newline="") as f:
+            csv.writer(f).writerows(table)
+        return [out_path]
+    raise ValueError(f"不支持的操作: {operation}，仅支持: {', '.join(OPERATIONS)}")
+
+
+# ----------------- 配置 -----------------
+class WatchConfig:
+    def __init__(self, folder: str, operation: str, output: Optional[str] = None, options: Optional[dict] = None):
+        if operation not in OPERATIONS:
+            raise ValueError(f"不支持的操作: {operation}，仅支持: {', '.join(OPERATIONS)}")
+        self.folder = os.path.abspath(folder)
+        self.operation = operation
+        self.output = os.path.abspath(output) if output else os.path.join(self.folder, "out")
+        if os.path.normcase(self.output) == os.path.normcase(self.folder):
+            raise ValueError(f"输出文件夹不能与监视文件夹相同: {self.folder}")
+        self.options = dict(options or {})
+
+    def accepts(self, path: str) -> bool:
+        name = os.path.basename(path)
+        if name.startswith((".", "~$")) or name.lower().endswith(_TEMP_SUFFIXES):
+            return False
+        return os.path.dirname(os.path.abspath(path)) == self.folder and name.lower().endswith(OPERATIONS[self.operation])
+
+
+def load_config(path: str) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        cfg = json.load(f)
+    if not cfg.get("watches"):
+        raise ValueError("配置中缺少 watches")
+    return cfg
+
+
+# ----------------- 指标 -----------------
+class HotFolderMetrics:
+    def __init__(self, window_seconds: float = 60.0):
+        self.window = window_seconds
+        self._lock = threading.Lock()
+        self.counters = {"discovered": 0, "processed": 0, "failed": 0, "retried": 0, "dead_lettered": 0}
+        self.queue_depth = 0
+        self.in_flight = 0
+        self._recent: Deque[Tuple[float, float, float]] = deque()  # (完成时刻, 处理耗时, 落地到完成耗时)
+        self.started_at = time.time()
+
+    def inc(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self.counters[name] += n
+
+    def set_depth(self, queued: int, in_flight: int) -> None:
+        with self._lock:
+            self.queue_depth = queued
+            self.in_flight = in_flight
+
+    def record_done(self, work_seconds: float, latency_seconds: float) -> None:
+        now = time.time()
+        with self._lock:
+            self.counters["processed"] += 1
+            self._recent.append((now, work_seconds, latency_seconds))
+            self._trim(now)
+
+    def _trim(self, now: float) -> None:
+        while self._recent and now - self._recent[0][0] > self.window:
+            self._recent.popleft()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            self._trim(time.time())
+            n = len(self._recent)
+            return {
+                **self.counters,
+                "queue_depth": self.queue_depth,
+                "in_flight": self.in_flight,
+                "throughput_per_min": round(n * 60.0 / self.window, 2),
+                "avg_work_seconds": round(sum(r[1] for r in self._recent) / n, 3) if n else None,
+                "avg_latency_seconds": round(sum(r[2] for r in self._recent) / n, 3) if n else None,
+                "uptime_seconds": round(time.time() - self.started_at, 1),
+            }
+
+    def prometheus_text(self) -> str:
+        s = self.snapshot()
+        lines = []
+        for name in self.counters:
+            lines.append(f"# TYPE hotfolder_{name}_total counter")
+            lines.append(f"hotfolder_{name}_total {s[name]}")
+        for name in ("queue_depth", "in_flight", "throughput_per_min", "avg_work_seconds", "avg_latency_seconds"):
+            if s[name] is not None:
+                lines.append(f"# TYPE hotfolder_{name} gauge")
+                lines.append(f"hotfolder_{name} {s[name]}")
+        return "\n".join(lines) + "\n"
+
+
+def serve_metrics(metrics: HotFolderMetrics, port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    class _Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.startswith("/metrics"):
+                body, ctype = metrics.prometheus_text().encode("utf-8"), "text/plain; version=0.0.4"
+            elif self.path.startswith("/status"):
+                body, ctype = json.dumps(metrics.snapshot(), ensure_ascii=False).encode("utf-8"), "application/json"
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), _Handler)
+    threading.Thread(target=server.serve_forever, name="hotfolder-metrics", daemon=True).start()
+    return server
+
+
+# ----------------- 监视与调度 -----------------
+class _Pending:
+    __slots__ = ("path", "watch", "size", "mtime", "stable_since", "landed_at", "attempts", "not_before")
+
+    def __init__(self, path: str, watch: WatchConfig):
+        self.path = path
+        self.watch = watch
+        self.size = -1
+        self.mtime = -1.0
+        self.stable_since = 0.0
+        self.landed_at = time.time()
+        self.attempts = 0
+        self.not_before = 0.0
+
+
+class _EventHandler(FileSystemEventHandler):
+    def __init__(self, service: "HotFolderService"):
+        self.service = service
+
+    def on_created(self, event):
+        if not event.is_directory:
+            self.service.notify(event.src_path)
+
+    def on_modified(self, event):
+        if not event.is_directory:
+            self.service.notify(event.src_path)
+
+    def on_moved(self, event):
+        if not event.is_directory:
+            self.service.notify(event.dest_path)
+
+
+class HotFolderService:
+    def __init__(self, watches: List[WatchConfig], workers: int = 2, settle_seconds: float = DEFAULT_SETTLE_SECONDS,
+                 max_retries: int = DEFAULT_MAX_RETRIES, poll_interval: float = DEFAULT_POLL_INTERVAL,
+                 use_events: bool = True):
+        if not watches:
+            raise ValueError("请至少配置一个监视文件夹")
+        self.watches = watches
+        self.workers = max(1, int(workers))
+        self.settle_seconds = float(settle_seconds)
+        self.max_retries = max(0, int(max_retries))
+        self.poll_interval = float(poll_interval)
+        self.use_events = use_events and Observer is not None
+        self.metrics = HotFolderMetrics()
+        # 任务若提交时已完成，回调会在持锁的提交线程中直接执行，需可重入
+        self._lock = threading.RLock()
+        self._pending: Dict[str, _Pending] = {}  # 等待写入完成
+        self._ready: Deque[_Pending] = deque()   # 已稳定、等待空闲 worker
+        self._running: Dict[Future, Tuple[_Pending, float]] = {}
+        # 已处理完但未能移出监视目录的文件（如仍被其他程序占用）：路径 -> (大小, 修改时间, 任务, 目标子目录)
+        self._processed: Dict[str, Tuple[int, float, _Pending, str]] = {}
+        self._stop = threading.Event()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._observer = None
+        self._last_scan = 0.0
+
+    # ---- 事件入口 ----
+    def notify(self, path: str) -> None:
+        path = os.path.abspath(path)
+        watch = next((w for w in self.watches if w.accepts(path)), None)
+        if watch is None:
+            return
+        with self._lock:
+            if path in self._pending or any(p.path == path for p in self._ready) \
+                    or any(p.path == path for p, _ in self._running.values()):
+                return
+            done = self._processed.get(path)
+            if done is not None:
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    return
+                # 大小与修改时间未变即为同一文件，只等待移走，不再转换
+                if (st.st_size, st.st_mtime) == done[:2]:
+                    return
+                del self._processed[path]
+            self._pending[path] = _Pending(path, watch)
+        self.metrics.inc("discovered")
+
+    def scan(self) -> None:
+        for w in self.watches:
+            try:
+                with os.scandir(w.folder) as it:
+                    for entry in it:
+                        if entry.is_file():
+                            self.notify(entry.path)
+            except OSError:
+                pass
+
+    # ---- 防抖 ----
+    def _settle(self, now: float) -> None:
+        with self._lock:
+            items = list(self._pending.values())
+        for p in items:
+            try:
+                st = os.stat(p.path)
+            except OSError:
+                # 文件已被移走或删除
+                with self._lock:
+                    self._pending.pop(p.path, None)
+                continue
+            if st.st_size != p.size or st.st_mtime != p.mtime:
+                p.size, p.mtime, p.stable_since = st.st_size, st.st_mtime, now
+                continue
+            if st.st_size == 0 or now - p.stable_since < self.settle_seconds:
+                continue
+            try:
+                # Windows 上写入方仍持有独占句柄时打开会失败
+                with open(p.path, "rb"):
+                    pass
+            except OSError:
+                p.stable_since = now
+                continue
+            with self._lock:
+                self._pending.pop(p.path, None)
+                self._ready.append(p)
+
+    # ---- 调度 ----
+    def _ensure_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    def _dispatch(self, now: float) -> None:
+        with self._lock:
+            # 只保持 workers 个任务在执行，其余留在队列中（队列深度即积压量）
+            while len(self._running) < self.workers:
+                # 跳过仍在重试退避期内的文件
+                p = next((q for q in self._ready if q.not_before <= now), None)
+                if p is None:
+                    break
+                self._ready.remove(p)
+                try:
+                    fut = self._ensure_pool().submit(run_operation, p.watch.operation, p.path, p.watch.output, p.watch.options)
+                except (BrokenProcessPool, RuntimeError):
+                    self._pool = None
+                    self._ready.appendleft(p)
+                    break
+                p.attempts += 1
+                self._running[fut] = (p, time.time())
+                fut.add_done_callback(self._on_done)
+            self.metrics.set_depth(len(self._ready) + len(self._pending), len(self._running))
+
+    def _on_done(self, fut: Future) -> None:
+        # 任务在文件移走（或重新排队）之后才从 _running 移除，
+        # 否则 notify 可能在两者之间把仍在监控目录中的文件当作新文件再次入队
+        with self._lock:
+            p, started = self._running.get(fut, (None, 0.0))
+        if p is None:
+            return
+        err = fut.exception()
+        if err is None:
+            self._move(p, DONE_DIR)
+            with self._lock:
+                self._running.pop(fut, None)
+            self.metrics.record_done(time.time() - started, time.time() - p.landed_at)
+            _log(f"完成 {os.path.basename(p.path)} -> {', '.join(fut.result())}")
+            return
+        retry = p.attempts <= self.max_retries
+        with self._lock:
+            if isinstance(err, BrokenProcessPool):
+                self._pool = None
+            if retry:
+                delay = RETRY_BASE_DELAY * (2 ** (p.attempts - 1))
+                p.not_before = time.time() + delay
+                self._running.pop(fut, None)
+                self._ready.append(p)
+        if retry:
+            self.metrics.inc("retried")
+            _log(f"失败 {os.path.basename(p.path)}（第 {p.attempts} 次）：{err}，{delay:.0f} 秒后重试")
+            return
+        self.metrics.inc("failed")
+        target = self._move(p, FAILED_DIR)
+        with self._lock:
+            self._running.pop(fut, None)
+        if target:
+            self.metrics.inc("dead_lettered")
+            try:
+                detail = "".join(traceback.format_exception(type(err), err, err.__traceback__))
+                with open(target + ".error.txt", "w", encoding="utf-8") as f:
+                    f.write(f"操作: {p.watch.operation}\n尝试次数: {p.attempts}\n\n{detail}")
+            except Exception:
+                pass
+        _log(f"放弃 {os.path.basename(p.path)}：{err}（已移入 {FAILED_DIR}）")
+
+    def _move(self, p: _Pending, sub: str) -> Optional[str]:
+        dst_dir = os.path.join(p.watch.folder, sub)
+        try:
+            os.makedirs(dst_dir, exist_ok=True)
+            name = os.path.basename(p.path)
+            dst = os.path.join(dst_dir, name)
+            if os.path.exists(dst):
+                stem, ext = os.path.splitext(name)
+                dst = os.path.join(dst_dir, f"{stem}_{time.strftime('%Y%m%d%H%M%S')}{ext}")
+            shutil.move(p.path, dst)
+            with self._lock:
+                self._processed.pop(p.path, None)
+            return dst
+        except Exception as e:
+            with self._lock:
+                first = p.path not in self._processed
+                try:
+                    st = os.stat(p.path)
+                    self._processed[p.path] = (st.st_size, st.st_mtime, p, sub)
+                except OSError:
+                    self._processed.pop(p.path, None)
+            if first:
+                _log(f"移动 {p.path} 失败：{e}，稍后重试")
+            return None
+
+    def _retry_moves(self) -> None:
+        """重试移走已处理完的文件；文件已被删除或替换时放弃记录。"""
+        with self._lock:
+            items = list(self._processed.items())
+        for path, (size, mtime, p, sub) in items:
+            try:
+                st = os.stat(path)
+            except OSError:
+                st = None
+            if st is None or (st.st_size, st.st_mtime) != (size, mtime):
+                with self._lock:
+                    self._processed.pop(path, None)
+                continue
+            if self._move(p, sub):
+                _log(f"已移走 {os.path.basename(path)} -> {sub}")
+
+    # ---- 生命周期 ----
+    def start(self) -> None:
+        for w in self.watches:
+            os.makedirs(w.folder, exist_ok=True)
+            os.makedirs(w.output, exist_ok=True)
+        if self.use_events:
+            self._observer = Observer()
+            handler = _EventHandler(self)
+            for w in self.watches:
+                self._observer.schedule(handler, w.folder, recursive=False)
+            self._observer.start()
+        mode = "系统通知" if self._observer else "轮询"
+        _log(f"开始监视 {len(self.watches)} 个文件夹（{mode}，{self.workers} 个 worker）")
+        self.scan()
+        self._last_scan = time.time()
+
+    def step(self) -> None:
+        now = time.time()
+        rescan = EVENT_RESCAN_INTERVAL if self._observer else self.poll_interval
+        if now - self._last_scan >= rescan:
+            self._retry_moves()
+            self.scan()
+            self._last_scan = now
+        self._settle(now)
+        self._dispatch(now)
+
+    def run_forever(self) -> None:
+        self.start()
+        try:
+            while not self._stop.is_set():
+                self.step()
+                self._stop.wait(min(0.5, self.poll_interval))
+        finally:
+            self.stop()
+
+    def stop(self, wait: bool = True) -> None:
+        self._stop.set()
+        if self._observer is not None:
+            try:
+                self._observer.stop()
+                self._observer.join(timeout=5)
+            except Exception:
+                pass
+            self._observer = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=True)
+            self._pool = None
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="热文件夹：新文件落地后自动转换")
+    parser.add_argument("config", nargs="?", default="", help="JSON 配置文件")
+    parser.add_argument("--watch", default="", help="监视文件夹（不使用配置文件时）")
+    parser.add_argument("--op", default="shrink", choices=list(OPERATIONS), help="转换操作")
+    parser.add_argument("--out", default="", help="输出文件夹，默认为监视文件夹下的 out")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--settle", type=float, default=None, help="判定写入完成的静默秒数")
+    parser.add_argument("--metrics-port", type=int, default=None, help="指标 HTTP 端口（0 为不开启）")
+    parser.add_argument("--poll", action="store_true", help="强制使用轮询（网络盘等不支持系统通知的场景）")
+    args = parser.parse_args(argv)
+
+    if args.config:
+        cfg = load_config(args.config)
+    elif args.watch:
+        cfg = {"watches": [{"folder": args.watch, "operation": args.op, "output": args.out or None}]}
+    else:
+        parser.error("请提供配置文件或 --watch")
+        return 2
+
+    watches = [WatchConfig(w["folder"], w["operation"], w.get("output"), w.get("options")) for w in cfg["watches"]]
+    service = HotFolderService(
+        watches,
+        workers=args.workers or cfg.get("workers") or max(1, (os.cpu_count() or 2) // 2),
+        settle_seconds=args.settle if args.settle is not None else cfg.get("settle_seconds", DEFAULT_SETTLE_SECONDS),
+        max_retries=cfg.get("max_retries", DEFAULT_MAX_RETRIES),
+        poll_interval=cfg.get("poll_interval", DEFAULT_POLL_INTERVAL),
+        use_events=not args.poll,
+    )
+    port = args.metrics_port if args.metrics_port is not None else cfg.get("metrics_port", 0)
+    if port:
+        serve_metrics(service.metrics, int(port))
+        _log(f"指标：http://127.0.0.1:{port}/metrics")
+    try:
+        service.run_forever()
+    except KeyboardInterrupt:
+        _log("已停止")
+    return 0
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -2,7 +2,6 @@
 # -*- coding: utf-8 -*-
 
 import os
-import io
 from typing import Optional, Tuple, List
 
 import fitz  # PyMuPDF
@@ -33,7 +32,9 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt, QSize, Signal, QThread, QTimer, QUrl
 from PySide6.QtGui import QPixmap, QImage, QIcon, QDesktopServices
 
-from ui_style_nb import build_style, compute_scale, dp
+from encoder_profiles import DEFAULT_PROFILE, PROFILE_LABELS, PROFILE_NAMES, encode_image, normalize_profile
+from ui_style_nb import apply_style, compute_scale, dp
+from layout_service import factor_bucket, schedule_reflow, size_bucket_changed
 
 
 # 纸张尺寸（PDF 点，1 点 = 1/72 英寸）
@@ -72,21 +73,21 @@ def split_image_segments(img_path: str, segment_height_px: int) -> List[Image.Im
 
 
 def pil_to_qpixmap(img: Image.Image) -> QPixmap:
-    buf = io.BytesIO()
-    img.save(buf, format="PNG")
-    data = buf.getvalue()
+    # 仅用于界面预览：使用最快的 PNG 编码档位
+    data = encode_image(img, "PNG", profile="fast")
     qimg = QImage.fromData(data)
     return QPixmap.fromImage(qimg)
 
 
-def compose_pdf_from_segments(
+def compose_document_from_segments(
     segments: List[Image.Image],
-    output_path: str,
     paper_name: str = "A4",
     landscape: bool = False,
     margin_pt: float = 20.0,
-) -> str:
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    profile: str = DEFAULT_PROFILE,
+) -> "fitz.Document":
+    """将图片片段逐页排版为内存 PDF 文档（由调用方保存并关闭）。"""
+    profile = normalize_profile(profile)
     doc = fitz.open()
     pw, ph = _page_size(paper_name, landscape)
     avail_w = max(0.0, pw - margin_pt * 2)
@@ -120,14 +121,27 @@ def compose_pdf_from_segments(
 
         page = doc.new_page(width=pw, height=ph)
 
-        buf = io.BytesIO()
-        seg.save(buf, format="PNG")
-        stream = buf.getvalue()
+        stream = encode_image(seg, "PNG", profile=profile)
         rect = fitz.Rect(x, y, x + draw_w, y + draw_h)
         page.insert_image(rect, stream=stream)
 
-    doc.save(output_path)
-    doc.close()
+    return doc
+
+
+def compose_pdf_from_segments(
+    segments: List[Image.Image],
+    output_path: str,
+    paper_name: str = "A4",
+    landscape: bool = False,
+    margin_pt: float = 20.0,
+    profile: str = DEFAULT_PROFILE,
+) -> str:
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    doc = compose_document_from_segments(segments, paper_name, landscape, margin_pt, profile)
+    try:
+        doc.save(output_path)
+    finally:
+        doc.close()
     return output_path
 
 
@@ -144,6 +158,7 @@ class _GenerateWorker(QThread):
         paper_name: str,
         landscape: bool,
         margin_pt: int,
+        profile: str = DEFAULT_PROFILE,
         parent: Optional[QWidget] = None,
     ):
         super().__init__(parent)
@@ -153,6 +168,7 @@ class _GenerateWorker(QThread):
         self.paper_name = paper_name
         self.landscape = landscape
         self.margin_pt = margin_pt
+        self.profile = profile
 
     def run(self):
         try:
@@ -191,9 +207,7 @@ class _GenerateWorker(QThread):
                 y = self.margin_pt
                 page = doc.new_page(width=pw, height=ph)
 
-                buf = io.BytesIO()
-                seg.save(buf, format="PNG")
-                stream = buf.getvalue()
+                stream = encode_image(seg, "PNG", profile=self.profile)
                 rect = fitz.Rect(x, y, x + draw_w, y + draw_h)
                 page.insert_image(rect, stream=stream)
 
@@ -221,6 +235,7 @@ class _GenerateImagesWorker(QThread):
         margin_pt: int,
         segment_height_px: int,
         do_split: bool,
+        profile: str = DEFAULT_PROFILE,
         parent: Optional[QWidget] = None,
     ):
         super().__init__(parent)
@@ -231,6 +246,7 @@ class _GenerateImagesWorker(QThread):
         self.margin_pt = margin_pt
         self.segment_height_px = segment_height_px
         self.do_split = do_split
+        self.profile = profile
 
     def run(self):
         try:
@@ -272,9 +288,7 @@ class _GenerateImagesWorker(QThread):
                     x = (pw - draw_w) / 2.0
                     y = self.margin_pt
                     page = doc.new_page(width=pw, height=ph)
-                    buf = io.BytesIO()
-                    seg.save(buf, format="PNG")
-                    stream = buf.getvalue()
+                    stream = encode_image(seg, "PNG", profile=self.profile)
                     rect = fitz.Rect(x, y, x + draw_w, y + draw_h)
                     page.insert_image(rect, stream=stream)
                     self.progress.emit(int(i * 100 / total_pages))
@@ -295,9 +309,7 @@ class _GenerateImagesWorker(QThread):
                     x = (pw - draw_w) / 2.0
                     y = self.margin_pt
                     page = doc.new_page(width=pw, height=ph)
-                    buf = io.BytesIO()
-                    im.save(buf, format="PNG")
-                    stream = buf.getvalue()
+                    stream = encode_image(im, "PNG", profile=self.profile)
                     rect = fitz.Rect(x, y, x + draw_w, y + draw_h)
                     page.insert_image(rect, stream=stream)
                     self.progress.emit(int(i * 100 / total))
@@ -334,7 +346,7 @@ class Img2PDFWindow(QWidget):
         self.current_index: int = 0
         self.mode: str = "single_long"
 
-        self.setStyleSheet(build_style(self.scale))
+        apply_style(self, self.scale)
         self._build_ui()
 
     def _build_ui(self):
@@ -477,8 +489,15 @@ class Img2PDFWindow(QWidget):
         self.spin_margin.setRange(0, 100)
         self.spin_margin.setValue(20)
         self.spin_margin.valueChanged.connect(self._update_preview)
+        lab_profile = QLabel("编码档位")
+        self.combo_profile = QComboBox(); self.combo_profile.setMinimumHeight(dp(self.scale, 32))
+        for name in PROFILE_NAMES:
+            self.combo_profile.addItem(PROFILE_LABELS[name], name)
+        self.combo_profile.setCurrentIndex(PROFILE_NAMES.index(DEFAULT_PROFILE))
         self.row_margin.addWidget(lab_margin)
         self.row_margin.addWidget(self.spin_margin)
+        self.row_margin.addWidget(lab_profile)
+        self.row_margin.addWidget(self.combo_profile)
         ctrl.addLayout(self.row_margin)
 
         # 页预览列表（可点选跳转）
@@ -658,7 +677,10 @@ class Img2PDFWindow(QWidget):
 
     def _apply_responsive_sizes(self):
         try:
-            f = self._calc_size_factor()
+            # 尺寸因子按档位量化；缩放与档位均未变化时跳过控件尺寸重算
+            f = factor_bucket(self._calc_size_factor())
+            if not size_bucket_changed(self, self.scale, f):
+                return
             def H(base: int) -> int:
                 return int(dp(self.scale, base) * f)
             def ensure_h(w, base: int, extra: int = 10):
@@ -679,6 +701,7 @@ class Img2PDFWindow(QWidget):
             ensure_h(self.combo_paper, 32)
             ensure_h(self.chk_land, 28, extra=6)
             ensure_h(self.spin_margin, 32)
+            ensure_h(self.combo_profile, 32)
             ensure_h(self.btn_gen, 32)
             ensure_h(self.progress, 24, extra=6)
             ensure_h(self.combo_mode, 32)
@@ -730,12 +753,24 @@ class Img2PDFWindow(QWidget):
                 "图片文件 (*.png *.jpg *.jpeg *.bmp *.webp);;所有文件 (*.*)",
             )
             if path:
-                self.image_path = path
-                self.path_edit.setText(path)
-                base = os.path.splitext(os.path.basename(path))[0]
-                out_dir = os.path.dirname(path) or "."
-                self.out_edit.setText(os.path.join(out_dir, f"{base}_converted.pdf"))
-                self._refresh_segments()
+                self._open_single_image(path)
+
+    def open_files(self, paths: List[str]) -> None:
+        """外部打开文件（命令行参数或单实例转发）：一张图按长图切分，多张图进入多图合并。"""
+        if len(paths) == 1:
+            self.combo_mode.setCurrentText("长图裁剪")
+            self._open_single_image(paths[0])
+        elif paths:
+            self.combo_mode.setCurrentText("批量裁剪拼接")
+            self._add_image_paths(paths)
+
+    def _open_single_image(self, path: str) -> None:
+        self.image_path = path
+        self.path_edit.setText(path)
+        base = os.path.splitext(os.path.basename(path))[0]
+        out_dir = os.path.dirname(path) or "."
+        self.out_edit.setText(os.path.join(out_dir, f"{base}_converted.pdf"))
+        self._refresh_segments()
 
     def _choose_images(self):
         paths, _ = QFileDialog.getOpenFileNames(
@@ -896,15 +931,8 @@ class Img2PDFWindow(QWidget):
 
     def resizeEvent(self, event):
         super().resizeEvent(event)
-        # 窗口变化时刷新预览，以保持在可视容器内的自适配
-        try:
-            self._update_preview()
-            # 同步执行自适应重排，避免横向拥挤
-            self._reflow_layout()
-            # 根据 scale 与窗口尺寸自动调整控件高度
-            self._apply_responsive_sizes()
-        except Exception:
-            pass
+        # 窗口变化时刷新预览、自适应重排与控件高度；同一帧内的多次 resize 合并为一次
+        schedule_reflow(self, "_update_preview", "_reflow_layout", "_apply_responsive_sizes")
 
     def _on_mode_changed(self, text: str):
         self.mode = "multi_images" if (text or "") != "长图裁剪" else "single_long"
@@ -975,6 +1003,7 @@ class Img2PDFWindow(QWidget):
                 margin_pt=margin,
                 segment_height_px=int(self.spin_h.value()),
                 do_split=bool(self.chk_batch_split.isChecked()),
+                profile=self.combo_profile.currentData() or DEFAULT_PROFILE,
             )
             self._worker.progress.connect(self.progress.setValue)
             self._worker.finished.connect(self._on_generate_ok)
@@ -1003,6 +1032,7 @@ class Img2PDFWindow(QWidget):
                 paper_name=paper,
                 landscape=land,
                 margin_pt=margin,
+                profile=self.combo_profile.currentData() or DEFAULT_PROFILE,
             )
             self._worker.progress.connect(self.progress.setValue)
             self._worker.finished.connect(self._on_generate_ok)
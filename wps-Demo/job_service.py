@@ -0,0 +1,472 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+PDF 工具集 HTTP 任务服务（FastAPI，不依赖 Qt 界面）
+
+用法：
+    python job_service.py --host 0.0.0.0 --port 8800 --workers 4 --allow-root D:/共享/扫描件
+
+接口：
+    POST   /jobs                 提交任务（multipart：operation、options(JSON)、files 上传，或 paths(JSON) 服务器端路径）
+    GET    /jobs/{id}            任务状态
+    GET    /jobs/{id}/events     进度（SSE：progress / done / failed 事件）
+    GET    /jobs/{id}/result     下载结果（单个文件直接下载，多个文件边打包边传输 ZIP）
+    DELETE /jobs/{id}            取消排队中的任务或清理已结束任务
+    GET    /health               队列概况
+
+- 任务在进程池中执行；排队+执行中的任务数超过上限时返回 429（准入控制），上传超过大小上限返回 413
+- 服务器端路径仅允许位于 --allow-root 指定的目录下；未指定时只接受上传
+- 子进程通过 Manager 队列回传进度，SSE 推送给客户端
+- 任务文件保存在工作目录下，结束 job_ttl 秒后自动清理
+
+依赖：pip install fastapi uvicorn python-multipart
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import shutil
+import asyncio
+import zipfile
+import argparse
+import tempfile
+import threading
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Dict, Iterator, List, Optional
+
+from fastapi import FastAPI, File, Form, HTTPException, UploadFile
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
+
+DEFAULT_WORKERS = max(1, (os.cpu_count() or 2) // 2)
+DEFAULT_MAX_QUEUED = 16
+DEFAULT_MAX_UPLOAD_MB = 512
+DEFAULT_JOB_TTL = 3600
+UPLOAD_CHUNK = 1024 * 1024
+ZIP_CHUNK = 1024 * 1024
+SSE_POLL_SECONDS = 0.2
+SSE_KEEPALIVE_SECONDS = 15
+
+# 操作名 -> 允许客户端传入的参数；输出路径类参数由服务端决定，不在白名单内。
+# merge 将全部输入合并为一个文件，其余操作对每个输入分别处理
+OPERATIONS: Dict[str, set] = {
+    "merge": {"keep_toc", "keep_metadata", "output_name"},
+    "split": {"split_points"},
+    "shrink": {"zoom", "target_height_px", "jpeg_quality", "grayscale", "profile", "dedupe", "perceptual_threshold"},
+    "imagepdf": {"zoom", "target_height_px", "dedupe", "perceptual_threshold"},
+    "images": {"output_format", "zoom", "quality", "target_height_px", "prefix", "profile"},
+    "oneimage": {"output_format", "zoom", "target_width_px", "profile"},
+}
+
+
+# ----------------- 子进程中执行的任务 -----------------
+def run_job(job_id: str, operation: str, inputs: List[str], out_dir: str, options: dict, progress_q) -> List[str]:
+    """在进程池中执行；进度以 (job_id, pct, msg) 写入 progress_q。"""
+
+    def report(base: float, span: float):
+        def cb(pct, msg):
+            try:
+                progress_q.put((job_id, base + float(pct) * span / 100.0, str(msg)))
+            except Exception:
+                pass
+        return cb
+
+    os.makedirs(out_dir, exist_ok=True)
+    if operation == "merge":
+        from pdf_merge import merge_pdfs
+        name = os.path.basename(options.pop("output_name", "") or "merged.pdf")
+        return [merge_pdfs(inputs, os.path.join(out_dir, name), report(0, 100), **options)]
+
+    outputs: List[str] = []
+    n = len(inputs)
+    for k, src in enumerate(inputs):
+        cb = report(k * 100.0 / n, 100.0 / n)
+        stem = os.path.splitext(os.path.basename(src))[0]
+        if operation == "split":
+            from pdf_split import split_pdf
+            cb(0, f"拆分 {os.path.basename(src)}")
+            outputs.extend(split_pdf(src, options.get("split_points") or [], out_dir))
+            cb(100, f"已拆分 {os.path.basename(src)}")
+        elif operation == "shrink":
+            from pdf_shrink import shrink_pdf_to_image_pdf
+            outputs.append(shrink_pdf_to_image_pdf(src, os.path.join(out_dir, f"{stem}_shrink.pdf"), progress_cb=cb, **options))
+        elif operation == "imagepdf":
+            from pdf2imagepdf import convert_pdf_to_image_only_pdf
+            outputs.append(convert_pdf_to_image_only_pdf(src, os.path.join(out_dir, f"{stem}_image.pdf"),
+                                                         progress_cb=cb, **options))
+        elif operation == "images":
+            from pdf2images import convert_pdf_to_images
+            folder = convert_pdf_to_images(src, output_dir=os.path.join(out_dir, stem), progress_cb=cb,
+                                           resume=False, **options)
+            outputs.extend(os.path.join(folder, f) for f in sorted(os.listdir(folder)))
+        elif operation == "oneimage":
+            from pdf2oneimage import convert_pdf_to_single_image
+            fmt = str(options.get("output_format", "PNG")).upper()
+            ext = "jpg" if fmt in ("JPEG", "JPG") else "png"
+            outputs.append(convert_pdf_to_single_image(src, os.path.join(out_dir, f"{stem}.{ext}"), progress_cb=cb, **options))
+        else:
+            raise ValueError(f"不支持的操作: {operation}")
+    return outputs
+
+
+# ----------------- 任务状态 -----------------
+class Job:
+    def __init__(self, job_id: str, operation: str, root: str):
+        self.id = job_id
+        self.operation = operation
+        self.root = root
+        self.status = "queued"  # queued / running / done / failed / cancelled
+        self.progress = 0.0
+        self.message = ""
+        self.outputs: List[str] = []
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.version = 0
+        self.future: Optional[Future] = None
+
+    @property
+    def active(self) -> bool:
+        return self.status in ("queued", "running")
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "operation": self.operation,
+            "status": self.status,
+            "progress": round(self.progress, 1),
+            "message": self.message,
+            "outputs": [os.path.relpath(p, os.path.join(self.root, "out")) for p in self.outputs],
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobManager:
+    def __init__(self, work_root: str, workers: int = DEFAULT_WORKERS, max_queued: int = DEFAULT_MAX_QUEUED,
+                 job_ttl: float = DEFAULT_JOB_TTL):
+        self.work_root = os.path.abspath(work_root)
+        self.workers = max(1, int(workers))
+        # 排队与执行中的任务总数上限
+        self.max_active = self.workers + max(0, int(max_queued))
+        self.job_ttl = float(job_ttl)
+        self.jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._manager = multiprocessing.Manager()
+        self._progress_q = self._manager.Queue()
+        self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        self._stop = threading.Event()
+        os.makedirs(self.work_root, exist_ok=True)
+        threading.Thread(target=self._drain_progress, name="job-progress", daemon=True).start()
+        threading.Thread(target=self._janitor, name="job-janitor", daemon=True).start()
+
+    def active_count(self) -> int:
+        with self._lock:
+            return sum(1 for j in self.jobs.values() if j.active)
+
+    def create(self, operation: str) -> Job:
+        with self._lock:
+            if sum(1 for j in self.jobs.values() if j.active) >= self.max_active:
+                raise HTTPException(status_code=429, detail="任务队列已满，请稍后重试", headers={"Retry-After": "10"})
+            job_id = uuid.uuid4().hex
+            root = os.path.join(self.work_root, job_id)
+            os.makedirs(os.path.join(root, "in"), exist_ok=True)
+            job = Job(job_id, operation, root)
+            self.jobs[job_id] = job
+            return job
+
+    def submit(self, job: Job, inputs: List[str], options: dict) -> None:
+        fut = self._pool.submit(run_job, job.id, job.operation, inputs, os.path.join(job.root, "out"),
+                                options, self._progress_q)
+        job.future = fut
+        fut.add_done_callback(lambda f, j=job: self._on_done(j, f))
+
+    def discard(self, job: Job) -> None:
+        with self._lock:
+            self.jobs.pop(job.id, None)
+        shutil.rmtree(job.root, ignore_errors=True)
+
+    def _on_done(self, job: Job, fut: Future) -> None:
+        with self._lock:
+            if fut.cancelled():
+                job.status = "cancelled"
+            elif fut.exception() is not None:
+                job.status = "failed"
+                job.error = str(fut.exception())
+            else:
+                job.status = "done"
+                job.progress = 100.0
+                job.outputs = list(fut.result())
+            job.finished_at = time.time()
+            job.version += 1
+
+    def _drain_progress(self) -> None:
+        while not self._stop.is_set():
+            try:
+                job_id, pct, msg = self._progress_q.get(timeout=0.5)
+            except Exception:
+                continue
+            with self._lock:
+                job = self.jobs.get(job_id)
+                if job is None or not job.active:
+                    continue
+                job.status = "running"
+                job.progress = max(job.progress, min(100.0, pct))
+                job.message = msg
+                job.version += 1
+
+    def _janitor(self) -> None:
+        while not self._stop.wait(60):
+            now = time.time()
+            with self._lock:
+                expired = [j for j in self.jobs.values() if j.finished_at and now - j.finished_at > self.job_ttl]
+                for j in expired:
+                    self.jobs.pop(j.id, None)
+            for j in expired:
+                shutil.rmtree(j.root, ignore_errors=True)
+
+    def shutdown(self) -> None:
+        self._stop.set()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        try:
+            self._manager.shutdown()
+        except Exception:
+            pass
+
+
+# ----------------- 流式 ZIP -----------------
+class _ChunkSink:
+    """zipfile 的只写目标：写入的数据暂存，由生成器取走后发送（不可 seek，zipfile 会使用数据描述符）。"""
+
+    def __init__(self):
+        self._buf = bytearray()
+        self._pos = 0
+
+    def write(self, b) -> int:
+        self._buf += b
+        self._pos += len(b)
+        return len(b)
+
+    def tell(self) -> int:
+        return self._pos
+
+    def flush(self) -> None:
+        pass
+
+    def pending(self) -> int:
+        return len(self._buf)
+
+    def take(self) -> bytes:
+        data = bytes(self._buf)
+        self._buf.clear()
+        return data
+
+
+def stream_zip(files: List[str], base_dir: str) -> Iterator[bytes]:
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_STORED, allowZip64=True) as zf:
+        for path in files:
+            arcname = os.path.relpath(path, base_dir)
+            with open(path, "rb") as src, zf.open(arcname, "w", force_zip64=True) as dst:
+                while True:
+                    chunk = src.read(ZIP_CHUNK)
+                    if not chunk:
+                        break
+                    dst.write(chunk)
+                    if sink.pending() >= ZIP_CHUNK:
+                        yield sink.take()
+            yield sink.take()
+    # 中央目录在关闭时写入
+    tail = sink.take()
+    if tail:
+        yield tail
+
+
+# ----------------- HTTP 接口 -----------------
+def _resolve_server_path(path: str, allowed_roots: List[str]) -> str:
+    real = os.path.realpath(path)
+    for root in allowed_roots:
+        r = os.path.realpath(root)
+        try:
+            if os.path.commonpath([real, r]) == r:
+                if not os.path.isfile(real):
+                    raise HTTPException(status_code=404, detail=f"文件不存在: {path}")
+                return real
+        except ValueError:
+            continue  # 不同盘符
+    raise HTTPException(status_code=403, detail=f"路径不在允许的目录内: {path}")
+
+
+def create_app(work_root: Optional[str] = None, workers: int = DEFAULT_WORKERS, max_queued: int = DEFAULT_MAX_QUEUED,
+               max_upload_mb: int = DEFAULT_MAX_UPLOAD_MB, allowed_roots: Optional[List[str]] = None,
+               job_ttl: float = DEFAULT_JOB_TTL) -> FastAPI:
+    state: Dict[str, JobManager] = {}
+
+    @asynccontextmanager
+    async def lifespan(_app: FastAPI):
+        yield
+        if "jobs" in state:
+            state["jobs"].shutdown()
+
+    app = FastAPI(title="LZ-PDF 任务服务", lifespan=lifespan)
+    max_upload = int(max_upload_mb) * 1024 * 1024
+    roots = [os.path.abspath(r) for r in (allowed_roots or [])]
+
+    def manager() -> JobManager:
+        # 延迟创建进程池：uvicorn 多进程/重载时只在实际处理请求的进程中创建
+        if "jobs" not in state:
+            state["jobs"] = JobManager(work_root or os.path.join(tempfile.gettempdir(), "lz_pdf_jobs"),
+                                       workers, max_queued, job_ttl)
+        return state["jobs"]
+
+    def get_job(job_id: str) -> Job:
+        job = manager().jobs.get(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="任务不存在")
+        return job
+
+    @app.get("/health")
+    def health():
+        m = manager()
+        return {"workers": m.workers, "active": m.active_count(), "max_active": m.max_active}
+
+    @app.post("/jobs", status_code=202)
+    async def create_job(
+        operation: str = Form(...),
+        options: str = Form("{}"),
+        paths: str = Form("[]"),
+        files: List[UploadFile] = File(default=[]),
+    ):
+        if operation not in OPERATIONS:
+            raise HTTPException(status_code=400, detail=f"不支持的操作: {operation}，仅支持: {', '.join(OPERATIONS)}")
+        allowed = OPERATIONS[operation]
+        try:
+            opts = json.loads(options or "{}")
+            server_paths = json.loads(paths or "[]")
+        except ValueError:
+            raise HTTPException(status_code=400, detail="options / paths 必须是 JSON")
+        if not isinstance(opts, dict) or not isinstance(server_paths, list):
+            raise HTTPException(status_code=400, detail="options 应为对象，paths 应为数组")
+        unknown = set(opts) - allowed
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"不支持的参数: {', '.join(sorted(unknown))}")
+        if server_paths and not roots:
+            raise HTTPException(status_code=403, detail="服务未开放服务器端路径，请上传文件")
+
+        inputs = [_resolve_server_path(str(p), roots) for p in server_paths]
+        m = manager()
+        job = m.create(operation)
+        try:
+            total = 0
+            for k, up in enumerate(files):
+                name = os.path.basename(up.filename or f"upload_{k}.pdf") or f"upload_{k}.pdf"
+                dst = os.path.join(job.root, "in", f"{k:03d}_{name}")
+                with open(dst, "wb") as f:
+                    while True:
+                        chunk = await up.read(UPLOAD_CHUNK)
+                        if not chunk:
+                            break
+                        total += len(chunk)
+                        if total > max_upload:
+                            raise HTTPException(status_code=413, detail=f"上传文件超过 {max_upload_mb} MB")
+                        f.write(chunk)
+                inputs.append(dst)
+            if not inputs:
+                raise HTTPException(status_code=400, detail="请上传文件或提供 paths")
+            if operation == "merge" and len(inputs) < 2:
+                raise HTTPException(status_code=400, detail="合并至少需要两个 PDF")
+            m.submit(job, inputs, opts)
+        except BaseException:
+            m.discard(job)
+            raise
+        return {
+            "id": job.id,
+            "status_url": f"/jobs/{job.id}",
+            "events_url": f"/jobs/{job.id}/events",
+            "result_url": f"/jobs/{job.id}/result",
+        }
+
+    @app.get("/jobs/{job_id}")
+    def job_status(job_id: str):
+        return get_job(job_id).to_dict()
+
+    @app.get("/jobs/{job_id}/events")
+    async def job_events(job_id: str):
+        job = get_job(job_id)
+
+        async def gen():
+            seen = -1
+            last_sent = time.time()
+            while True:
+                if job.version != seen:
+                    seen = job.version
+                    data = json.dumps(job.to_dict(), ensure_ascii=False)
+                    event = job.status if not job.active else "progress"
+                    yield f"event: {event}\ndata: {data}\n\n"
+                    last_sent = time.time()
+                    if not job.active:
+                        return
+                elif time.time() - last_sent >= SSE_KEEPALIVE_SECONDS:
+                    # 注释行保持连接，防止代理超时断开
+                    yield ": keep-alive\n\n"
+                    last_sent = time.time()
+                await asyncio.sleep(SSE_POLL_SECONDS)
+
+        return StreamingResponse(gen(), media_type="text/event-stream",
+                                 headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+    @app.get("/jobs/{job_id}/result")
+    def job_result(job_id: str):
+        job = get_job(job_id)
+        if job.status != "done":
+            raise HTTPException(status_code=409, detail=f"任务尚未完成（{job.status}）")
+        files = [p for p in job.outputs if os.path.isfile(p)]
+        if not files:
+            raise HTTPException(status_code=410, detail="结果文件已清理")
+        if len(files) == 1:
+            return FileResponse(files[0], filename=os.path.basename(files[0]))
+        headers = {"Content-Disposition": f'attachment; filename="{job.operation}_{job.id[:8]}.zip"'}
+        return StreamingResponse(stream_zip(files, os.path.join(job.root, "out")), media_type="application/zip",
+                                 headers=headers)
+
+    @app.delete("/jobs/{job_id}")
+    def delete_job(job_id: str):
+        job = get_job(job_id)
+        if job.status == "running":
+            raise HTTPException(status_code=409, detail="任务正在执行，无法取消")
+        if job.status == "queued" and job.future is not None and not job.future.cancel():
+            raise HTTPException(status_code=409, detail="任务已开始执行，无法取消")
+        manager().discard(job)
+        return JSONResponse({"id": job_id, "deleted": True})
+
+    return app
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="PDF 工具集 HTTP 任务服务")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8800)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="转换进程数")
+    parser.add_argument("--max-queued", type=int, default=DEFAULT_MAX_QUEUED, help="除执行中外最多排队的任务数")
+    parser.add_argument("--max-upload-mb", type=int, default=DEFAULT_MAX_UPLOAD_MB)
+    parser.add_argument("--allow-root", action="append", default=[], help="允许提交的服务器端路径根目录，可多次指定")
+    parser.add_argument("--work-root", default="", help="任务文件目录，默认系统临时目录")
+    parser.add_argument("--job-ttl", type=float, default=DEFAULT_JOB_TTL, help="任务结束后保留结果的秒数")
+    args = parser.parse_args(argv)
+
+    import uvicorn
+
+    app = create_app(args.work_root or None, args.workers, args.max_queued, args.max_upload_mb, args.allow_root,
+                     args.job_ttl)
+    uvicorn.run(app, host=args.host, port=args.port)
+    return 0
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
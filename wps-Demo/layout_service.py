@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+共享的响应式布局调度（所有工具窗口共用）
+
+- resizeEvent / 缩放滑杆只登记“需要重排”，同一帧内的多次请求合并为一次
+- 尺寸因子按档位（bucket）量化，档位未变化时跳过控件最小尺寸的重新计算
+"""
+
+import weakref
+from typing import Callable, Dict, List, Optional, Tuple
+
+from PySide6.QtCore import QObject, QTimer
+
+try:
+    import shiboken6
+except Exception:
+    shiboken6 = None
+
+# 约 60 FPS：一帧内的 resize 突发只触发一次重排
+FRAME_MS = 16
+# 尺寸因子量化步长
+FACTOR_STEP = 0.05
+
+DEFAULT_METHODS: Tuple[str, ...] = ("_reflow_layout", "_apply_responsive_sizes")
+
+
+def factor_bucket(f: float, step: float = FACTOR_STEP) -> float:
+    return round(round(float(f) / step) * step, 4)
+
+
+def _alive(obj) -> bool:
+    if obj is None:
+        return False
+    if shiboken6 is not None and hasattr(shiboken6, "isValid"):
+        try:
+            return shiboken6.isValid(obj)
+        except Exception:
+            return False
+    return True
+
+
+class LayoutService(QObject):
+    def __init__(self, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(FRAME_MS)
+        self._timer.timeout.connect(self._flush)
+        # id(owner) -> (弱引用, 待调用方法名列表)，保持登记顺序
+        self._pending: Dict[int, Tuple[Callable[[], object], List[str]]] = {}
+        self._buckets: "weakref.WeakKeyDictionary[object, tuple]" = weakref.WeakKeyDictionary()
+
+    def schedule(self, owner, *methods: str) -> None:
+        """登记 owner 在下一帧需要调用的方法（默认：重排 + 自适应尺寸），重复登记会被合并。"""
+        names = list(methods or DEFAULT_METHODS)
+        key = id(owner)
+        entry = self._pending.get(key)
+        if entry is None:
+            try:
+                ref = weakref.ref(owner)
+            except TypeError:
+                ref = lambda o=owner: o
+            self._pending[key] = (ref, names)
+        else:
+            for n in names:
+                if n not in entry[1]:
+                    entry[1].append(n)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def bucket_changed(self, owner, *key) -> bool:
+        """记录 owner 的当前档位；与上次相同返回 False（调用方可跳过重算）。"""
+        try:
+            if self._buckets.get(owner) == key:
+                return False
+            self._buckets[owner] = key
+        except TypeError:
+            pass
+        return True
+
+    def _flush(self) -> None:
+        pending = self._pending
+        self._pending = {}
+        for ref, names in pending.values():
+            owner = ref()
+            if not _alive(owner):
+                continue
+            for n in names:
+                fn = getattr(owner, n, None)
+                if fn is None:
+                    continue
+                try:
+                    fn()
+                except Exception:
+                    pass
+
+
+_SERVICE: Optional[LayoutService] = None
+
+
+def layout_service() -> LayoutService:
+    global _SERVICE
+    if _SERVICE is None or not _alive(_SERVICE):
+        _SERVICE = LayoutService()
+    return _SERVICE
+
+
+def schedule_reflow(owner, *methods: str) -> None:
+    layout_service().schedule(owner, *methods)
+
+
+def size_bucket_changed(owner, *key) -> bool:
+    return layout_service().bucket_changed(owner, *key)
@@ -1,8 +1,20 @@
 import sys
 import os
+import time
 import argparse
+import importlib
+import multiprocessing
 from typing import Optional
 
+# 启动计时基准（尽量早记录，用于首帧耗时报告）
+_T0 = time.perf_counter()
+_STARTUP_MARKS: list[tuple[str, float]] = []
+
+
+def _startup_mark(stage: str) -> None:
+    _STARTUP_MARKS.append((stage, time.perf_counter() - _T0))
+
+
 from PySide6.QtWidgets import (
     QApplication,
     QWidget,
@@ -23,17 +35,41 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import Qt, QSize, QEvent, QTimer, QThread, Signal
 
-from ui_style_nb import build_style, compute_scale, apply_base_font, dp
-from pdf_split import PDFSplitWindow
-from pdf2images import PdfToImagesWindow
-from pdf2oneimage import PdfToOneImageWindow
-from pdf2imagepdf import PdfToImagePDFWindow
-from pdf_shrink import PDFShrinkWindow
-from pdf2docx import PDF2DOCXWindow
-from pdf_merge import PDFMergeWindow
-from img2pdf import Img2PDFWindow
-from png2excel import Png2ExcelWindow
+from ui_style_nb import apply_style, compute_scale, apply_base_font, dp
+from layout_service import schedule_reflow
 import fc
+
+_startup_mark("基础模块导入")
+
+# 功能页注册表：(键, 菜单名, 模块名, 类名)
+# 各功能模块依赖较重（fitz/PIL/cv2/numpy/OCR），仅在首次选中时才导入并构建
+PAGE_SPECS: tuple[tuple[str, str, str, str], ...] = (
+    ("merge", "PDF合并", "pdf_merge", "PDFMergeWindow"),
+    ("split", "PDF拆分", "pdf_split", "PDFSplitWindow"),
+    ("images", "PDF转图片", "pdf2images", "PdfToImagesWindow"),
+    ("oneimage", "PDF转一张图片", "pdf2oneimage", "PdfToOneImageWindow"),
+    ("imagepdf", "PDF转纯图PDF", "pdf2imagepdf", "PdfToImagePDFWindow"),
+    ("shrink", "PDF瘦身", "pdf_shrink", "PDFShrinkWindow"),
+    ("img2pdf", "图片转PDF", "img2pdf", "Img2PDFWindow"),
+    ("docx", "PDF转DOCX", "pdf2docx", "PDF2DOCXWindow"),
+    ("png2excel", "图片转Excel", "png2excel", "Png2ExcelWindow"),
+)
+PAGE_KEYS = tuple(spec[0] for spec in PAGE_SPECS)
+IMAGE_EXTS = (".png", ".jpg", ".jpeg", ".bmp", ".webp")
+# 只接受图片的功能页；其余功能页接受 PDF
+IMAGE_PAGES = ("img2pdf", "png2excel")
+
+
+def _default_tool(files: list[str], current: str = "") -> str:
+    """未指定功能时按文件类型选择：多个 PDF 合并，图片转 PDF，单个 PDF 优先留在当前的单文件 PDF 功能页。"""
+    if files and all(f.lower().endswith(IMAGE_EXTS) for f in files):
+        return current if current in IMAGE_PAGES else "img2pdf"
+    if len(files) > 1:
+        return "merge"
+    if current and current not in IMAGE_PAGES and current != "merge":
+        return current
+    return "split"
+
 # 尝试可选的系统通知支持（不存在时静默忽略）
 # 资源路径解析（dev 与打包均可用）：
 def _resource_path(rel: str) -> str:
@@ -51,20 +87,11 @@ def _resource_path(rel: str) -> str:
     except Exception:
         return rel
 
-# 启动时确保资源目录从内嵌资源复制到 exe 同目录
+# 启动时确保资源目录从内嵌资源释放到 exe 同目录（后台进行，不阻塞窗口显示）
 def _ensure_resource_dir(dir_name: str) -> None:
     try:
-        base = os.path.dirname(sys.executable) if getattr(sys, "frozen", False) else os.getcwd()
-        dst = os.path.join(base, dir_name)
-        if os.path.isdir(dst):
-            return
-        meipass = getattr(sys, "_MEIPASS", None)
-        if meipass:
-            src = os.path.join(meipass, dir_name)
-            if os.path.isdir(src):
-                import shutil
-                shutil.copytree(src, dst, dirs_exist_ok=True)
-                print(f"已从资源复制 {dir_name} 到：{dst}")
+        from resource_provision import start_provision
+        start_provision(dir_name)
     except Exception as e:
         print(f"自动创建资源目录失败：{dir_name}: {e}")
 
@@ -83,7 +110,8 @@ class SplashThread(QThread):
         self.request.emit(self._image, self._url)
 
 class MainWindow(QWidget):
-    def __init__(self, scale: Optional[float] = None):
+    def __init__(self, scale: Optional[float] = None, eager_pages: bool = False,
+                 startup_report: bool = False):
         super().__init__()
         self.setWindowTitle("PDF工具集")
         # 无边框主窗口
@@ -91,8 +119,14 @@ class MainWindow(QWidget):
         self.setWindowFlags(Qt.FramelessWindowHint | Qt.Window)
         self.scale = scale if scale is not None else compute_scale(QApplication.instance())
         self.scale = self.scale * 0.55
+        # 已构建的功能页（键 -> 页面），未选中的页面仅以占位控件存在
+        self._pages: dict[str, QWidget] = {}
+        self._preload_queue: list[str] = []
+        self._eager_pages = eager_pages
+        self._startup_report = startup_report
+        self._first_paint_done = False
         self._build_ui()
-        self.setStyleSheet(build_style(self.scale))
+        apply_style(self, self.scale)
 
         # 简单拖动支持（无系统边框时）
         self._drag_pos: Optional[object] = None
@@ -150,13 +184,22 @@ class MainWindow(QWidget):
         row.addWidget(self.scale_slider, 1)
         row.addWidget(self.scale_spin)
         scale_layout.addLayout(row)
+
+        # 渲染内存预算占用（各功能页的转换共用同一预算）
+        self.mem_label = QLabel()
+        scale_layout.addWidget(self.mem_label)
+        self._mem_timer = QTimer(self)
+        self._mem_timer.setInterval(1000)
+        self._mem_timer.timeout.connect(self._update_memory_usage)
+        self._mem_timer.start()
+        self._update_memory_usage()
         left_layout.addWidget(self.scale_card)
 
         # 菜单列表（居中显示）
         self.sidebar = QListWidget()
         self.sidebar.setFixedWidth(dp(self.scale, 160))
         self.sidebar.setUniformItemSizes(True)
-        for name in ("PDF合并", "PDF拆分", "PDF转图片", "PDF转一张图片", "PDF转纯图PDF", "PDF瘦身", "图片转PDF", "PDF转DOCX", "图片转Excel"):
+        for _key, name, _mod, _cls in PAGE_SPECS:
             item = QListWidgetItem(name)
             item.setTextAlignment(Qt.AlignCenter)
             self.sidebar.addItem(item)
@@ -180,54 +223,10 @@ class MainWindow(QWidget):
         self.stack = QStackedWidget()
         self.stack.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
 
-        # 创建各功能页面并作为子部件嵌入
-        self.page_merge = PDFMergeWindow(scale=self.scale, embedded=True)
-        self.page_merge.setWindowFlags(Qt.Widget)
-        self.page_merge.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-
-        self.page_split = PDFSplitWindow(scale=self.scale, embedded=True)
-        self.page_split.setWindowFlags(Qt.Widget)
-        self.page_split.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-
-        self.page_images = PdfToImagesWindow(scale=self.scale, embedded=True)
-        self.page_images.setWindowFlags(Qt.Widget)
-        self.page_images.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-
-        self.page_oneimage = PdfToOneImageWindow(scale=self.scale, embedded=True)
-        self.page_oneimage.setWindowFlags(Qt.Widget)
-        self.page_oneimage.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-
-        self.page_imagepdf = PdfToImagePDFWindow(scale=self.scale, embedded=True)
-        self.page_imagepdf.setWindowFlags(Qt.Widget)
-        self.page_imagepdf.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-
-        # PDF 瘦身页：将 PDF 转为压缩的纯图 PDF
-        self.page_shrink = PDFShrinkWindow(scale=self.scale, embedded=True)
-        self.page_shrink.setWindowFlags(Qt.Widget)
-        self.page_shrink.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-
-        self.page_img2pdf = Img2PDFWindow(scale=self.scale, embedded=True)
-        self.page_img2pdf.setWindowFlags(Qt.Widget)
-        self.page_img2pdf.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-
-        self.page_docx = PDF2DOCXWindow(scale=self.scale, embedded=True)
-        self.page_docx.setWindowFlags(Qt.Widget)
-        self.page_docx.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-
-        self.page_png2excel = Png2ExcelWindow(scale=self.scale, embedded=True)
-        self.page_png2excel.setWindowFlags(Qt.Widget)
-        self.page_png2excel.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-
-        # 直接将页面加入栈（避免内层滚动嵌套导致滑杆不可拖动）
-        self.stack.addWidget(self.page_merge)
-        self.stack.addWidget(self.page_split)
-        self.stack.addWidget(self.page_images)
-        self.stack.addWidget(self.page_oneimage)
-        self.stack.addWidget(self.page_imagepdf)
-        self.stack.addWidget(self.page_shrink)
-        self.stack.addWidget(self.page_img2pdf)
-        self.stack.addWidget(self.page_docx)
-        self.stack.addWidget(self.page_png2excel)
+        # 先放入轻量占位控件，真正的功能页在首次选中时才导入模块并构建
+        # （直接将页面加入栈，避免内层滚动嵌套导致滑杆不可拖动）
+        for _spec in PAGE_SPECS:
+            self.stack.addWidget(self._make_placeholder())
 
         # 顶部控制：全屏 / 退出全屏
         self.ctrl_bar = QHBoxLayout()
@@ -278,23 +277,106 @@ class MainWindow(QWidget):
         self.scale_slider.valueChanged.connect(self._on_scale_slider)
         self.scale_spin.valueChanged.connect(self._on_scale_spin)
 
+        # 旧版行为：启动时一次性构建全部页面（用于首帧耗时对比）
+        if self._eager_pages:
+            for idx in range(len(PAGE_SPECS)):
+                self._ensure_page(idx)
+
         self.sidebar.currentRowChanged.connect(self._on_sidebar_change)
+        # 仅构建首个页面；内容布局变化的监听在页面构建时安装
         self.sidebar.setCurrentRow(0)
-        # 监听内容布局变化，动态调整窗口尺寸
-        self._install_resize_watch(self.page_merge)
-        self._install_resize_watch(self.page_split)
-        self._install_resize_watch(self.page_images)
-        self._install_resize_watch(self.page_oneimage)
-        self._install_resize_watch(self.page_imagepdf)
-        self._install_resize_watch(self.page_shrink)
-        self._install_resize_watch(self.page_img2pdf)
-        self._install_resize_watch(self.page_docx)
-        self._install_resize_watch(self.page_png2excel)
-        # 移除对内层滚动包裹器的监听，统一监听页面本身
 
         # 初始按当前页内容估算窗口尺寸
         self._resize_to_page(0)
 
+    def _make_placeholder(self) -> QWidget:
+        ph = QFrame()
+        ph.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        return ph
+
+    def _ensure_page(self, index: int) -> Optional[QWidget]:
+        """按需导入并构建指定序号的功能页，已构建时直接返回。"""
+        if index < 0 or index >= len(PAGE_SPECS):
+            return None
+        key, name, mod_name, cls_name = PAGE_SPECS[index]
+        page = self._pages.get(key)
+        if page is not None:
+            return page
+        t0 = time.perf_counter()
+        try:
+            mod = importlib.import_module(mod_name)
+            page_cls = getattr(mod, cls_name)
+            page = page_cls(scale=self.scale, embedded=True)
+        except Exception as e:
+            print(f"功能页加载失败：{name}: {e}")
+            return None
+        page.setWindowFlags(Qt.Widget)
+        page.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+
+        # 用真实页面替换占位控件，保持栈内序号与菜单一致
+        placeholder = self.stack.widget(index)
+        was_current = self.stack.currentIndex() == index
+        self.stack.insertWidget(index, page)
+        if placeholder is not None:
+            self.stack.removeWidget(placeholder)
+            placeholder.deleteLater()
+        if was_current:
+            self.stack.setCurrentIndex(index)
+
+        self._pages[key] = page
+        setattr(self, f"page_{key}", page)
+        # 监听内容布局变化，动态调整窗口尺寸（统一监听页面本身）
+        self._install_resize_watch(page)
+        if self._startup_report:
+            print(f"[启动计时] 构建页面 {name}: {(time.perf_counter() - t0) * 1000:.0f} ms")
+        return page
+
+    def open_request(self, files: list[str], tool: str = "") -> None:
+        """切换到目标功能页并打开文件（命令行参数或后续启动经单实例转发）。"""
+        files = [f for f in files if os.path.isfile(f)]
+        current = PAGE_SPECS[self.stack.currentIndex()][0] if 0 <= self.stack.currentIndex() < len(PAGE_SPECS) else ""
+        if tool not in PAGE_KEYS:
+            tool = _default_tool(files, current)
+        index = PAGE_KEYS.index(tool)
+        self.sidebar.setCurrentRow(index)
+        page = self._ensure_page(index)
+        if files and page is not None and hasattr(page, "open_files"):
+            try:
+                page.open_files(files)
+            except Exception as e:
+                print(f"打开文件失败：{e}")
+        # 唤起到前台
+        if self.isMinimized():
+            self.showNormal()
+        self.raise_()
+        self.activateWindow()
+
+    def preload_pages(self, keys: list[str]) -> None:
+        """空闲时逐个预构建常用页面（每次事件循环空闲只构建一个，避免卡顿）。"""
+        known = {spec[0] for spec in PAGE_SPECS}
+        self._preload_queue = [k for k in keys if k in known and k not in self._pages]
+        if self._preload_queue:
+            QTimer.singleShot(0, self._preload_next)
+
+    def _preload_next(self) -> None:
+        while self._preload_queue:
+            key = self._preload_queue.pop(0)
+            if key in self._pages:
+                continue
+            idx = next(i for i, spec in enumerate(PAGE_SPECS) if spec[0] == key)
+            self._ensure_page(idx)
+            break
+        if self._preload_queue:
+            QTimer.singleShot(0, self._preload_next)
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self._first_paint_done:
+            self._first_paint_done = True
+            _startup_mark("主窗口首帧绘制")
+            if self._startup_report:
+                _print_startup_report(self._eager_pages)
+
     def on_show_splash(self, image: str, url: str) -> None:
         try:
             from fc import show_fullscreen_image_and_open_url
@@ -312,7 +394,7 @@ class MainWindow(QWidget):
             self.scale_spin.setValue(new_scale)
         finally:
             self.scale_spin.blockSignals(False)
-        self._apply_scale(new_scale)
+        self._request_scale(new_scale)
 
     def _on_scale_spin(self, value: float):
         new_val = int(round(float(value) * 100))
@@ -321,7 +403,34 @@ class MainWindow(QWidget):
             self.scale_slider.setValue(new_val)
         finally:
             self.scale_slider.blockSignals(False)
-        self._apply_scale(float(value))
+        self._request_scale(float(value))
+
+    def _request_scale(self, new_scale: float):
+        # 拖动滑杆时每个刻度都会触发；仅记录目标值，下一帧统一应用一次
+        self._pending_scale = new_scale
+        schedule_reflow(self, "_flush_scale")
+
+    def _flush_scale(self):
+        new_scale = getattr(self, "_pending_scale", None)
+        if new_scale is None:
+            return
+        self._pending_scale = None
+        if abs(float(new_scale) - self.scale) < 1e-6:
+            return
+        self._apply_scale(new_scale)
+
+    def _update_memory_usage(self):
+        from memory_governor import MB, default_governor
+
+        snap = default_governor().snapshot()
+        text = f"渲染内存 {snap['used'] / MB:.0f} / {snap['budget'] / MB:.0f} MB"
+        if snap["waiting"]:
+            text += f"（{snap['waiting']} 个任务等待）"
+        self.mem_label.setText(text)
+        self.mem_label.setToolTip(
+            f"峰值 {snap['peak'] / MB:.0f} MB；累计等待 {snap['waits_total']} 次、"
+            f"{snap['wait_seconds_total']:.1f} 秒\n可用环境变量 LZ_RENDER_MEMORY_MB 调整预算"
+        )
 
     def _apply_scale(self, new_scale: float):
         # 更新主窗口的缩放与样式
@@ -332,7 +441,7 @@ class MainWindow(QWidget):
         except Exception:
             pass
         try:
-            self.setStyleSheet(build_style(self.scale))
+            apply_style(self, self.scale)
         except Exception:
             pass
 
@@ -355,134 +464,28 @@ class MainWindow(QWidget):
         except Exception:
             pass
 
-        # 更新各页面的缩放样式
-        try:
-            # PDF 合并页
-            self.page_merge.scale = self.scale
-            if hasattr(self.page_merge, "_apply_style"):
-                self.page_merge._apply_style()
-            else:
-                self.page_merge.setStyleSheet(build_style(self.scale))
-            # 同步刷新自适应控件高度
-            if hasattr(self.page_merge, "_apply_responsive_sizes"):
-                try:
-                    self.page_merge._apply_responsive_sizes()
-                except Exception:
-                    pass
-        except Exception:
-            pass
-        try:
-            # PDF 拆分页
-            self.page_split.scale = self.scale
-            if hasattr(self.page_split, "_apply_style"):
-                self.page_split._apply_style()
-            else:
-                self.page_split.setStyleSheet(build_style(self.scale))
-            # 同步刷新自适应控件高度
-            if hasattr(self.page_split, "_apply_responsive_sizes"):
-                try:
-                    self.page_split._apply_responsive_sizes()
-                except Exception:
-                    pass
-        except Exception:
-            pass
-        try:
-            # PDF 转图片页
-            self.page_images.scale = self.scale
-            if hasattr(self.page_images, "_apply_style"):
-                self.page_images._apply_style()
-            else:
-                self.page_images.setStyleSheet(build_style(self.scale))
-            # 在缩放变化时，主动刷新页面的自适应控件尺寸
-            if hasattr(self.page_images, "_apply_responsive_sizes"):
-                try:
-                    self.page_images._apply_responsive_sizes()
-                except Exception:
-                    pass
-        except Exception:
-            pass
-        try:
-            # PDF 转一张图片页
-            self.page_oneimage.scale = self.scale
-            if hasattr(self.page_oneimage, "_apply_style"):
-                self.page_oneimage._apply_style()
-            else:
-                self.page_oneimage.setStyleSheet(build_style(self.scale))
-            if hasattr(self.page_oneimage, "_apply_responsive_sizes"):
-                try:
-                    self.page_oneimage._apply_responsive_sizes()
-                except Exception:
-                    pass
-        except Exception:
-            pass
-        try:
-            # PDF 转纯图 PDF 页
-            self.page_imagepdf.scale = self.scale
-            if hasattr(self.page_imagepdf, "_apply_style"):
-                self.page_imagepdf._apply_style()
-            else:
-                self.page_imagepdf.setStyleSheet(build_style(self.scale))
-            if hasattr(self.page_imagepdf, "_apply_responsive_sizes"):
-                try:
-                    self.page_imagepdf._apply_responsive_sizes()
-                except Exception:
-                    pass
-        except Exception:
-            pass
-        try:
-            # PDF 瘦身页
-            self.page_shrink.scale = self.scale
-            if hasattr(self.page_shrink, "_apply_style"):
-                self.page_shrink._apply_style()
-            else:
-                self.page_shrink.setStyleSheet(build_style(self.scale))
-            if hasattr(self.page_shrink, "_apply_responsive_sizes"):
-                try:
-                    self.page_shrink._apply_responsive_sizes()
-                except Exception:
-                    pass
-        except Exception:
-            pass
-        try:
-            # 图片转 PDF 页
-            self.page_img2pdf.scale = self.scale
-            if hasattr(self.page_img2pdf, "_apply_style"):
-                self.page_img2pdf._apply_style()
-            else:
-                self.page_img2pdf.setStyleSheet(build_style(self.scale))
-            # 在缩放变化时，主动刷新页面的自适应控件尺寸
-            if hasattr(self.page_img2pdf, "_apply_responsive_sizes"):
-                try:
-                    self.page_img2pdf._apply_responsive_sizes()
-                except Exception:
-                    pass
-        except Exception:
-            pass
-        try:
-            # PDF 转 DOCX 页
-            self.page_docx.scale = self.scale
-            if hasattr(self.page_docx, "_apply_style"):
-                self.page_docx._apply_style()
-            else:
-                self.page_docx.setStyleSheet(build_style(self.scale))
-        except Exception:
-            pass
-
-
-        try:
-            # 图片转 Excel 页
-            self.page_png2excel.scale = self.scale
-            if hasattr(self.page_png2excel, "_apply_style"):
-                self.page_png2excel._apply_style()
-            else:
-                self.page_png2excel.setStyleSheet(build_style(self.scale))
-        except Exception:
-            pass
+        # 更新已构建页面的缩放样式；未构建的页面在首次构建时直接使用当前缩放
+        for page in self._pages.values():
+            try:
+                page.scale = self.scale
+                if hasattr(page, "_apply_style"):
+                    page._apply_style()
+                else:
+                    apply_style(page, self.scale)
+                # 同步刷新自适应控件高度
+                if hasattr(page, "_apply_responsive_sizes"):
+                    try:
+                        page._apply_responsive_sizes()
+                    except Exception:
+                        pass
+            except Exception:
+                pass
 
         # 触发自动调整（保留“仅增大”策略）
         self._schedule_resize()
 
     def _on_sidebar_change(self, index: int):
+        self._ensure_page(index)
         self.stack.setCurrentIndex(index)
         self._resize_to_page(index)
 
@@ -580,6 +583,15 @@ class MainWindow(QWidget):
         super().mouseReleaseEvent(event)
 
 
+def _print_startup_report(eager_pages: bool) -> None:
+    mode = "全部页面预先构建" if eager_pages else "按需构建页面"
+    print(f"[启动计时] 模式：{mode}")
+    prev = 0.0
+    for stage, t in _STARTUP_MARKS:
+        print(f"[启动计时] {stage}: {t * 1000:.0f} ms (+{(t - prev) * 1000:.0f} ms)")
+        prev = t
+
+
 def main():
     # 高分屏适配
     try:
@@ -595,9 +607,35 @@ def main():
 
     parser = argparse.ArgumentParser(description="PDF工具集主程序")
     parser.add_argument("--scale", type=float, default=None, help="界面缩放比例，例如 1.0、1.25")
+    parser.add_argument("--preload", default="", help="空闲时预构建的页面，逗号分隔，例如 merge,split,images")
+    parser.add_argument("--eager-pages", action="store_true", help="启动时构建全部页面（旧行为，用于耗时对比）")
+    parser.add_argument("--startup-report", action="store_true", help="输出启动各阶段与首帧绘制耗时")
+    parser.add_argument("files", nargs="*", help="要打开的文件（PDF 或图片）")
+    parser.add_argument("--tool", default="", choices=("",) + PAGE_KEYS, help="打开文件所用的功能页，缺省时按文件类型选择")
+    parser.add_argument("--new-instance", action="store_true", help="不转交给已运行的实例，强制启动新进程")
     args = parser.parse_args()
+    files = [os.path.abspath(f) for f in args.files]
+
+    # 单实例：已有实例在运行时把文件与目标功能转交给它后立即退出
+    if not args.new_instance:
+        from single_instance import forward_to_running
+        if forward_to_running(files, args.tool):
+            _startup_mark("转交已运行实例")
+            if args.startup_report:
+                _print_startup_report(args.eager_pages)
+            return
 
     app = QApplication(sys.argv)
+    _startup_mark("QApplication 创建")
+
+    # 尽早监听：主窗口构建期间（启动图处理事件时）到达的转发请求先暂存，窗口就绪后再处理
+    instance_server = None
+    early_requests: list[tuple[list, str]] = []
+    if not args.new_instance:
+        from single_instance import InstanceServer
+        instance_server = InstanceServer(parent=app)
+        instance_server.request.connect(lambda f, t: early_requests.append((f, t)))
+        instance_server.listen()
     scale = args.scale if args.scale is not None else compute_scale(app)
 
 
@@ -630,13 +668,23 @@ def main():
             pass
     except Exception as e:
         print("启动图显示失败:", e)
+    _startup_mark("启动图显示")
 
     # 立即启动主窗口
-    # 在主窗口创建前，保证资源目录就绪（exe 同目录）
+    # 资源目录在后台就绪（链接优先），使用方仅在首次需要时等待具体模型文件
     _ensure_resource_dir("rapidocr_models")
     _ensure_resource_dir("rapidocr_modelsa")
 
-    w = MainWindow(scale=scale)
+    w = MainWindow(scale=scale, eager_pages=args.eager_pages, startup_report=args.startup_report)
+    _startup_mark("主窗口构建")
+
+    if instance_server is not None:
+        instance_server.request.disconnect()
+        instance_server.request.connect(w.open_request)
+    if files or args.tool:
+        early_requests.insert(0, (files, args.tool))
+    for req_files, req_tool in early_requests:
+        QTimer.singleShot(0, lambda f=req_files, t=req_tool: w.open_request(f, t))
 
 
 
@@ -699,6 +747,11 @@ def main():
                 QTimer.singleShot(3200, _make_main_topmost)
     except Exception:
         pass
+    # 可选：空闲时预构建常用页面
+    preload_keys = [k.strip() for k in (args.preload or "").split(",") if k.strip()]
+    if preload_keys:
+        w.preload_pages(preload_keys)
+
     # 保持强引用，避免在某些环境下窗口被提前回收
     try:
         setattr(app, "_main_window", w)
@@ -712,6 +765,8 @@ def main():
 
 
 if __name__ == "__main__":
+    # 打包后的多进程子进程（如拆分页的页面分析）需先交给 multiprocessing 处理
+    multiprocessing.freeze_support()
     # show_windows_toast("LZ-Studio", "项目启动中，请稍等 ...")
 
     main()
\ No newline at end of file
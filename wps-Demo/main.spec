@@ -18,7 +18,12 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=rapidocr_data,
-    hiddenimports=['rapidocr_onnxruntime'],
+    # 功能页由 main.py 按需 importlib 导入，需显式声明以便打包
+    hiddenimports=[
+        'rapidocr_onnxruntime',
+        'pdf_merge', 'pdf_split', 'pdf2images', 'pdf2oneimage', 'pdf2imagepdf',
+        'pdf_shrink', 'img2pdf', 'pdf2docx', 'png2excel',
+    ],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+渲染内存预算（进程内各转换功能共用，不依赖 Qt）
+
+- 转换函数在渲染每页前按 页面尺寸 × 缩放² × 通道数 估算所需内存并申请，处理完释放
+- 预算不足时申请方阻塞等待，多个窗口同时转换时自动错开大页渲染，避免占满内存触发换页
+- 单次申请超过总预算时按总预算计，待其他任务全部释放后独占执行，不会永久等待
+- 并行任务可用 suggested_workers() 按剩余预算降低并发数
+- 预算默认为物理内存的 1/4（256 MB ~ 4 GB），可用环境变量 LZ_RENDER_MEMORY_MB 覆盖
+- 进程池中的子进程各有独立的预算
+- 本模块不导入 fitz，主窗口显示占用时不拖慢启动
+"""
+
+import os
+import sys
+import time
+import threading
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Iterator, Optional, Union
+
+if TYPE_CHECKING:
+    import fitz
+
+MB = 1024 * 1024
+MIN_BUDGET = 256 * MB
+MAX_BUDGET = 4096 * MB
+BUDGET_FRACTION = 0.25
+# 渲染结果之外的副本：转 PIL 图像与编码缓冲区
+RENDER_COPIES = 2
+ENV_BUDGET = "LZ_RENDER_MEMORY_MB"
+
+
+def physical_memory_bytes() -> Optional[int]:
+    try:
+        if sys.platform.startswith("win"):
+            import ctypes
+
+            class _MemStatus(ctypes.Structure):
+                _fields_ = [
+                    ("dwLength", ctypes.c_ulong),
+                    ("dwMemoryLoad", ctypes.c_ulong),
+                    ("ullTotalPhys", ctypes.c_ulonglong),
+                    ("ullAvailPhys", ctypes.c_ulonglong),
+                    ("ullTotalPageFile", ctypes.c_ulonglong),
+                    ("ullAvailPageFile", ctypes.c_ulonglong),
+                    ("ullTotalVirtual", ctypes.c_ulonglong),
+                    ("ullAvailVirtual", ctypes.c_ulonglong),
+                    ("ullAvailExtendedVirtual", ctypes.c_ulonglong),
+                ]
+
+            st = _MemStatus()
+            st.dwLength = ctypes.sizeof(_MemStatus)
+            if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(st)):
+                return int(st.ullTotalPhys)
+            return None
+        return int(os.sysconf("SC_PHYS_PAGES")) * int(os.sysconf("SC_PAGE_SIZE"))
+    except Exception:
+        return None
+
+
+def default_budget() -> int:
+    env = os.environ.get(ENV_BUDGET, "").strip()
+    if env:
+        try:
+            return max(16 * MB, int(float(env) * MB))
+        except ValueError:
+            pass
+    total = physical_memory_bytes()
+    if not total:
+        return 1024 * MB
+    return int(max(MIN_BUDGET, min(MAX_BUDGET, total * BUDGET_FRACTION)))
+
+
+def estimate_render_bytes(page_or_rect: Union["fitz.Page", "fitz.Rect"], zoom: float, channels: int = 3,
+                          alpha: bool = False, copies: int = RENDER_COPIES) -> int:
+    """按 页面尺寸 × 缩放² × 通道数 估算渲染一页（含 copies 份副本）所需字节数。"""
+    rect = page_or_rect.rect if hasattr(page_or_rect, "rect") else page_or_rect
+    w = max(1.0, float(rect.width) * float(zoom))
+    h = max(1.0, float(rect.height) * float(zoom))
+    return int(w * h * (int(channels) + (1 if alpha else 0)) * max(1, int(copies)))
+
+
+class MemoryGovernor:
+    def __init__(self, budget_bytes: Optional[int] = None):
+        self.budget = int(budget_bytes or default_budget())
+        self._cond = threading.Condition()
+        self.used = 0
+        self.peak = 0
+        self.waiting = 0
+        self.waits_total = 0
+        self.wait_seconds_total = 0.0
+
+    def acquire(self, nbytes: int, timeout: Optional[float] = None) -> int:
+        """申请 nbytes（超过预算按预算计），返回实际记账的字节数；超时抛出 TimeoutError。"""
+        n = max(0, min(int(nbytes), self.budget))
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            if self.used + n > self.budget:
+                self.waiting += 1
+                self.waits_total += 1
+                t0 = time.monotonic()
+                try:
+                    while self.used + n > self.budget:
+                        remaining = None if deadline is None else deadline - time.monotonic()
+                        if remaining is not None and remaining <= 0:
+                            raise TimeoutError("等待渲染内存预算超时")
+                        self._cond.wait(remaining)
+                finally:
+                    self.waiting -= 1
+                    self.wait_seconds_total += time.monotonic() - t0
+            self.used += n
+            self.peak = max(self.peak, self.used)
+        return n
+
+    def release(self, n: int) -> None:
+        with self._cond:
+            self.used = max(0, self.used - int(n))
+            self._cond.notify_all()
+
+    @contextmanager
+    def reserve(self, nbytes: int, timeout: Optional[float] = None) -> Iterator[int]:
+        n = self.acquire(nbytes, timeout)
+        try:
+            yield n
+        finally:
+            self.release(n)
+
+    def suggested_workers(self, per_task_bytes: int, max_workers: int) -> int:
+        """按当前剩余预算可同时容纳的任务数降低并发（至少 1）。"""
+        with self._cond:
+            free = self.budget - self.used
+        if per_task_bytes <= 0:
+            return max(1, max_workers)
+        return max(1, min(int(max_workers), int(free // per_task_bytes)))
+
+    def set_budget(self, budget_bytes: int) -> None:
+        with self._cond:
+            self.budget = max(16 * MB, int(budget_bytes))
+            self._cond.notify_all()
+
+    def snapshot(self) -> dict:
+        with self._cond:
+            return {
+                "budget": self.budget,
+                "used": self.used,
+                "peak": self.peak,
+                "waiting": self.waiting,
+                "waits_total": self.waits_total,
+                "wait_seconds_total": round(self.wait_seconds_total, 3),
+            }
+
+
+_DEFAULT_GOVERNOR: Optional[MemoryGovernor] = None
+_DEFAULT_LOCK = threading.Lock()
+
+
+def default_governor() -> MemoryGovernor:
+    global _DEFAULT_GOVERNOR
+    if _DEFAULT_GOVERNOR is None:
+        with _DEFAULT_LOCK:
+            if _DEFAULT_GOVERNOR is None:
+                _DEFAULT_GOVERNOR = MemoryGovernor()
+    return _DEFAULT_GOVERNOR
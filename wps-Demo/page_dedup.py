@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+重复页检测（纯图 PDF 输出共用，不依赖 Qt）
+
+- 精确匹配：渲染结果的像素数据哈希（含宽高与通道数）
+- 可选近似匹配：灰度缩略图逐像素比较，差异明显的像素占比不超过阈值即视为相同（适合扫描件的噪点）
+- 命中时复用已插入图片的 xref（page.insert_image(rect, xref=...)），跳过编码与嵌入
+"""
+
+import hashlib
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+import fitz  # PyMuPDF
+from PIL import Image, ImageChops
+
+from encoder_profiles import pixmap_to_image
+
+# 近似匹配使用的缩略图宽度、判定“像素不同”的灰度差，以及每种尺寸保留的候选数。
+# 宽度过小会把正文里单个字符的差异模糊掉：A4 页面上一个字符在 512 宽时约占 4e-5 的像素。
+# 阈值应远小于这个量级（如 1e-5），只用于吸收扫描噪点；仅差一两个笔画的文字页仍可能被合并，
+# 因此近似匹配默认关闭，由调用方按文档类型开启。
+THUMB_WIDTH = 512
+PIXEL_DIFF_LEVEL = 40
+MAX_CANDIDATES = 32
+
+
+def thumbnail(pix: "fitz.Pixmap", width: int = THUMB_WIDTH) -> Image.Image:
+    img = pixmap_to_image(pix).convert("L")
+    if img.width > width:
+        img = img.resize((width, max(1, round(img.height * width / img.width))), Image.BILINEAR)
+    return img
+
+
+def diff_ratio(a: Image.Image, b: Image.Image, level: int = PIXEL_DIFF_LEVEL) -> float:
+    """两张同尺寸灰度图中，灰度差超过 level 的像素占比。"""
+    diff = ImageChops.difference(a, b).point(lambda v: 255 if v > level else 0)
+    return diff.histogram()[255] / float(a.width * a.height)
+
+
+class RasterDeduper:
+    """记录已嵌入的页面图像，查找可复用的 xref。"""
+
+    def __init__(self, perceptual_threshold: Optional[float] = None):
+        # None 表示只做精确匹配；否则为允许的差异像素占比（如 1e-5）
+        self.perceptual_threshold = perceptual_threshold
+        self._exact: Dict[Tuple, int] = {}
+        self._perceptual: Dict[Tuple[int, int, int], Deque[Tuple[Image.Image, int]]] = {}
+        self.exact_hits = 0
+        self.perceptual_hits = 0
+
+    def lookup(self, pix: "fitz.Pixmap") -> Tuple[Optional[int], Optional[tuple]]:
+        """返回 (可复用的 xref 或 None, 供 add() 使用的令牌)。"""
+        key = (pix.width, pix.height, pix.n, hashlib.sha1(pix.samples).digest())
+        xref = self._exact.get(key)
+        if xref is not None:
+            self.exact_hits += 1
+            return xref, None
+        thumb = None
+        if self.perceptual_threshold is not None:
+            thumb = thumbnail(pix)
+            # 仅在尺寸与通道一致的候选中比较，避免不同纸张大小的页面互相替换
+            for cand, cand_xref in self._perceptual.get(key[:3], ()):
+                if diff_ratio(thumb, cand) <= self.perceptual_threshold:
+                    self.perceptual_hits += 1
+                    return cand_xref, None
+        return None, (key, thumb)
+
+    def add(self, token: Optional[tuple], xref: int) -> None:
+        if not token or not xref:
+            return
+        key, thumb = token
+        self._exact[key] = xref
+        if thumb is not None:
+            self._perceptual.setdefault(key[:3], deque(maxlen=MAX_CANDIDATES)).append((thumb, xref))
+
+    @property
+    def hits(self) -> int:
+        return self.exact_hits + self.perceptual_hits
@@ -16,7 +16,7 @@ LZ-PDF 转 DOCX
 
 import os
 import sys
-from typing import Callable, Optional
+from typing import Callable, List, Optional
 
 # 将 before 目录加入搜索路径，复用已有功能模块
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -49,7 +49,7 @@ from PySide6.QtWidgets import (
     QSizePolicy,
     QInputDialog,
 )
-from ui_style_nb import build_style, compute_scale, dp, apply_base_font
+from ui_style_nb import apply_style, compute_scale, dp, apply_base_font
 
 
 # -----------------------------
@@ -278,7 +278,7 @@ class PDF2DOCXWindow(QWidget):
 
     # --- QSS 样式 ---
     def _apply_style(self):
-        self.setStyleSheet(build_style(self.scale))
+        apply_style(self, self.scale)
 
     # 无标题栏拖拽
     def mousePressEvent(self, event):
@@ -322,8 +322,14 @@ class PDF2DOCXWindow(QWidget):
             os.path.join(BASE_DIR, "测试材料"),
             "PDF 文件 (*.pdf)"
         )
-        if not path:
+        if path:
+            self.open_files([path])
+
+    def open_files(self, paths: List[str]) -> None:
+        """外部打开文件（命令行参数或单实例转发），只取第一个文件。"""
+        if not paths:
             return
+        path = paths[0]
         self.pdf_path = path
         self.btn_pick_pdf.setText(self._short_text(f"已选择: {os.path.basename(path)}"))
         self.btn_pick_pdf.setToolTip(path)
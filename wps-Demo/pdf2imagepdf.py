@@ -3,7 +3,7 @@
 
 import os
 import io
-from typing import Optional, Callable
+from typing import Optional, Callable, List
 
 import fitz  # PyMuPDF
 from PIL import Image
@@ -27,24 +27,33 @@ from PySide6.QtWidgets import (
     QStyle,
 )
 
-from ui_style_nb import build_style, compute_scale, dp
+from memory_governor import default_governor, estimate_render_bytes
+from page_dedup import RasterDeduper
+from pdf_source import PdfSource, open_pdf
+from ui_style_nb import apply_style, compute_scale, dp
 
 
 def convert_pdf_to_image_only_pdf(
-    input_pdf_path: str,
+    input_pdf_path: PdfSource,
     output_pdf_path: str,
     zoom: float = 2.0,
     target_height_px: Optional[int] = None,
     progress_cb: Optional[Callable[[float, str], None]] = None,
+    dedupe: bool = True,
+    perceptual_threshold: Optional[float] = None,
 ) -> str:
-    if not os.path.exists(input_pdf_path):
-        raise FileNotFoundError(f"输入文件不存在: {input_pdf_path}")
-    if not input_pdf_path.lower().endswith(".pdf"):
-        raise ValueError("输入文件必须是PDF格式")
+    """逐页渲染为图片写入新 PDF。
+
+    dedupe 为 True 时，渲染结果与已嵌入页面相同（或差异像素占比不超过 perceptual_threshold）
+    的页直接引用已有图片 xref，不再编码与嵌入。
+    input_pdf_path 也可以是字节串或已打开的文档（由调用方关闭）。
+    """
+    doc, owned = open_pdf(input_pdf_path)
 
-    doc = fitz.open(input_pdf_path)
     out_doc = fitz.open()
     total = len(doc)
+    deduper = RasterDeduper(perceptual_threshold) if dedupe else None
+    governor = default_governor()
     try:
         for i in range(total):
             page = doc[i]
@@ -52,25 +61,38 @@ def convert_pdf_to_image_only_pdf(
             h_pt = float(page.rect.height)
             if target_height_px and target_height_px > 0:
                 scale = max(0.1, float(target_height_px) / h_pt)
-                mat = fitz.Matrix(scale, scale)
             else:
-                mat = fitz.Matrix(zoom, zoom)
-            pix = page.get_pixmap(matrix=mat)
-            # 使用 PNG 流插入，保留图像质量
-            stream = pix.tobytes("png")
-            new_page = out_doc.new_page(width=w_pt, height=h_pt)
-            rect = fitz.Rect(0.0, 0.0, w_pt, h_pt)
-            new_page.insert_image(rect, stream=stream)
+                scale = float(zoom)
+            mat = fitz.Matrix(scale, scale)
+            # 渲染与 PNG 编码期间占用内存预算
+            with governor.reserve(estimate_render_bytes(page, scale)):
+                pix = page.get_pixmap(matrix=mat)
+                new_page = out_doc.new_page(width=w_pt, height=h_pt)
+                rect = fitz.Rect(0.0, 0.0, w_pt, h_pt)
+                xref, token = deduper.lookup(pix) if deduper else (None, None)
+                if xref:
+                    # 重复页：引用已嵌入的图片
+                    new_page.insert_image(rect, xref=xref)
+                    msg = f"第 {i+1} 页与前文重复，复用图像"
+                else:
+                    # 使用 PNG 流插入，保留图像质量
+                    stream = pix.tobytes("png")
+                    xref = new_page.insert_image(rect, stream=stream)
+                    if deduper:
+                        deduper.add(token, xref)
+                    msg = f"写入第 {i+1} 页"
+                pix = None
             if progress_cb:
                 try:
-                    progress_cb((i + 1) * 100.0 / total, f"写入第 {i+1} 页")
+                    progress_cb((i + 1) * 100.0 / total, msg)
                 except Exception:
                     pass
     finally:
-        try:
-            doc.close()
-        except Exception:
-            pass
+        if owned:
+            try:
+                doc.close()
+            except Exception:
+                pass
 
     os.makedirs(os.path.dirname(output_pdf_path) or ".", exist_ok=True)
     out_doc.save(output_pdf_path)
@@ -125,7 +147,7 @@ class PdfToImagePDFWindow(QWidget):
         self.embedded = embedded
         self.setMinimumSize(dp(self.scale, 840), dp(self.scale, 520))
 
-        self.setStyleSheet(build_style(self.scale))
+        apply_style(self, self.scale)
         self._build_ui()
 
     def _build_ui(self):
@@ -217,7 +239,7 @@ class PdfToImagePDFWindow(QWidget):
 
     def _apply_style(self):
         try:
-            self.setStyleSheet(build_style(self.scale))
+            apply_style(self, self.scale)
         except Exception:
             pass
 
@@ -260,10 +282,17 @@ class PdfToImagePDFWindow(QWidget):
     def _choose_pdf(self):
         path, _ = QFileDialog.getOpenFileName(self, "选择PDF文件", os.getcwd(), "PDF 文件 (*.pdf)")
         if path:
-            self.edit_pdf.setText(path)
-            base = os.path.splitext(os.path.basename(path))[0]
-            out_dir = os.path.dirname(path) or "."
-            self.edit_out.setText(os.path.join(out_dir, f"{base}_image.pdf"))
+            self.open_files([path])
+
+    def open_files(self, paths: List[str]) -> None:
+        """外部打开文件（命令行参数或单实例转发），只取第一个文件。"""
+        if not paths:
+            return
+        path = paths[0]
+        self.edit_pdf.setText(path)
+        base = os.path.splitext(os.path.basename(path))[0]
+        out_dir = os.path.dirname(path) or "."
+        self.edit_out.setText(os.path.join(out_dir, f"{base}_image.pdf"))
 
     def _choose_output(self):
         path, _ = QFileDialog.getSaveFileName(self, "选择输出PDF", self.edit_out.text() or "output.pdf", "PDF 文件 (*.pdf)")
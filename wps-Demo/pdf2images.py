@@ -4,7 +4,10 @@
 PDF 转图片 - PyQt5 无边框美化窗口
 
 需求实现：
-- 上传PDF并按页转为图片（PNG/JPEG），按顺序输出
+- 上传PDF并按页转为图片（PNG/JPEG/WebP），按顺序输出
+- 编码档位（快速/均衡/最小体积）在速度与体积之间取舍
+- 可直接输出为 ZIP/TAR 归档（不再二次压缩），避免网络盘上大量小文件的元数据开销
+- 输出到文件夹时支持断点续传：重跑只处理缺失、参数变化或源页内容变化的页
 - 底部显示文件转换进度条
 - “联系我们”点击后打开指定网站
 - 无窗口顶栏（Frameless）样式，提供自定义最小化与关闭按钮
@@ -19,11 +22,22 @@ PDF 转图片 - PyQt5 无边框美化窗口
 import os
 import io
 import sys
-from typing import Callable, Optional
+import queue
+import hashlib
+import tarfile
+import time
+import threading
+import zipfile
+from typing import Callable, List, Optional
 
 import fitz  # PyMuPDF
 from PIL import Image
 
+from encoder_profiles import DEFAULT_PROFILE, encode_pixmap, extension_for, normalize_profile
+from memory_governor import default_governor, estimate_render_bytes
+from pdf_source import PdfSource, open_pdf, source_path, source_stem
+from render_manifest import RenderManifest, page_fingerprint
+
 # ---- 可配置：联系网址 ----
 CONTACT_URL = 'https://example.com/'  # 请替换为你的官网或联系页面
 
@@ -43,8 +57,98 @@ def _ensure_jpeg_rgb(img: Image.Image) -> Image.Image:
     return img
 
 
+ARCHIVE_FORMATS = ('ZIP', 'TAR')
+# 渲染线程与写入线程之间的队列长度（页数），限制内存中积压的已编码图片
+ARCHIVE_QUEUE_SIZE = 8
+# 输出目录中的断点续传清单
+MANIFEST_NAME = '.pdf2images_manifest.json'
+# 每处理多少页落盘一次清单，中途中断后也能续传
+MANIFEST_SAVE_EVERY = 10
+
+
+class _ArchiveWriter:
+    """归档写入线程：渲染端通过有界队列投递 (文件名, 字节)，编码与磁盘 I/O 并行。
+
+    PNG/JPEG 本身已压缩，ZIP 使用 STORED、TAR 不压缩，避免重复压缩的 CPU 开销。
+    先写入 .part 临时文件，全部成功后再改名，失败时删除。
+    """
+
+    def __init__(self, path: str, kind: str, maxsize: int = ARCHIVE_QUEUE_SIZE):
+        self.path = path
+        self.kind = kind.upper()
+        self._tmp = path + '.part'
+        self._q: "queue.Queue[Optional[tuple]]" = queue.Queue(maxsize=max(1, int(maxsize)))
+        self._error: Optional[BaseException] = None
+        self._commit = False
+        self._thread = threading.Thread(target=self._run, name="archive-writer", daemon=True)
+
+    def start(self) -> "_ArchiveWriter":
+        self._thread.start()
+        return self
+
+    def put(self, name: str, data: bytes) -> None:
+        # 队列满时阻塞（背压）；写入线程出错时立即抛出，避免渲染端无限等待
+        while True:
+            if self._error is not None:
+                raise RuntimeError(f"写入归档失败: {self._error}")
+            try:
+                self._q.put((name, data), timeout=0.2)
+                return
+            except queue.Full:
+                continue
+
+    def close(self, commit: bool = True) -> None:
+        self._commit = commit
+        self._q.put(None)
+        self._thread.join()
+        if commit and self._error is not None:
+            raise RuntimeError(f"写入归档失败: {self._error}")
+
+    def _run(self) -> None:
+        arc = None
+        try:
+            if self.kind == 'ZIP':
+                arc = zipfile.ZipFile(self._tmp, 'w', compression=zipfile.ZIP_STORED, allowZip64=True)
+            else:
+                arc = tarfile.open(self._tmp, 'w')
+        except BaseException as e:
+            self._error = e
+        while True:
+            item = self._q.get()
+            if item is None:
+                break
+            if self._error is not None:
+                continue  # 出错后继续取空队列，让渲染端尽快收到异常
+            name, data = item
+            try:
+                if self.kind == 'ZIP':
+                    info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+                    arc.writestr(info, data, compress_type=zipfile.ZIP_STORED)
+                else:
+                    info = tarfile.TarInfo(name)
+                    info.size = len(data)
+                    info.mtime = int(time.time())
+                    arc.addfile(info, io.BytesIO(data))
+            except BaseException as e:
+                self._error = e
+        try:
+            if arc is not None:
+                arc.close()
+        except BaseException as e:
+            if self._error is None:
+                self._error = e
+        try:
+            if self._commit and self._error is None:
+                os.replace(self._tmp, self.path)
+            elif os.path.exists(self._tmp):
+                os.remove(self._tmp)
+        except BaseException as e:
+            if self._error is None:
+                self._error = e
+
+
 def convert_pdf_to_images(
-    input_pdf_path: str,
+    input_pdf_path: PdfSource,
     output_format: str = 'PNG',
     zoom: float = 2.0,
     output_dir: Optional[str] = None,
@@ -52,47 +156,79 @@ def convert_pdf_to_images(
     quality: int = 95,
     progress_cb: Optional[Callable[[float, str], None]] = None,
     target_height_px: Optional[int] = None,
+    archive: Optional[str] = None,
+    resume: bool = True,
+    profile: str = DEFAULT_PROFILE,
 ) -> str:
     """
-    将 PDF 的每一页转换为图片并保存到输出文件夹。
+    将 PDF 的每一页转换为图片并保存到输出文件夹（或直接写入归档）。
 
     Args:
-        input_pdf_path: PDF 文件路径。
-        output_format: 输出图片格式，'PNG' 或 'JPEG'/'JPG'。
+        input_pdf_path: PDF 文件路径（也可为字节串或已打开的文档，后者由调用方关闭）。
+        output_format: 输出图片格式，'PNG'、'JPEG'/'JPG' 或 'WEBP'。
         zoom: 缩放因子（渲染矩阵），影响图片清晰度与大小。
-        output_dir: 输出目录；默认在PDF同目录下创建同名文件夹。
+        output_dir: 输出目录；默认在PDF同目录下创建同名文件夹（内存文档无路径时必须指定）。
         prefix: 输出文件前缀（默认 'page_'）。
-        quality: JPEG 质量（1-100，有效于JPEG）。
+        quality: JPEG/WebP 质量（1-100）。
         progress_cb: 进度回调 (pct: 0-100, msg: str)。
+        archive: 'ZIP' 或 'TAR' 时不再逐页写文件，而是写入 `<output_dir>.zip/.tar`。
+        resume: 输出到文件夹时启用断点续传，按清单跳过已是最新的页（归档模式不适用）。
+        profile: 编码档位 'fast' / 'balanced' / 'smallest'，见 encoder_profiles。
 
     Returns:
-        输出文件夹路径（始终返回路径，出错会抛异常）。
+        输出文件夹路径；指定 archive 时为归档文件路径（出错会抛异常）。
     """
 
-    if not os.path.exists(input_pdf_path):
-        raise FileNotFoundError(f"输入文件不存在: {input_pdf_path}")
-    if not input_pdf_path.lower().endswith('.pdf'):
-        raise ValueError("输入文件必须是PDF格式")
+    if isinstance(input_pdf_path, str):
+        if not os.path.exists(input_pdf_path):
+            raise FileNotFoundError(f"输入文件不存在: {input_pdf_path}")
+        if not input_pdf_path.lower().endswith('.pdf'):
+            raise ValueError("输入文件必须是PDF格式")
 
     output_format = output_format.upper()
-    if output_format not in ('PNG', 'JPEG', 'JPG'):
-        raise ValueError("不支持的图片格式，仅支持: PNG, JPEG, JPG")
+    if output_format not in ('PNG', 'JPEG', 'JPG', 'WEBP'):
+        raise ValueError("不支持的图片格式，仅支持: PNG, JPEG, JPG, WEBP")
 
     if quality < 1 or quality > 100:
-        raise ValueError("JPEG质量参数应为 1-100")
+        raise ValueError("JPEG/WebP质量参数应为 1-100")
+
+    profile = normalize_profile(profile)
+
+    if archive:
+        archive = archive.upper()
+        if archive not in ARCHIVE_FORMATS:
+            raise ValueError("不支持的归档格式，仅支持: ZIP, TAR")
 
-    input_dir = os.path.dirname(input_pdf_path)
-    input_filename = os.path.basename(input_pdf_path)
-    name_without_ext = os.path.splitext(input_filename)[0]
     if output_dir is None:
-        output_dir = os.path.join(input_dir, name_without_ext)
-    os.makedirs(output_dir, exist_ok=True)
+        src_path = source_path(input_pdf_path)
+        if not src_path:
+            raise ValueError("内存文档转换时需指定输出目录")
+        output_dir = os.path.join(os.path.dirname(src_path), source_stem(input_pdf_path))
+    output_dir = os.path.normpath(output_dir)
+    writer: Optional[_ArchiveWriter] = None
+    if archive:
+        os.makedirs(os.path.dirname(output_dir) or '.', exist_ok=True)
+        writer = _ArchiveWriter(f"{output_dir}.{archive.lower()}", archive).start()
+    else:
+        os.makedirs(output_dir, exist_ok=True)
 
     # 打开PDF
-    doc = fitz.open(input_pdf_path)
+    try:
+        doc, owned = open_pdf(input_pdf_path)
+    except Exception:
+        if writer:
+            writer.close(commit=False)
+        raise
     total_pages = len(doc)
     pad_len = max(2, len(str(total_pages)))
 
+    manifest: Optional[RenderManifest] = None
+    if resume and not writer:
+        manifest = RenderManifest.load(os.path.join(output_dir, MANIFEST_NAME))
+    xref_cache: dict = {}
+    skipped = 0
+
+    ok = False
     try:
         for page_num in range(total_pages):
             page = doc[page_num]
@@ -101,27 +237,47 @@ def convert_pdf_to_images(
                 page_h_pt = float(page.rect.height)
                 # 基于 1:1 点到像素的 PyMuPDF 渲染逻辑，zoom 为缩放因子
                 z = max(0.1, float(target_height_px) / page_h_pt)
-                mat = fitz.Matrix(z, z)
             else:
-                mat = fitz.Matrix(zoom, zoom)
-            pix = page.get_pixmap(matrix=mat)
+                z = float(zoom)
+            mat = fitz.Matrix(z, z)
 
             # 文件名与扩展名
             page_number = str(page_num + 1).zfill(pad_len)
-            ext = 'jpg' if output_format in ('JPEG', 'JPG') else 'png'
+            ext = extension_for(output_format)
             output_filename = f"{prefix}{page_number}.{ext}"
             output_path = os.path.join(output_dir, output_filename)
 
-            # 将pixmap转换为PIL Image
-            img_data = pix.tobytes("png")
-            img = Image.open(io.BytesIO(img_data))
-
-            # 保存
-            if ext == 'jpg':
-                img = _ensure_jpeg_rgb(img)
-                img.save(output_path, format='JPEG', quality=int(quality), optimize=True)
+            # 断点续传：源页内容、渲染参数与输出文件均未变化时跳过
+            src_hash = params = None
+            if manifest is not None:
+                src_hash = page_fingerprint(doc, page, xref_cache)
+                params = {'zoom': round(z, 6), 'format': ext, 'quality': int(quality) if ext != 'png' else None,
+                          'profile': profile}
+                if manifest.matches(output_filename, src_hash, params) and manifest.file_valid(output_filename, output_path):
+                    skipped += 1
+                    if progress_cb:
+                        try:
+                            pct = (page_num + 1) * 100.0 / total_pages
+                            progress_cb(pct, f"跳过 {output_filename}（已是最新）")
+                        except Exception:
+                            pass
+                    continue
+
+            # 渲染与编码期间占用内存预算，多个窗口同时转换大页时排队
+            with default_governor().reserve(estimate_render_bytes(page, z)):
+                pix = page.get_pixmap(matrix=mat)
+                # 编码到内存：归档模式交给写入线程，文件模式直接落盘（同时用于计算输出哈希）
+                data = encode_pixmap(pix, output_format, int(quality), profile)
+                pix = None
+            if writer:
+                writer.put(output_filename, data)
             else:
-                img.save(output_path, format='PNG', optimize=True)
+                with open(output_path, 'wb') as f:
+                    f.write(data)
+                if manifest is not None:
+                    manifest.record(output_filename, src_hash, params, hashlib.sha256(data).hexdigest(), output_path)
+                    if (page_num + 1) % MANIFEST_SAVE_EVERY == 0:
+                        manifest.save()
 
             if progress_cb:
                 try:
@@ -130,14 +286,24 @@ def convert_pdf_to_images(
                 except Exception:
                     pass
 
-            pix = None
+        ok = True
+        if skipped and progress_cb:
+            try:
+                progress_cb(100.0, f"断点续传：{skipped}/{total_pages} 页已是最新，已跳过")
+            except Exception:
+                pass
     finally:
-        try:
-            doc.close()
-        except Exception:
-            pass
+        if owned:
+            try:
+                doc.close()
+            except Exception:
+                pass
+        if manifest is not None:
+            manifest.save()
+        if writer:
+            writer.close(commit=ok)
 
-    return output_dir
+    return writer.path if writer else output_dir
 
 
 # ----------------- 界面代码（PyQt5） -----------------
@@ -150,7 +316,9 @@ from PySide6.QtWidgets import (
     QBoxLayout, QSplitter,
 )
 from PySide6.QtGui import QDesktopServices
-from ui_style_nb import build_style, compute_scale, dp
+from encoder_profiles import PROFILE_LABELS, PROFILE_NAMES
+from ui_style_nb import apply_style, compute_scale, dp
+from layout_service import factor_bucket, schedule_reflow, size_bucket_changed
 
 
 APP_STYLE = None
@@ -174,7 +342,8 @@ class ConvertWorker(QThread):
 
     def __init__(self, pdf_path: str, output_format: str, zoom: float,
                  output_dir: Optional[str], prefix: str, quality: int,
-                 target_height_px: Optional[int] = None):
+                 target_height_px: Optional[int] = None, archive: Optional[str] = None,
+                 profile: str = DEFAULT_PROFILE):
         super().__init__()
         self.pdf_path = pdf_path
         self.output_format = output_format
@@ -183,6 +352,8 @@ class ConvertWorker(QThread):
         self.prefix = prefix
         self.quality = quality
         self.target_height_px = target_height_px
+        self.archive = archive
+        self.profile = profile
 
     def run(self):
         try:
@@ -198,6 +369,8 @@ class ConvertWorker(QThread):
                 quality=self.quality,
                 progress_cb=cb,
                 target_height_px=self.target_height_px,
+                archive=self.archive,
+                profile=self.profile,
             )
             self.finished.emit(out_dir)
         except Exception as e:
@@ -223,7 +396,7 @@ class PdfToImagesWindow(QWidget):
         # A4 纵向比例（宽/高 = 210/297 ≈ 0.7071）
         self.preview_aspect_w_over_h: float = 210.0 / 297.0
 
-        self.setStyleSheet(build_style(self.scale))
+        apply_style(self, self.scale)
         self._build_ui()
 
     # ---- Frameless 拖动支持 ----
@@ -409,7 +582,7 @@ class PdfToImagesWindow(QWidget):
         except Exception:
             pass
 
-        self.format_combo = QComboBox(); self.format_combo.addItems(["PNG", "JPEG"])
+        self.format_combo = QComboBox(); self.format_combo.addItems(["PNG", "JPEG", "WEBP"])
         self.format_combo.currentTextChanged.connect(self._on_format_changed)
         self.format_combo.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
         self.format_combo.setMinimumHeight(dp(self.scale, 32))
@@ -419,24 +592,41 @@ class PdfToImagesWindow(QWidget):
         self.height_spin = QSpinBox(); self.height_spin.setRange(0, 20000); self.height_spin.setValue(1600); self.height_spin.setSuffix(" px"); self.height_spin.setSpecialValueText("按缩放")
         self.height_spin.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
         self.height_spin.setMinimumHeight(dp(self.scale, 32))
-        self.quality_spin = QSpinBox(); self.quality_spin.setRange(1, 100); self.quality_spin.setValue(95); self.quality_spin.setEnabled(self.format_combo.currentText() == 'JPEG')
+        self.quality_spin = QSpinBox(); self.quality_spin.setRange(1, 100); self.quality_spin.setValue(95); self.quality_spin.setEnabled(self.format_combo.currentText() != 'PNG')
         self.quality_spin.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
         self.quality_spin.setMinimumHeight(dp(self.scale, 32))
         self.prefix_edit = QLineEdit("page_")
         self.prefix_edit.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
         self.prefix_edit.setMinimumHeight(dp(self.scale, 32))
+        self.profile_combo = QComboBox()
+        for name in PROFILE_NAMES:
+            self.profile_combo.addItem(PROFILE_LABELS[name], name)
+        self.profile_combo.setCurrentIndex(PROFILE_NAMES.index(DEFAULT_PROFILE))
+        self.profile_combo.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
+        self.profile_combo.setMinimumHeight(dp(self.scale, 32))
+        # 输出方式：逐页文件 / 直接写入归档（userData 为 archive 参数）
+        self.output_mode_combo = QComboBox()
+        self.output_mode_combo.addItem("文件夹", None)
+        self.output_mode_combo.addItem("ZIP 压缩包", "ZIP")
+        self.output_mode_combo.addItem("TAR 归档", "TAR")
+        self.output_mode_combo.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
+        self.output_mode_combo.setMinimumHeight(dp(self.scale, 32))
 
         lab_format = QLabel("格式"); lab_format.setWordWrap(True)
         lab_zoom = QLabel("缩放"); lab_zoom.setWordWrap(True)
         lab_height = QLabel("导出高度(px)"); lab_height.setWordWrap(True)
-        lab_quality = QLabel("JPEG质量"); lab_quality.setWordWrap(True)
+        lab_quality = QLabel("JPEG/WebP质量"); lab_quality.setWordWrap(True)
+        lab_profile = QLabel("编码档位"); lab_profile.setWordWrap(True)
         lab_prefix = QLabel("文件前缀"); lab_prefix.setWordWrap(True)
+        lab_output_mode = QLabel("输出方式"); lab_output_mode.setWordWrap(True)
 
         params_form.addRow(lab_format, self.format_combo)
         params_form.addRow(lab_zoom, self.zoom_spin)
         params_form.addRow(lab_height, self.height_spin)
         params_form.addRow(lab_quality, self.quality_spin)
+        params_form.addRow(lab_profile, self.profile_combo)
         params_form.addRow(lab_prefix, self.prefix_edit)
+        params_form.addRow(lab_output_mode, self.output_mode_combo)
         panel_layout.addLayout(params_form)
 
         # 底部：转换/打开/联系
@@ -488,17 +678,24 @@ class PdfToImagesWindow(QWidget):
         self.out_dir_last: Optional[str] = None
 
     def _on_format_changed(self, text: str):
-        self.quality_spin.setEnabled(text.upper() == 'JPEG')
+        self.quality_spin.setEnabled(text.upper() != 'PNG')
 
     def _choose_pdf(self):
         path, _ = QFileDialog.getOpenFileName(self, "选择PDF文件", os.getcwd(), "PDF 文件 (*.pdf)")
         if path:
-            self.pdf_path_edit.setText(path)
-            try:
-                self._open_doc(path)
-                self.log_edit.append(f"已加载：{os.path.basename(path)}，共 {self.total_pages} 页")
-            except Exception as e:
-                QMessageBox.critical(self, "失败", f"打开PDF失败：{e}")
+            self.open_files([path])
+
+    def open_files(self, paths: List[str]) -> None:
+        """外部打开文件（命令行参数或单实例转发），只取第一个文件。"""
+        if not paths:
+            return
+        path = paths[0]
+        self.pdf_path_edit.setText(path)
+        try:
+            self._open_doc(path)
+            self.log_edit.append(f"已加载：{os.path.basename(path)}，共 {self.total_pages} 页")
+        except Exception as e:
+            QMessageBox.critical(self, "失败", f"打开PDF失败：{e}")
 
     def _choose_output_dir(self):
         dir_ = QFileDialog.getExistingDirectory(self, "选择输出目录", os.getcwd())
@@ -535,13 +732,17 @@ class PdfToImagesWindow(QWidget):
         prefix = self.prefix_edit.text().strip() or 'page_'
         quality = int(self.quality_spin.value())
         output_dir = self.output_dir_edit.text().strip() or None
+        archive = self.output_mode_combo.currentData()
+        profile = self.profile_combo.currentData() or DEFAULT_PROFILE
 
         self.btn_convert.setEnabled(False)
         self.progress_bar.setValue(0)
 
         height_px = int(self.height_spin.value())
         target_h = height_px if height_px > 0 else None
-        self.worker = ConvertWorker(pdf_path, output_format, zoom, output_dir, prefix, quality, target_height_px=target_h)
+        self.worker = ConvertWorker(pdf_path, output_format, zoom, output_dir, prefix, quality,
+                                    target_height_px=target_h, archive=archive,
+                                    profile=profile)
         self.worker.progress.connect(self._on_progress)
         self.worker.finished.connect(self._on_finished)
         self.worker.failed.connect(self._on_failed)
@@ -554,9 +755,11 @@ class PdfToImagesWindow(QWidget):
         self.log_edit.append(msg)
 
     def _on_finished(self, out_dir: str):
-        self.out_dir_last = out_dir
+        # 归档输出时“打开文件夹”打开其所在目录
+        self.out_dir_last = out_dir if os.path.isdir(out_dir) else os.path.dirname(out_dir)
         self.btn_open_out.setEnabled(True)
-        QMessageBox.information(self, "完成", f"转换完成！输出目录：\n{out_dir}")
+        label = "输出文件" if os.path.isfile(out_dir) else "输出目录"
+        QMessageBox.information(self, "完成", f"转换完成！{label}：\n{out_dir}")
 
     def _on_failed(self, err: str):
         QMessageBox.critical(self, "失败", f"转换失败：{err}")
@@ -614,12 +817,11 @@ class PdfToImagesWindow(QWidget):
 
     def resizeEvent(self, event):
         super().resizeEvent(event)
+        # 预览适配、拥挤时重排、按 scale 与窗口尺寸调整控件高度；同一帧内合并为一次
         if self.fit_to_window:
-            self._update_preview()
-        # 横向拥挤时自动重排为纵向堆叠
-        self._reflow_layout()
-        # 根据 scale 与窗口尺寸自动调整控件高度
-        self._apply_responsive_sizes()
+            schedule_reflow(self, "_update_preview", "_reflow_layout", "_apply_responsive_sizes")
+        else:
+            schedule_reflow(self)
 
     def _prev_page(self):
         if not self.doc:
@@ -761,7 +963,10 @@ class PdfToImagesWindow(QWidget):
     def _apply_responsive_sizes(self):
         """按计算因子给常用控件设置最小高度，实现随窗口变化的自适应。"""
         try:
-            f = self._calc_size_factor()
+            # 尺寸因子按档位量化；缩放与档位均未变化时跳过控件尺寸重算
+            f = factor_bucket(self._calc_size_factor())
+            if not size_bucket_changed(self, self.scale, f):
+                return
             def H(base: int) -> int:
                 return int(dp(self.scale, base) * f)
             def ensure_h(w, base: int, extra: int = 10):
@@ -780,6 +985,8 @@ class PdfToImagesWindow(QWidget):
                 self.height_spin,
                 self.quality_spin,
                 self.prefix_edit,
+                self.profile_combo,
+                self.output_mode_combo,
             ):
                 ensure_h(w, 32)
 
@@ -2,7 +2,6 @@
 # -*- coding: utf-8 -*-
 
 import os
-import io
 from typing import Optional, Callable, List, Tuple
 
 import fitz  # PyMuPDF
@@ -29,7 +28,10 @@ from PySide6.QtWidgets import (
     QStyle,
 )
 
-from ui_style_nb import build_style, compute_scale, dp
+from encoder_profiles import DEFAULT_PROFILE, PROFILE_LABELS, PROFILE_NAMES, encode_image, normalize_profile, pixmap_to_image
+from memory_governor import default_governor, estimate_render_bytes
+from pdf_source import PdfSource, open_pdf
+from ui_style_nb import apply_style, compute_scale, dp
 
 
 def _ensure_rgb(img: Image.Image) -> Image.Image:
@@ -45,84 +47,95 @@ def _ensure_rgb(img: Image.Image) -> Image.Image:
     return img
 
 
+def _page_scale(page: "fitz.Page", zoom: float, target_width_px: Optional[int]) -> float:
+    if target_width_px and target_width_px > 0:
+        return max(0.1, float(target_width_px) / float(page.rect.width))
+    return float(zoom)
+
+
 def convert_pdf_to_single_image(
-    input_pdf_path: str,
+    input_pdf_path: PdfSource,
     output_path: str,
     output_format: str = "PNG",
     zoom: float = 2.0,
     target_width_px: Optional[int] = None,
     progress_cb: Optional[Callable[[float, str], None]] = None,
+    profile: str = DEFAULT_PROFILE,
 ) -> str:
-    if not os.path.exists(input_pdf_path):
-        raise FileNotFoundError(f"输入文件不存在: {input_pdf_path}")
-    if not input_pdf_path.lower().endswith(".pdf"):
-        raise ValueError("输入文件必须是PDF格式")
-
     output_format = output_format.upper()
     if output_format not in ("PNG", "JPEG", "JPG"):
         raise ValueError("仅支持 PNG 或 JPEG 输出")
+    profile = normalize_profile(profile)
 
-    doc = fitz.open(input_pdf_path)
+    # 输入可为路径、字节串或已打开的文档（后者由调用方关闭）
+    doc, owned = open_pdf(input_pdf_path)
     total_pages = len(doc)
-    images: List[Image.Image] = []
+    # 拼接期间所有页图像、缩放副本与整张画布同时驻留内存：整个任务按总量一次申请预算
+    # （超过总预算时按总预算计，独占执行）
     try:
-        for i in range(total_pages):
-            page = doc[i]
-            if target_width_px and target_width_px > 0:
-                page_w_pt = float(page.rect.width)
-                scale = max(0.1, float(target_width_px) / page_w_pt)
+        need = sum(estimate_render_bytes(page, _page_scale(page, zoom, target_width_px), copies=3) for page in doc)
+    except Exception:
+        if owned:
+            doc.close()
+        raise
+    with default_governor().reserve(need):
+        images: List[Image.Image] = []
+        try:
+            for i in range(total_pages):
+                page = doc[i]
+                scale = _page_scale(page, zoom, target_width_px)
                 mat = fitz.Matrix(scale, scale)
-            else:
-                mat = fitz.Matrix(zoom, zoom)
-            pix = page.get_pixmap(matrix=mat)
-            img = Image.open(io.BytesIO(pix.tobytes("png")))
-            images.append(img)
+                pix = page.get_pixmap(matrix=mat)
+                img = pixmap_to_image(pix)
+                images.append(img)
+                if progress_cb:
+                    try:
+                        progress_cb((i + 1) * 100.0 / total_pages, f"渲染第 {i+1} 页")
+                    except Exception:
+                        pass
+        finally:
+            if owned:
+                try:
+                    doc.close()
+                except Exception:
+                    pass
+
+        if not images:
+            raise RuntimeError("无法从PDF渲染任何页面")
+
+        # 统一宽度为所有页的最大宽度，按比例缩放每页后纵向拼接
+        max_w = max(img.width for img in images)
+        scaled: List[Image.Image] = []
+        total_h = 0
+        for img in images:
+            if img.width != max_w:
+                new_h = int(img.height * (max_w / float(img.width)))
+                img = img.resize((max_w, max(1, new_h)), Image.LANCZOS)
+            # 输出为 JPEG 时强制转换为 RGB
+            if output_format in ("JPEG", "JPG"):
+                img = _ensure_rgb(img)
+            scaled.append(img)
+            total_h += img.height
+
+        mode = "RGB" if output_format in ("JPEG", "JPG") else ("RGBA" if any(im.mode == "RGBA" for im in scaled) else "RGB")
+        canvas = Image.new(mode, (max_w, total_h), (255, 255, 255) if mode == "RGB" else (255, 255, 255, 0))
+        y = 0
+        for idx, img in enumerate(scaled, 1):
+            canvas.paste(img, (0, y))
+            y += img.height
             if progress_cb:
                 try:
-                    progress_cb((i + 1) * 100.0 / total_pages, f"渲染第 {i+1} 页")
+                    progress_cb(70 + idx * 30.0 / len(scaled), f"拼接第 {idx} 页")
                 except Exception:
                     pass
-    finally:
-        try:
-            doc.close()
-        except Exception:
-            pass
 
-    if not images:
-        raise RuntimeError("无法从PDF渲染任何页面")
-
-    # 统一宽度为所有页的最大宽度，按比例缩放每页后纵向拼接
-    max_w = max(img.width for img in images)
-    scaled: List[Image.Image] = []
-    total_h = 0
-    for img in images:
-        if img.width != max_w:
-            new_h = int(img.height * (max_w / float(img.width)))
-            img = img.resize((max_w, max(1, new_h)), Image.LANCZOS)
-        # 输出为 JPEG 时强制转换为 RGB
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
         if output_format in ("JPEG", "JPG"):
-            img = _ensure_rgb(img)
-        scaled.append(img)
-        total_h += img.height
-
-    mode = "RGB" if output_format in ("JPEG", "JPG") else ("RGBA" if any(im.mode == "RGBA" for im in scaled) else "RGB")
-    canvas = Image.new(mode, (max_w, total_h), (255, 255, 255) if mode == "RGB" else (255, 255, 255, 0))
-    y = 0
-    for idx, img in enumerate(scaled, 1):
-        canvas.paste(img, (0, y))
-        y += img.height
-        if progress_cb:
-            try:
-                progress_cb(70 + idx * 30.0 / len(scaled), f"拼接第 {idx} 页")
-            except Exception:
-                pass
-
-    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
-    if output_format in ("JPEG", "JPG"):
-        canvas = _ensure_rgb(canvas)
-        canvas.save(output_path, format="JPEG", quality=95, optimize=True)
-    else:
-        canvas.save(output_path, format="PNG", optimize=True)
+            canvas = _ensure_rgb(canvas)
+        data = encode_image(canvas, output_format, 95, profile)
+        with open(output_path, "wb") as f:
+            f.write(data)
+        images = scaled = canvas = None  # 释放后再归还预算
     return output_path
 
 
@@ -138,6 +151,7 @@ class _SingleImageWorker(QThread):
         fmt: str,
         zoom: float,
         target_width_px: Optional[int],
+        profile: str = DEFAULT_PROFILE,
         parent: Optional[QWidget] = None,
     ):
         super().__init__(parent)
@@ -146,6 +160,7 @@ class _SingleImageWorker(QThread):
         self.fmt = fmt
         self.zoom = zoom
         self.target_width_px = target_width_px
+        self.profile = profile
 
     def run(self):
         try:
@@ -158,6 +173,7 @@ class _SingleImageWorker(QThread):
                 zoom=self.zoom,
                 target_width_px=self.target_width_px,
                 progress_cb=cb,
+                profile=self.profile,
             )
             self.finished.emit(out)
         except Exception as e:
@@ -177,7 +193,7 @@ class PdfToOneImageWindow(QWidget):
         self.embedded = embedded
         self.setMinimumSize(dp(self.scale, 840), dp(self.scale, 520))
 
-        self.setStyleSheet(build_style(self.scale))
+        apply_style(self, self.scale)
         self._build_ui()
 
     def _build_ui(self):
@@ -250,7 +266,12 @@ class PdfToOneImageWindow(QWidget):
         self.spin_width = QSpinBox(); self.spin_width.setRange(0, 20000); self.spin_width.setValue(1200); self.spin_width.setSuffix(" px"); self.spin_width.setSpecialValueText("按缩放")
         form.addRow(QLabel("格式"), self.combo_fmt)
         form.addRow(QLabel("缩放"), self.spin_zoom)
+        self.combo_profile = QComboBox()
+        for name in PROFILE_NAMES:
+            self.combo_profile.addItem(PROFILE_LABELS[name], name)
+        self.combo_profile.setCurrentIndex(PROFILE_NAMES.index(DEFAULT_PROFILE))
         form.addRow(QLabel("目标宽度(px)"), self.spin_width)
+        form.addRow(QLabel("编码档位"), self.combo_profile)
         lay.addLayout(form)
 
         row = QHBoxLayout()
@@ -275,7 +296,7 @@ class PdfToOneImageWindow(QWidget):
 
     def _apply_style(self):
         try:
-            self.setStyleSheet(build_style(self.scale))
+            apply_style(self, self.scale)
         except Exception:
             pass
 
@@ -321,11 +342,18 @@ class PdfToOneImageWindow(QWidget):
     def _choose_pdf(self):
         path, _ = QFileDialog.getOpenFileName(self, "选择PDF文件", os.getcwd(), "PDF 文件 (*.pdf)")
         if path:
-            self.edit_pdf.setText(path)
-            base = os.path.splitext(os.path.basename(path))[0]
-            out_dir = os.path.dirname(path) or "."
-            ext = self.combo_fmt.currentText().lower()
-            self.edit_out.setText(os.path.join(out_dir, f"{base}_long.{ 'jpg' if ext=='jpeg' else 'png' }"))
+            self.open_files([path])
+
+    def open_files(self, paths: List[str]) -> None:
+        """外部打开文件（命令行参数或单实例转发），只取第一个文件。"""
+        if not paths:
+            return
+        path = paths[0]
+        self.edit_pdf.setText(path)
+        base = os.path.splitext(os.path.basename(path))[0]
+        out_dir = os.path.dirname(path) or "."
+        ext = self.combo_fmt.currentText().lower()
+        self.edit_out.setText(os.path.join(out_dir, f"{base}_long.{ 'jpg' if ext=='jpeg' else 'png' }"))
 
     def _choose_output(self):
         fmt = self.combo_fmt.currentText().upper()
@@ -357,7 +385,8 @@ class PdfToOneImageWindow(QWidget):
         zoom = float(self.spin_zoom.value())
         width = int(self.spin_width.value())
         target_w = width if width > 0 else None
-        self._worker = _SingleImageWorker(pdf, out, fmt, zoom, target_w)
+        profile = self.combo_profile.currentData() or DEFAULT_PROFILE
+        self._worker = _SingleImageWorker(pdf, out, fmt, zoom, target_w, profile)
         self._worker.progress.connect(self.progress.setValue)
         self._worker.finished.connect(self._on_ok)
         self._worker.failed.connect(self._on_fail)
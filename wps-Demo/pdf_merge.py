@@ -45,7 +45,9 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtGui import QDesktopServices
 
-from ui_style_nb import build_style, compute_scale, dp
+from pdf_source import PdfSource, open_pdf, source_path
+from ui_style_nb import apply_style, compute_scale, dp
+from layout_service import factor_bucket, schedule_reflow, size_bucket_changed
 
 
 # 可配置：联系网址（与其他页面保持一致用法）
@@ -53,42 +55,30 @@ CONTACT_URL = "https://www.example.com/"
 
 
 # ----------------- 功能函数（可被其他项目直接调用） -----------------
-def merge_pdfs(
-    input_paths: List[str],
-    output_path: str,
+def merge_documents(
+    sources: List[PdfSource],
     progress_cb: Optional[Callable[[int, str], None]] = None,
     keep_toc: bool = True,
     keep_metadata: bool = True,
-) -> str:
-    """将多个 PDF 合并为一个 PDF。
-
-    Args:
-        input_paths: 输入 PDF 路径列表（按顺序合并）。
-        output_path: 输出 PDF 文件路径。
-        progress_cb: 进度回调 (pct: 0-100, msg: str)。
-
-    Returns:
-        生成的输出 PDF 路径（成功时）。
-    """
+) -> "fitz.Document":
+    """将多个 PDF（路径、字节串或已打开的文档）按顺序合并为一个内存文档，由调用方保存并关闭。"""
 
-    if not input_paths:
+    if not sources:
         raise ValueError("请至少选择一个 PDF 文件")
 
-    out_dir = os.path.dirname(output_path) or os.getcwd()
-    os.makedirs(out_dir, exist_ok=True)
-
     # 以“文件数”为粒度进行进度上报，避免预先统计页数的成本
-    total_files = len(input_paths)
+    total_files = len(sources)
     new_doc = fitz.open()
     combined_toc = []
     first_metadata = None
     try:
-        for idx, p in enumerate(input_paths, 1):
-            if not os.path.exists(p):
+        for idx, p in enumerate(sources, 1):
+            if isinstance(p, str) and not os.path.exists(p):
                 raise FileNotFoundError(f"文件不存在: {p}")
+            name = os.path.basename(source_path(p)) or f"文档 {idx}"
             if progress_cb:
                 try:
-                    progress_cb(int((idx - 1) * 100 / total_files), f"打开: {os.path.basename(p)}")
+                    progress_cb(int((idx - 1) * 100 / total_files), f"打开: {name}")
                 except Exception:
                     pass
             # 记录当前目标文档页偏移
@@ -96,7 +86,7 @@ def merge_pdfs(
                 offset = new_doc.page_count
             except Exception:
                 offset = 0
-            src = fitz.open(p)
+            src, owned = open_pdf(p, check_ext=False)
             try:
                 if first_metadata is None:
                     try:
@@ -114,13 +104,14 @@ def merge_pdfs(
                         pass
                 new_doc.insert_pdf(src)
             finally:
-                try:
-                    src.close()
-                except Exception:
-                    pass
+                if owned:
+                    try:
+                        src.close()
+                    except Exception:
+                        pass
             if progress_cb:
                 try:
-                    progress_cb(int(idx * 100 / total_files), f"已合并: {os.path.basename(p)}")
+                    progress_cb(int(idx * 100 / total_files), f"已合并: {name}")
                 except Exception:
                     pass
 
@@ -136,7 +127,38 @@ def merge_pdfs(
                 new_doc.set_metadata(dict(first_metadata))
             except Exception:
                 pass
+        return new_doc
+    except Exception:
+        new_doc.close()
+        raise
+
+
+def merge_pdfs(
+    input_paths: List[str],
+    output_path: str,
+    progress_cb: Optional[Callable[[int, str], None]] = None,
+    keep_toc: bool = True,
+    keep_metadata: bool = True,
+) -> str:
+    """将多个 PDF 合并为一个 PDF。
+
+    Args:
+        input_paths: 输入 PDF 路径列表（按顺序合并）。
+        output_path: 输出 PDF 文件路径。
+        progress_cb: 进度回调 (pct: 0-100, msg: str)。
+
+    Returns:
+        生成的输出 PDF 路径（成功时）。
+    """
+
+    if not input_paths:
+        raise ValueError("请至少选择一个 PDF 文件")
+
+    out_dir = os.path.dirname(output_path) or os.getcwd()
+    os.makedirs(out_dir, exist_ok=True)
 
+    new_doc = merge_documents(input_paths, progress_cb, keep_toc=keep_toc, keep_metadata=keep_metadata)
+    try:
         new_doc.save(output_path)
         if progress_cb:
             try:
@@ -206,7 +228,7 @@ class PDFMergeWindow(QWidget):
         self.output_name: str = "merged.pdf"
         self.worker: Optional[MergeWorker] = None
 
-        self.setStyleSheet(build_style(self.scale))
+        apply_style(self, self.scale)
         # 支持窗口级别外部拖放添加文件
         self.setAcceptDrops(True)
         self._build_ui()
@@ -432,11 +454,8 @@ class PDFMergeWindow(QWidget):
 
     def resizeEvent(self, event):
         super().resizeEvent(event)
-        try:
-            self._reflow_layout()
-            self._apply_responsive_sizes()
-        except Exception:
-            pass
+        # 同一帧内的多次 resize 合并为一次重排
+        schedule_reflow(self)
 
     def _reflow_layout(self):
         # 根据当前可用宽度，决定左右并排或上下堆叠
@@ -496,7 +515,10 @@ class PDFMergeWindow(QWidget):
     def _apply_responsive_sizes(self):
         """设置控件最小高度，并以字体度量作下限避免文字裁剪。"""
         try:
-            f = self._calc_size_factor()
+            # 尺寸因子按档位量化；缩放与档位均未变化时跳过控件尺寸重算
+            f = factor_bucket(self._calc_size_factor())
+            if not size_bucket_changed(self, self.scale, f):
+                return
             def H(base: int) -> int:
                 return int(dp(self.scale, base) * f)
             def ensure_h(w, base: int, extra: int = 10):
@@ -556,6 +578,10 @@ class PDFMergeWindow(QWidget):
             return
         self._add_paths(pdfs)
 
+    def open_files(self, paths: List[str]) -> None:
+        """外部打开文件（命令行参数或单实例转发），追加到合并列表。"""
+        self._add_paths([p for p in paths if p.lower().endswith('.pdf')])
+
     def _add_paths(self, paths: List[str]):
         # 去重：避免重复添加；保持现有顺序 + 新增顺序
         existing = set(self._collect_paths())
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+PDF 处理流水线：在内存中串联 合并 / 瘦身 / 拆分 / 转图片 等步骤，只有最终产物落盘
+
+用法：
+    with Pipeline.merge(["a.pdf", "b.pdf"]) as pipe:
+        pipe.shrink(zoom=1.5, jpeg_quality=60).split([10, 20])
+        outputs = pipe.save_all("out")
+
+    with Pipeline.open("book.pdf") as pipe:
+        pipe.split([50]).to_images("images", output_format="JPEG")
+
+- 各步骤之间传递 fitz.Document，不再写中间 PDF 再 fitz.open 重新解析
+- 拆分后流水线持有多份文档，后续步骤逐份处理
+- 传入的已打开文档由调用方负责关闭；流水线自己打开或生成的文档在被替换或 close() 时释放
+"""
+
+import os
+from typing import Callable, List, Optional, Sequence
+
+import fitz  # PyMuPDF
+
+from encoder_profiles import DEFAULT_PROFILE
+from pdf_merge import merge_documents
+from pdf_split import split_document
+from pdf_shrink import shrink_document
+from pdf2images import convert_pdf_to_images
+from pdf2imagepdf import convert_pdf_to_image_only_pdf
+from pdf2oneimage import convert_pdf_to_single_image
+from img2pdf import compose_document_from_segments, split_image_segments
+from pdf_source import PdfSource, open_pdf, source_stem
+
+ProgressCb = Optional[Callable[[float, str], None]]
+
+
+class Pipeline:
+    """持有当前步骤的结果文档（一份或拆分后的多份）及其默认输出名。"""
+
+    def __init__(self, docs: List["fitz.Document"], names: List[str], owned: List[bool],
+                 progress_cb: ProgressCb = None):
+        self.docs = docs
+        self.names = names
+        self._owned = owned
+        self.progress_cb = progress_cb
+        self._step = 0
+
+    # ---- 起点 ----
+    @classmethod
+    def open(cls, src: PdfSource, progress_cb: ProgressCb = None) -> "Pipeline":
+        doc, owned = open_pdf(src)
+        return cls([doc], [source_stem(src)], [owned], progress_cb)
+
+    @classmethod
+    def merge(cls, sources: List[PdfSource], progress_cb: ProgressCb = None,
+              keep_toc: bool = True, keep_metadata: bool = True) -> "Pipeline":
+        pipe = cls([], [], [], progress_cb)
+        pipe._step = 1
+        doc = merge_documents(sources, pipe._sub_cb("合并", 0, 1), keep_toc=keep_toc, keep_metadata=keep_metadata)
+        pipe._replace([doc], ["merged"])
+        return pipe
+
+    @classmethod
+    def from_images(cls, image_paths: Sequence[str], segment_height_px: int, paper_name: str = "A4",
+                    landscape: bool = False, margin_pt: float = 20.0, profile: str = DEFAULT_PROFILE,
+                    progress_cb: ProgressCb = None) -> "Pipeline":
+        """长图按高度切片后排版为一份 PDF（同 img2pdf），作为流水线起点。"""
+        segments = []
+        for p in image_paths:
+            segments.extend(split_image_segments(p, segment_height_px))
+        doc = compose_document_from_segments(segments, paper_name, landscape, margin_pt, profile)
+        stem = os.path.splitext(os.path.basename(image_paths[0]))[0] if image_paths else "images"
+        return cls([doc], [stem], [True], progress_cb)
+
+    # ---- 中间步骤（返回 self，可链式调用） ----
+    def shrink(self, **kwargs) -> "Pipeline":
+        """参数同 pdf_shrink.shrink_document（zoom、target_height_px、jpeg_quality、grayscale 等）。"""
+        self._begin()
+        n = len(self.docs)
+        out = [shrink_document(d, progress_cb=self._sub_cb("瘦身", k, n), **kwargs) for k, d in enumerate(self.docs)]
+        self._replace(out, [f"{name}_shrink" for name in self.names])
+        return self
+
+    def split(self, split_points: Optional[List[int]] = None) -> "Pipeline":
+        """按拆分点拆分；已是多份文档时对每份分别按同一组拆分点处理。"""
+        self._begin()
+        docs: List["fitz.Document"] = []
+        names: List[str] = []
+        try:
+            for k, (d, name) in enumerate(zip(self.docs, self.names)):
+                parts = split_document(d, split_points)
+                docs.extend(parts)
+                names.extend(f"{name}_part{i}" for i in range(1, len(parts) + 1))
+                self._report("拆分", (k + 1) * 100.0 / len(self.docs), f"{name} 拆为 {len(parts)} 份")
+        except Exception:
+            for d in docs:
+                d.close()
+            raise
+        self._replace(docs, names)
+        return self
+
+    # ---- 终点：写出最终产物 ----
+    def save(self, output_path: str) -> str:
+        if len(self.docs) != 1:
+            raise ValueError(f"当前有 {len(self.docs)} 份文档，请使用 save_all")
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        self.docs[0].save(output_path)
+        return output_path
+
+    def save_all(self, output_folder: str, names: Optional[List[str]] = None) -> List[str]:
+        """逐份保存为 PDF；names 缺省时使用流水线生成的名称（如 merged_shrink_part1.pdf）。"""
+        self._begin()
+        os.makedirs(output_folder, exist_ok=True)
+        outputs = []
+        for k, d in enumerate(self.docs):
+            name = names[k] if names and k < len(names) else f"{self.names[k]}.pdf"
+            path = os.path.join(output_folder, name)
+            d.save(path)
+            outputs.append(path)
+            self._report("保存", (k + 1) * 100.0 / len(self.docs), f"已保存 {name}")
+        return outputs
+
+    def tobytes(self) -> List[bytes]:
+        """序列化为 PDF 字节串（供上传或交给其他进程），不落盘。"""
+        return [d.tobytes(garbage=3, deflate=True) for d in self.docs]
+
+    def to_images(self, output_dir: str, **kwargs) -> List[str]:
+        """逐页转图片（参数同 pdf2images.convert_pdf_to_images）；多份文档时各自输出到 output_dir/<名称>。"""
+        self._begin()
+        n = len(self.docs)
+        outputs = []
+        for k, (d, name) in enumerate(zip(self.docs, self.names)):
+            target = output_dir if n == 1 else os.path.join(output_dir, name)
+            outputs.append(convert_pdf_to_images(d, output_dir=target, progress_cb=self._sub_cb("转图片", k, n), **kwargs))
+        return outputs
+
+    def to_single_image(self, output_dir: str, output_format: str = "PNG", **kwargs) -> List[str]:
+        """每份文档拼接为一张长图（参数同 pdf2oneimage.convert_pdf_to_single_image）。"""
+        self._begin()
+        n = len(self.docs)
+        ext = "jpg" if output_format.upper() in ("JPEG", "JPG") else "png"
+        outputs = []
+        for k, (d, name) in enumerate(zip(self.docs, self.names)):
+            path = os.path.join(output_dir, f"{name}.{ext}")
+            outputs.append(convert_pdf_to_single_image(d, path, output_format=output_format,
+                                                       progress_cb=self._sub_cb("拼长图", k, n), **kwargs))
+        return outputs
+
+    def to_image_pdf(self, output_dir: str, **kwargs) -> List[str]:
+        """每份文档转为纯图 PDF（参数同 pdf2imagepdf.convert_pdf_to_image_only_pdf）。"""
+        self._begin()
+        n = len(self.docs)
+        outputs = []
+        for k, (d, name) in enumerate(zip(self.docs, self.names)):
+            path = os.path.join(output_dir, f"{name}_image.pdf")
+            outputs.append(convert_pdf_to_image_only_pdf(d, path, progress_cb=self._sub_cb("转纯图PDF", k, n), **kwargs))
+        return outputs
+
+    # ---- 生命周期 ----
+    def close(self) -> None:
+        self._replace([], [])
+
+    def __enter__(self) -> "Pipeline":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    # ---- 内部 ----
+    def _begin(self) -> None:
+        if not self.docs:
+            raise ValueError("流水线中没有文档")
+        self._step += 1
+
+    def _replace(self, docs: List["fitz.Document"], names: List[str]) -> None:
+        """替换当前文档；被替换的文档中由流水线持有的立即关闭，释放内存。"""
+        for d, owned in zip(self.docs, self._owned):
+            if owned and d not in docs:
+                try:
+                    d.close()
+                except Exception:
+                    pass
+        self.docs = docs
+        self.names = names
+        self._owned = [True] * len(docs)
+
+    def _report(self, label: str, pct: float, msg: str) -> None:
+        if self.progress_cb:
+            try:
+                self.progress_cb(pct, f"[{self._step}·{label}] {msg}")
+            except Exception:
+                pass
+
+    def _sub_cb(self, label: str, index: int, count: int) -> Callable[[float, str], None]:
+        """把单份文档的 0-100 进度映射到本步骤的整体进度。"""
+        def cb(pct: float, msg: str) -> None:
+            self._report(label, (index + float(pct) / 100.0) * 100.0 / max(1, count), msg)
+        return cb
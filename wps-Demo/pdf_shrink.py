@@ -2,14 +2,16 @@
 # -*- coding: utf-8 -*-
 
 import os
-import io
-from typing import Optional, Callable
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Callable, Dict, List, Tuple
 
 import fitz  # PyMuPDF
 from PIL import Image
 
-from PySide6.QtCore import Qt, QThread, Signal, QUrl, QSize
-from PySide6.QtGui import QDesktopServices
+from PySide6.QtCore import Qt, QThread, Signal, QUrl, QSize, QTimer
+from PySide6.QtGui import QDesktopServices, QFont
 from PySide6.QtWidgets import (
     QApplication,
     QWidget,
@@ -26,36 +28,51 @@ from PySide6.QtWidgets import (
     QProgressBar,
     QFormLayout,
     QStyle,
+    QSlider,
+    QTableWidget,
+    QTableWidgetItem,
+    QHeaderView,
+    QAbstractItemView,
 )
 
-from ui_style_nb import build_style, compute_scale, dp
+from encoder_profiles import (
+    DEFAULT_PROFILE, PROFILE_LABELS, PROFILE_NAMES, encode_image, encode_pixmap, normalize_profile, pixmap_to_image,
+)
+from memory_governor import default_governor, estimate_render_bytes
+from page_dedup import RasterDeduper
+from pdf_source import PdfSource, open_pdf
+from ui_style_nb import apply_style, compute_scale, dp
 
 
-def shrink_pdf_to_image_pdf(
-    input_pdf_path: str,
-    output_pdf_path: str,
+def shrink_document(
+    src: PdfSource,
     zoom: float = 1.5,
     target_height_px: Optional[int] = None,
     jpeg_quality: int = 70,
     grayscale: bool = False,
     progress_cb: Optional[Callable[[float, str], None]] = None,
-) -> str:
+    profile: str = DEFAULT_PROFILE,
+    dedupe: bool = True,
+    perceptual_threshold: Optional[float] = None,
+) -> "fitz.Document":
     """
     通过将每页渲染为 JPEG 并写入新 PDF 来进行“瘦身”。
     - 通过降低缩放或指定目标高度减少分辨率
     - 通过设置 JPEG 质量降低体积
     - 可选灰度以进一步减少体积
-    """
-    if not os.path.exists(input_pdf_path):
-        raise FileNotFoundError(f"输入文件不存在: {input_pdf_path}")
-    if not input_pdf_path.lower().endswith(".pdf"):
-        raise ValueError("输入文件必须是PDF格式")
+    - 编码档位（fast/balanced/smallest）控制 JPEG 的 Huffman 优化与渐进式编码
+    - 重复页（空白页、分隔页等）复用已嵌入的图片 xref；perceptual_threshold 为近似匹配允许的差异像素占比（见 page_dedup）
 
+    返回新的内存文档（由调用方保存并关闭）；src 可为路径、字节串或已打开的文档。
+    """
     jpeg_quality = int(max(30, min(95, jpeg_quality)))
+    profile = normalize_profile(profile)
 
-    doc = fitz.open(input_pdf_path)
+    doc, owned = open_pdf(src)
     out_doc = fitz.open()
     total = len(doc)
+    deduper = RasterDeduper(perceptual_threshold) if dedupe else None
+    governor = default_governor()
     try:
         for i in range(total):
             page = doc[i]
@@ -66,41 +83,227 @@ def shrink_pdf_to_image_pdf(
             else:
                 scale = max(0.1, float(zoom))
             mat = fitz.Matrix(scale, scale)
-            try:
-                cs = fitz.csGRAY if grayscale else None
-                pix = page.get_pixmap(matrix=mat, alpha=False, colorspace=cs)
-            except Exception:
-                pix = page.get_pixmap(matrix=mat, alpha=False)
-
-            # 转为 JPEG（可控质量）
-            img = Image.open(io.BytesIO(pix.tobytes("png")))
-            if grayscale:
+            # 渲染前按页面尺寸申请内存预算，预算不足时等待其他转换释放
+            with governor.reserve(estimate_render_bytes(page, scale, channels=1 if grayscale else 3)):
                 try:
-                    img = img.convert("L")
+                    cs = fitz.csGRAY if grayscale else None
+                    pix = page.get_pixmap(matrix=mat, alpha=False, colorspace=cs)
                 except Exception:
-                    pass
-            bio = io.BytesIO()
-            img.save(bio, format="JPEG", quality=jpeg_quality, optimize=True)
-            jpeg_bytes = bio.getvalue()
+                    pix = page.get_pixmap(matrix=mat, alpha=False)
 
-            new_page = out_doc.new_page(width=w_pt, height=h_pt)
-            rect = fitz.Rect(0.0, 0.0, w_pt, h_pt)
-            new_page.insert_image(rect, stream=jpeg_bytes)
+                # 转为 JPEG（可控质量）；灰度渲染的 pixmap 为单通道，直接编码为灰度 JPEG
+                if grayscale and pix.n != 1:
+                    try:
+                        pix = fitz.Pixmap(fitz.csGRAY, pix)
+                    except Exception:
+                        pass
+                new_page = out_doc.new_page(width=w_pt, height=h_pt)
+                rect = fitz.Rect(0.0, 0.0, w_pt, h_pt)
+                xref, token = deduper.lookup(pix) if deduper else (None, None)
+                if xref:
+                    # 重复页：引用已嵌入的图片，跳过 JPEG 编码
+                    new_page.insert_image(rect, xref=xref)
+                    msg = f"第 {i+1} 页与前文重复，复用图像"
+                else:
+                    jpeg_bytes = encode_pixmap(pix, "JPEG", jpeg_quality, profile)
+                    xref = new_page.insert_image(rect, stream=jpeg_bytes)
+                    if deduper:
+                        deduper.add(token, xref)
+                    msg = f"处理第 {i+1} 页"
+                pix = None  # 先释放栅格再归还预算
             if progress_cb:
                 try:
-                    progress_cb((i + 1) * 100.0 / total, f"处理第 {i+1} 页")
+                    progress_cb((i + 1) * 100.0 / total, msg)
                 except Exception:
                     pass
+    except Exception:
+        out_doc.close()
+        raise
+    finally:
+        if owned:
+            try:
+                doc.close()
+            except Exception:
+                pass
+    return out_doc
+
+
+def shrink_pdf_to_image_pdf(
+    input_pdf_path: PdfSource,
+    output_pdf_path: str,
+    zoom: float = 1.5,
+    target_height_px: Optional[int] = None,
+    jpeg_quality: int = 70,
+    grayscale: bool = False,
+    progress_cb: Optional[Callable[[float, str], None]] = None,
+    profile: str = DEFAULT_PROFILE,
+    dedupe: bool = True,
+    perceptual_threshold: Optional[float] = None,
+) -> str:
+    """瘦身并保存到 output_pdf_path，参数见 shrink_document。"""
+    out_doc = shrink_document(input_pdf_path, zoom, target_height_px, jpeg_quality, grayscale, progress_cb,
+                              profile, dedupe, perceptual_threshold)
+    try:
+        os.makedirs(os.path.dirname(output_pdf_path) or ".", exist_ok=True)
+        out_doc.save(output_pdf_path)
     finally:
+        out_doc.close()
+    return output_pdf_path
+
+
+# ---- 体积预估：样本页只渲染一次，之后任意参数组合只做缩放与编码 ----
+ESTIMATE_SAMPLE_PAGES = 4
+# 与界面缩放上限一致，更小的缩放由该栅格缩小得到
+ESTIMATE_REF_ZOOM = 3.0
+# 每页 PDF 对象（页面字典、内容流、图片字典）的大致开销
+_PAGE_OVERHEAD_BYTES = 600
+
+
+def sample_page_indices(total: int, count: int = ESTIMATE_SAMPLE_PAGES) -> List[int]:
+    """在文档中均匀取样（取各段中点），页数不足时全取。"""
+    if total <= 0:
+        return []
+    if total <= count:
+        return list(range(total))
+    step = total / float(count)
+    return sorted({min(total - 1, int(step * k + step / 2)) for k in range(count)})
+
+
+class ShrinkEstimator:
+    """
+    渲染少量样本页一次，按 (缩放/目标高度, 质量, 灰度, 编码档位) 估算整份文档瘦身后的体积与耗时。
+    - 样本栅格按参考缩放渲染并缓存，不同缩放只做图像缩放
+    - sweep() 并行编码多组参数；结果按参数缓存，滑杆来回拖动不重复计算
+    """
+
+    def __init__(self, input_pdf_path: str, sample_pages: int = ESTIMATE_SAMPLE_PAGES,
+                 ref_zoom: float = ESTIMATE_REF_ZOOM):
+        self.ref_zoom = float(ref_zoom)
+        self.samples: List[Tuple[float, float, Image.Image]] = []
+        doc = fitz.open(input_pdf_path)
         try:
+            self.total_pages = len(doc)
+            mpx = 0.0
+            t0 = time.perf_counter()
+            for i in sample_page_indices(self.total_pages, sample_pages):
+                page = doc[i]
+                with default_governor().reserve(estimate_render_bytes(page, self.ref_zoom)):
+                    pix = page.get_pixmap(matrix=fitz.Matrix(self.ref_zoom, self.ref_zoom), alpha=False)
+                    mpx += pix.width * pix.height / 1e6
+                    self.samples.append((float(page.rect.width), float(page.rect.height), pixmap_to_image(pix)))
+                    pix = None
+            # 渲染耗时近似与像素数成正比
+            self.render_seconds_per_mpx = (time.perf_counter() - t0) / mpx if mpx else 0.0
+        finally:
             doc.close()
-        except Exception:
-            pass
+        self._cache: Dict[tuple, dict] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _scale(h_pt: float, zoom: float, target_height_px: Optional[int]) -> float:
+        # 与 shrink_pdf_to_image_pdf 的取值规则保持一致
+        if target_height_px and target_height_px > 0:
+            return max(0.1, float(target_height_px) / h_pt)
+        return max(0.1, float(zoom))
+
+    def estimate(self, zoom: float, target_height_px: Optional[int], quality: int,
+                 grayscale: bool, profile: str = DEFAULT_PROFILE) -> dict:
+        quality = int(max(30, min(95, quality)))
+        profile = normalize_profile(profile)
+        key = (round(float(zoom), 4), int(target_height_px or 0), quality, bool(grayscale), profile)
+        with self._lock:
+            hit = self._cache.get(key)
+        if hit is not None:
+            return hit
+
+        n = len(self.samples)
+        total_bytes = 0
+        encode_s = 0.0
+        mpx = 0.0
+        for w_pt, h_pt, img in self.samples:
+            s = self._scale(h_pt, zoom, target_height_px)
+            size = (max(1, round(w_pt * s)), max(1, round(h_pt * s)))
+            im = img if size == img.size else img.resize(size, Image.BILINEAR)
+            if grayscale:
+                im = im.convert("L")
+            t0 = time.perf_counter()
+            total_bytes += len(encode_image(im, "JPEG", quality, profile))
+            encode_s += time.perf_counter() - t0
+            mpx += size[0] * size[1] / 1e6
+        per_page = total_bytes / float(n) if n else 0.0
+        per_page_s = (encode_s + self.render_seconds_per_mpx * mpx) / float(n) if n else 0.0
+        result = {
+            "zoom": float(zoom),
+            "target_height_px": int(target_height_px or 0) or None,
+            "quality": quality,
+            "grayscale": bool(grayscale),
+            "profile": profile,
+            "per_page_bytes": int(per_page),
+            "bytes": int((per_page + _PAGE_OVERHEAD_BYTES) * self.total_pages),
+            "seconds": per_page_s * self.total_pages,
+        }
+        with self._lock:
+            self._cache[key] = result
+        return result
+
+    def sweep(self, specs: List[tuple], max_workers: Optional[int] = None) -> List[dict]:
+        """并行估算多组参数；specs 为 estimate() 的位置参数元组列表，结果顺序与之对应。"""
+        if not specs:
+            return []
+        workers = max_workers or min(4, os.cpu_count() or 1, len(specs))
+        # 每个任务同时持有一页缩放后的样本图与编码缓冲；剩余内存预算不足时降低并发
+        per_task = max((self._task_bytes(*spec[:2]) for spec in specs), default=0)
+        workers = default_governor().suggested_workers(per_task, workers)
+
+        def run(spec: tuple) -> dict:
+            with default_governor().reserve(per_task):
+                return self.estimate(*spec)
+
+        # Pillow 的缩放与 JPEG 编码会释放 GIL，线程池即可并行
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(run, specs))
+
+    def _task_bytes(self, zoom: float, target_height_px: Optional[int]) -> int:
+        return max((estimate_render_bytes(fitz.Rect(0, 0, w_pt, h_pt), self._scale(h_pt, zoom, target_height_px))
+                    for w_pt, h_pt, _img in self.samples), default=0)
+
+
+def format_size(n: float) -> str:
+    for unit in ("B", "KB", "MB"):
+        if n < 1024:
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024.0
+    return f"{n:.2f} GB"
+
+
+class _EstimatorWorker(QThread):
+    ready = Signal(object)
+    failed = Signal(str)
 
-    os.makedirs(os.path.dirname(output_pdf_path) or ".", exist_ok=True)
-    out_doc.save(output_pdf_path)
-    out_doc.close()
-    return output_pdf_path
+    def __init__(self, pdf_path: str, parent: Optional[QWidget] = None):
+        super().__init__(parent)
+        self.pdf_path = pdf_path
+
+    def run(self):
+        try:
+            self.ready.emit(ShrinkEstimator(self.pdf_path))
+        except Exception as e:
+            self.failed.emit(str(e))
+
+
+class _SweepWorker(QThread):
+    done = Signal(object)
+
+    def __init__(self, estimator: ShrinkEstimator, specs: List[tuple], parent: Optional[QWidget] = None):
+        super().__init__(parent)
+        self.estimator = estimator
+        self.specs = specs
+
+    def run(self):
+        try:
+            self.done.emit(self.estimator.sweep(self.specs))
+        except Exception:
+            self.done.emit([])
 
 
 class _ShrinkWorker(QThread):
@@ -116,6 +319,7 @@ class _ShrinkWorker(QThread):
         target_height_px: Optional[int],
         jpeg_quality: int,
         grayscale: bool,
+        profile: str = DEFAULT_PROFILE,
         parent: Optional[QWidget] = None,
     ):
         super().__init__(parent)
@@ -125,6 +329,7 @@ class _ShrinkWorker(QThread):
         self.target_height_px = target_height_px
         self.jpeg_quality = jpeg_quality
         self.grayscale = grayscale
+        self.profile = profile
 
     def run(self):
         try:
@@ -138,6 +343,7 @@ class _ShrinkWorker(QThread):
                 jpeg_quality=self.jpeg_quality,
                 grayscale=self.grayscale,
                 progress_cb=cb,
+                profile=self.profile,
             )
             self.finished.emit(out)
         except Exception as e:
@@ -157,7 +363,12 @@ class PDFShrinkWindow(QWidget):
         self.embedded = embedded
         self.setMinimumSize(dp(self.scale, 840), dp(self.scale, 520))
 
-        self.setStyleSheet(build_style(self.scale))
+        self._estimator: Optional[ShrinkEstimator] = None
+        self._estimator_worker: Optional[_EstimatorWorker] = None
+        self._sweep_worker: Optional[_SweepWorker] = None
+        self._sweep_pending = False
+
+        apply_style(self, self.scale)
         self._build_ui()
 
     def _build_ui(self):
@@ -223,13 +434,53 @@ class PDFShrinkWindow(QWidget):
         self.spin_zoom = QDoubleSpinBox(); self.spin_zoom.setRange(0.5, 3.0); self.spin_zoom.setSingleStep(0.25); self.spin_zoom.setValue(1.5); self.spin_zoom.setSuffix("x")
         self.spin_height = QSpinBox(); self.spin_height.setRange(0, 20000); self.spin_height.setValue(1200); self.spin_height.setSuffix(" px"); self.spin_height.setSpecialValueText("按缩放")
         self.spin_quality = QSpinBox(); self.spin_quality.setRange(30, 95); self.spin_quality.setValue(70)
+        self.slider_quality = QSlider(Qt.Horizontal); self.slider_quality.setRange(30, 95); self.slider_quality.setValue(70)
+        self.slider_quality.valueChanged.connect(self.spin_quality.setValue)
+        self.spin_quality.valueChanged.connect(self.slider_quality.setValue)
+        quality_row = QHBoxLayout()
+        quality_row.addWidget(self.slider_quality, 1)
+        quality_row.addWidget(self.spin_quality)
         self.combo_color = QComboBox(); self.combo_color.addItems(["彩色", "灰度"])
+        self.combo_profile = QComboBox()
+        for name in PROFILE_NAMES:
+            self.combo_profile.addItem(PROFILE_LABELS[name], name)
+        self.combo_profile.setCurrentIndex(PROFILE_NAMES.index(DEFAULT_PROFILE))
         form.addRow(QLabel("缩放"), self.spin_zoom)
         form.addRow(QLabel("导出高度(px)"), self.spin_height)
-        form.addRow(QLabel("JPEG质量"), self.spin_quality)
+        form.addRow(QLabel("JPEG质量"), quality_row)
         form.addRow(QLabel("颜色"), self.combo_color)
+        form.addRow(QLabel("编码档位"), self.combo_profile)
         lay.addLayout(form)
 
+        # 体积预估：样本页只渲染一次，调整参数时实时刷新
+        est_row = QHBoxLayout()
+        self.btn_estimate = QPushButton("预估体积")
+        self.btn_estimate.setMinimumHeight(dp(self.scale, 32))
+        self.btn_estimate.clicked.connect(self._start_estimate)
+        self.lbl_estimate = QLabel("选择PDF后自动预估输出体积")
+        self.lbl_estimate.setWordWrap(True)
+        est_row.addWidget(self.btn_estimate)
+        est_row.addWidget(self.lbl_estimate, 1)
+        lay.addLayout(est_row)
+
+        self.table_estimate = QTableWidget(0, 4)
+        self.table_estimate.setHorizontalHeaderLabels(["质量", "分辨率", "预计体积", "预计耗时"])
+        self.table_estimate.verticalHeader().setVisible(False)
+        self.table_estimate.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table_estimate.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table_estimate.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table_estimate.setMinimumHeight(dp(self.scale, 150))
+        self.table_estimate.cellDoubleClicked.connect(self._apply_estimate_row)
+        lay.addWidget(self.table_estimate)
+
+        self._sweep_timer = QTimer(self)
+        self._sweep_timer.setSingleShot(True)
+        self._sweep_timer.setInterval(120)
+        self._sweep_timer.timeout.connect(self._run_sweep)
+        for sig in (self.spin_zoom.valueChanged, self.spin_height.valueChanged, self.spin_quality.valueChanged,
+                    self.combo_color.currentIndexChanged, self.combo_profile.currentIndexChanged):
+            sig.connect(self._schedule_sweep)
+
         row = QHBoxLayout()
         self.btn_start = QPushButton("开始瘦身")
         self.btn_start.setMinimumHeight(dp(self.scale, 36))
@@ -254,10 +505,122 @@ class PDFShrinkWindow(QWidget):
     def _choose_pdf(self):
         path, _ = QFileDialog.getOpenFileName(self, "选择PDF文件", os.getcwd(), "PDF 文件 (*.pdf)")
         if path:
-            self.edit_pdf.setText(path)
-            base = os.path.splitext(os.path.basename(path))[0]
-            out_dir = os.path.dirname(path) or "."
-            self.edit_out.setText(os.path.join(out_dir, f"{base}_shrink.pdf"))
+            self.open_files([path])
+
+    def open_files(self, paths: List[str]) -> None:
+        """外部打开文件（命令行参数或单实例转发），只取第一个文件。"""
+        if not paths:
+            return
+        path = paths[0]
+        self.edit_pdf.setText(path)
+        base = os.path.splitext(os.path.basename(path))[0]
+        out_dir = os.path.dirname(path) or "."
+        self.edit_out.setText(os.path.join(out_dir, f"{base}_shrink.pdf"))
+        self._estimator = None
+        self.table_estimate.setRowCount(0)
+        self._start_estimate()
+
+    # --- 体积预估 ---
+    def _current_params(self) -> Tuple[float, Optional[int], int, bool, str]:
+        h = int(self.spin_height.value())
+        return (
+            float(self.spin_zoom.value()),
+            h if h > 0 else None,
+            int(self.spin_quality.value()),
+            self.combo_color.currentText() == "灰度",
+            self.combo_profile.currentData() or DEFAULT_PROFILE,
+        )
+
+    def _start_estimate(self):
+        pdf = self.edit_pdf.text().strip()
+        if not pdf or not os.path.exists(pdf):
+            self.lbl_estimate.setText("请先选择PDF文件")
+            return
+        if self._estimator_worker is not None and self._estimator_worker.isRunning():
+            return
+        self.btn_estimate.setEnabled(False)
+        self.lbl_estimate.setText("正在渲染样本页...")
+        self._estimator_worker = _EstimatorWorker(pdf, self)
+        self._estimator_worker.ready.connect(self._on_estimator_ready)
+        self._estimator_worker.failed.connect(self._on_estimator_failed)
+        self._estimator_worker.start()
+
+    def _on_estimator_ready(self, estimator: ShrinkEstimator):
+        self.btn_estimate.setEnabled(True)
+        # 渲染期间用户可能已换了文件
+        if self._estimator_worker is None or self._estimator_worker.pdf_path != self.edit_pdf.text().strip():
+            self._start_estimate()
+            return
+        self._estimator = estimator
+        self._run_sweep()
+
+    def _on_estimator_failed(self, msg: str):
+        self.btn_estimate.setEnabled(True)
+        self.lbl_estimate.setText(f"预估失败：{msg}")
+
+    def _schedule_sweep(self, *_):
+        if self._estimator is not None:
+            self._sweep_timer.start()
+
+    def _sweep_specs(self) -> List[tuple]:
+        zoom, target_h, q, gray, profile = self._current_params()
+        qualities = sorted({40, 55, 70, 85, q})
+        specs = [(zoom, target_h, qq, gray, profile) for qq in qualities]
+        # 按缩放导出时，额外对比几档常用缩放（当前质量）
+        if target_h is None:
+            for z in (1.0, 1.5, 2.0):
+                if abs(z - zoom) > 1e-6:
+                    specs.append((z, None, q, gray, profile))
+        return specs
+
+    def _run_sweep(self):
+        if self._estimator is None:
+            return
+        if self._sweep_worker is not None and self._sweep_worker.isRunning():
+            self._sweep_pending = True
+            return
+        self._sweep_pending = False
+        self._sweep_worker = _SweepWorker(self._estimator, self._sweep_specs(), self)
+        self._sweep_worker.done.connect(self._on_sweep_done)
+        self._sweep_worker.start()
+
+    def _on_sweep_done(self, results: list):
+        if self._sweep_pending:
+            self._run_sweep()
+            return
+        self._fill_estimate_table(results)
+
+    def _fill_estimate_table(self, results: List[dict]):
+        current = self._current_params()
+        self.table_estimate.setRowCount(len(results))
+        bold = QFont(self.table_estimate.font())
+        bold.setBold(True)
+        for r, res in enumerate(results):
+            res_text = f"高 {res['target_height_px']} px" if res["target_height_px"] else f"{res['zoom']:g}x"
+            cells = [str(res["quality"]), res_text, format_size(res["bytes"]), f"{res['seconds']:.1f} 秒"]
+            is_current = (abs(res["zoom"] - current[0]) < 1e-6 and res["target_height_px"] == current[1]
+                          and res["quality"] == current[2])
+            for c, text in enumerate(cells):
+                item = QTableWidgetItem(text)
+                item.setTextAlignment(Qt.AlignCenter)
+                item.setData(Qt.UserRole, (res["zoom"], res["target_height_px"], res["quality"]))
+                if is_current:
+                    item.setFont(bold)
+                self.table_estimate.setItem(r, c, item)
+            if is_current:
+                self.lbl_estimate.setText(
+                    f"共 {self._estimator.total_pages} 页，按当前设置预计 {format_size(res['bytes'])}，"
+                    f"约 {res['seconds']:.1f} 秒（双击表格行可套用该设置）"
+                )
+
+    def _apply_estimate_row(self, row: int, _col: int):
+        item = self.table_estimate.item(row, 0)
+        if item is None:
+            return
+        zoom, target_h, q = item.data(Qt.UserRole)
+        self.spin_zoom.setValue(zoom)
+        self.spin_height.setValue(target_h or 0)
+        self.spin_quality.setValue(q)
 
     def _choose_output(self):
         path, _ = QFileDialog.getSaveFileName(self, "选择输出PDF", self.edit_out.text() or "output.pdf", "PDF 文件 (*.pdf)")
@@ -285,7 +648,8 @@ class PDFShrinkWindow(QWidget):
         target_h = h if h > 0 else None
         q = int(self.spin_quality.value())
         gray = (self.combo_color.currentText() == "灰度")
-        self._worker = _ShrinkWorker(pdf, out, zoom, target_h, q, gray)
+        profile = self.combo_profile.currentData() or DEFAULT_PROFILE
+        self._worker = _ShrinkWorker(pdf, out, zoom, target_h, q, gray, profile)
         self._worker.progress.connect(self.progress.setValue)
         self._worker.finished.connect(self._on_ok)
         self._worker.failed.connect(self._on_fail)
@@ -321,7 +685,7 @@ class PDFShrinkWindow(QWidget):
 
     def _apply_style(self):
         try:
-            self.setStyleSheet(build_style(self.scale))
+            apply_style(self, self.scale)
         except Exception:
             pass
 
@@ -343,7 +707,7 @@ class PDFShrinkWindow(QWidget):
             if hasattr(self, 'panel_layout') and self.panel_layout:
                 self.panel_layout.setContentsMargins(dp(self.scale, 10), dp(self.scale, 10), dp(self.scale, 10), dp(self.scale, 10))
                 self.panel_layout.setSpacing(dp(self.scale, 8))
-            for w in (getattr(self, 'btn_choose_pdf', None), getattr(self, 'edit_pdf', None), getattr(self, 'btn_choose_out', None), getattr(self, 'edit_out', None)):
+            for w in (getattr(self, 'btn_choose_pdf', None), getattr(self, 'edit_pdf', None), getattr(self, 'btn_choose_out', None), getattr(self, 'edit_out', None), getattr(self, 'btn_estimate', None)):
                 try:
                     if w:
                         w.setMinimumHeight(dp(self.scale, 32))
@@ -357,5 +721,7 @@ class PDFShrinkWindow(QWidget):
                     pass
             if hasattr(self, 'progress') and self.progress:
                 self.progress.setMinimumHeight(dp(self.scale, 22))
+            if hasattr(self, 'table_estimate') and self.table_estimate:
+                self.table_estimate.setMinimumHeight(dp(self.scale, 150))
         except Exception:
             pass
\ No newline at end of file
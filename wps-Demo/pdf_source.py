@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+PDF 输入来源（各功能函数共用，不依赖 Qt）
+
+功能函数的输入既可以是文件路径，也可以是已打开的 fitz.Document 或 PDF 字节串，
+便于 pdf_pipeline 在多个步骤之间直接传递内存文档，不落盘中间文件。
+调用方传入的 Document 由调用方负责关闭。
+"""
+
+import os
+from typing import Tuple, Union
+
+import fitz  # PyMuPDF
+
+PdfSource = Union[str, bytes, "fitz.Document"]
+
+
+def open_pdf(src: PdfSource, check_ext: bool = True) -> Tuple["fitz.Document", bool]:
+    """返回 (文档, 是否由本函数打开)；第二项为 True 时调用方用完需关闭。
+
+    check_ext 为 True 时沿用各转换函数原有的校验：路径必须以 .pdf 结尾。
+    """
+    if isinstance(src, fitz.Document):
+        if src.is_closed:
+            raise ValueError("输入文档已关闭")
+        return src, False
+    if isinstance(src, (bytes, bytearray, memoryview)):
+        return fitz.open("pdf", bytes(src)), True
+    if not os.path.exists(src):
+        raise FileNotFoundError(f"输入文件不存在: {src}")
+    if check_ext and not str(src).lower().endswith(".pdf"):
+        raise ValueError("输入文件必须是PDF格式")
+    return fitz.open(src), True
+
+
+def source_path(src: PdfSource) -> str:
+    """来源对应的文件路径；内存文档没有路径时返回空串。"""
+    if isinstance(src, fitz.Document):
+        return src.name or ""
+    if isinstance(src, (bytes, bytearray, memoryview)):
+        return ""
+    return src
+
+
+def source_stem(src: PdfSource, default: str = "document") -> str:
+    """用于生成默认输出文件名的主干名。"""
+    path = source_path(src)
+    return os.path.splitext(os.path.basename(path))[0] if path else default
@@ -5,13 +5,15 @@
 LZ-PDF 拆分 GUI（PyQt5，无系统标题栏）
 
 功能与界面分离：
-- 功能层：split_pdf、compute_smart_split_points、render_page_image、get_pdf_page_count。
+- 功能层：split_pdf（split_document 返回内存文档供 pdf_pipeline 串联）、compute_smart_split_points、render_page_image、get_pdf_page_count；
+  智能建议见 split_suggest（书签 / 低分辨率页面分析）。
 - 界面层：PDFSplitWindow（无标题栏、拖拽移动、深色简洁样式）。
 
 依赖：PyQt5、PyMuPDF。
 """
 
 import os
+import multiprocessing
 from typing import List, Optional, Tuple
 
 import fitz  # PyMuPDF
@@ -41,7 +43,10 @@ from PySide6.QtWidgets import (
 from PySide6.QtGui import QCursor
 from PySide6.QtCore import QUrl
 from PySide6.QtGui import QDesktopServices
-from ui_style_nb import build_style, compute_scale, dp
+from pdf_source import PdfSource, open_pdf, source_path, source_stem
+from split_suggest import suggest_split_points
+from ui_style_nb import apply_style, compute_scale, dp
+from layout_service import factor_bucket, schedule_reflow, size_bucket_changed
 
 
 # -----------------------------
@@ -75,18 +80,8 @@ def compute_smart_split_points(total_pages: int) -> List[int]:
     return [p for p in pts if 1 <= p < total_pages]
 
 
-def split_pdf(
-    input_pdf_path: str,
-    split_points: Optional[List[int]] = None,
-    output_folder: Optional[str] = None,
-    custom_names: Optional[List[str]] = None,
-) -> List[str]:
-    if not os.path.exists(input_pdf_path):
-        raise FileNotFoundError(f"文件不存在: {input_pdf_path}")
-
-    doc = fitz.open(input_pdf_path)
-    total_pages = len(doc)
-
+def split_segments(total_pages: int, split_points: Optional[List[int]] = None) -> List[Tuple[int, int]]:
+    """按拆分点（新段起始页，1 基）生成 [(起始页, 结束页), ...]（0 基闭区间）。"""
     points = sorted(set(split_points or []))
     points = [p for p in points if 1 <= p < total_pages]
 
@@ -96,29 +91,61 @@ def split_pdf(
         segments.append((start, p - 1))
         start = p
     segments.append((start, total_pages - 1))
+    return segments
+
+
+def split_document(src: PdfSource, split_points: Optional[List[int]] = None) -> List["fitz.Document"]:
+    """按拆分点拆成多个内存文档，由调用方保存并关闭。"""
+    doc, owned = open_pdf(src, check_ext=False)
+    parts: List["fitz.Document"] = []
+    try:
+        for s, t in split_segments(len(doc), split_points):
+            part = fitz.open()
+            part.insert_pdf(doc, from_page=s, to_page=t)
+            parts.append(part)
+        return parts
+    except Exception:
+        for part in parts:
+            part.close()
+        raise
+    finally:
+        if owned:
+            doc.close()
 
-    if output_folder is None:
-        output_folder = os.path.dirname(input_pdf_path)
-
-    os.makedirs(output_folder, exist_ok=True)
 
-    base = os.path.splitext(os.path.basename(input_pdf_path))[0]
-    outputs: List[str] = []
-    for i, (s, t) in enumerate(segments, 1):
-        out_name = (
-            custom_names[i - 1]
-            if custom_names and i - 1 < len(custom_names)
-            else f"{base}_part{i}.pdf"
-        )
-        out_path = os.path.join(output_folder, out_name)
-        new_doc = fitz.open()
-        new_doc.insert_pdf(doc, from_page=s, to_page=t)
-        new_doc.save(out_path)
-        new_doc.close()
-        outputs.append(out_path)
+def split_pdf(
+    input_pdf_path: PdfSource,
+    split_points: Optional[List[int]] = None,
+    output_folder: Optional[str] = None,
+    custom_names: Optional[List[str]] = None,
+) -> List[str]:
+    if isinstance(input_pdf_path, str) and not os.path.exists(input_pdf_path):
+        raise FileNotFoundError(f"文件不存在: {input_pdf_path}")
 
-    doc.close()
-    return outputs
+    if output_folder is None:
+        output_folder = os.path.dirname(source_path(input_pdf_path))
+        if not output_folder and not isinstance(input_pdf_path, str):
+            raise ValueError("内存文档拆分时需指定输出文件夹")
+
+    parts = split_document(input_pdf_path, split_points)
+    try:
+        os.makedirs(output_folder or ".", exist_ok=True)
+
+        base = source_stem(input_pdf_path)
+        outputs: List[str] = []
+        for i, part in enumerate(parts, 1):
+            out_name = (
+                custom_names[i - 1]
+                if custom_names and i - 1 < len(custom_names)
+                else f"{base}_part{i}.pdf"
+            )
+            out_path = os.path.join(output_folder, out_name)
+            part.save(out_path)
+            outputs.append(out_path)
+        return outputs
+    finally:
+        for part in parts:
+            part.close()
 
 
 # -----------------------------
@@ -147,6 +174,23 @@ class SplitWorker(QThread):
             self.failed.emit(str(e))
 
 
+class SuggestWorker(QThread):
+    """后台计算智能拆分建议（书签或低分辨率页面分析），避免阻塞界面。"""
+    done = Signal(str, object, object, str)
+    failed = Signal(str, str)
+
+    def __init__(self, pdf_path: str):
+        super().__init__()
+        self.pdf_path = pdf_path
+
+    def run(self):
+        try:
+            pts, reasons, source = suggest_split_points(self.pdf_path)
+            self.done.emit(self.pdf_path, pts, reasons, source)
+        except Exception as e:
+            self.failed.emit(self.pdf_path, str(e))
+
+
 # -----------------------------
 # 界面层
 # -----------------------------
@@ -168,6 +212,7 @@ class PDFSplitWindow(QWidget):
         self.total_pages = 0
         self._drag_pos: Optional[QPoint] = None
         self.fit_full_page: bool = True  # 适应视口展示整页
+        self.suggest_worker: Optional[SuggestWorker] = None
 
         self._build_ui()
         self._apply_style()
@@ -381,15 +426,12 @@ class PDFSplitWindow(QWidget):
         root.addWidget(self.thumb_area)
 
     def _apply_style(self):
-        self.setStyleSheet(build_style(self.scale))
+        apply_style(self, self.scale)
 
     def resizeEvent(self, event):
         super().resizeEvent(event)
-        try:
-            self._reflow_layout()
-            self._apply_responsive_sizes()
-        except Exception:
-            pass
+        # 同一帧内的多次 resize 合并为一次重排
+        schedule_reflow(self)
 
     # 无标题栏拖拽
     def mousePressEvent(self, event):
@@ -410,8 +452,14 @@ class PDFSplitWindow(QWidget):
     # 交互
     def on_pick_pdf(self):
         path, _ = QFileDialog.getOpenFileName(self, "选择PDF文件", os.path.join(os.getcwd(), "测试材料"), "PDF 文件 (*.pdf)")
-        if not path:
+        if path:
+            self.open_files([path])
+
+    def open_files(self, paths: List[str]) -> None:
+        """外部打开文件（命令行参数或单实例转发），只取第一个文件。"""
+        if not paths:
             return
+        path = paths[0]
         self.pdf_path = path
         try:
             self.pdf_path_edit.setText(path)
@@ -479,14 +527,48 @@ class PDFSplitWindow(QWidget):
         if not self.pdf_path:
             QMessageBox.information(self, "提示", "请先选择PDF文件")
             return
-        pts = compute_smart_split_points(self.total_pages)
+        if self.suggest_worker is not None and self.suggest_worker.isRunning():
+            return
+        self.btn_smart.setEnabled(False)
+        self.btn_smart.setText("分析中...")
+        self.status_label.setText("正在分析书签与页面版式...")
+        self.suggest_worker = SuggestWorker(self.pdf_path)
+        self.suggest_worker.done.connect(self._on_suggest_done)
+        self.suggest_worker.failed.connect(self._on_suggest_failed)
+        self.suggest_worker.start()
+
+    def _finish_suggest(self):
+        self.btn_smart.setEnabled(True)
+        self.btn_smart.setText("智能建议")
+
+    def _on_suggest_done(self, pdf_path: str, pts: list, reasons: dict, source: str):
+        self._finish_suggest()
+        if pdf_path != self.pdf_path:
+            # 分析期间已切换文件，结果作废
+            return
+        if not pts:
+            # 无书签且未识别到空白页/章节页：按页数均分
+            pts = compute_smart_split_points(self.total_pages)
+            reasons = {p: "按页数均分" for p in pts}
+            source = "even"
         if not pts:
+            self.status_label.setText(f"已选择: {os.path.basename(pdf_path)}，共 {self.total_pages} 页")
             QMessageBox.information(self, "提示", "页数较少，无需拆分")
             return
         self.split_points = pts
         self._refresh_points_list()
         self._refresh_thumbnails()
-        QMessageBox.information(self, "智能建议", f"建议拆分点: {pts}\n将生成 {len(pts)+1} 个文件")
+        origin = {"toc": "依据书签", "analysis": "依据页面分析", "even": "按页数均分"}.get(source, "")
+        self.status_label.setText(f"智能建议（{origin}）：{len(pts)} 个拆分点")
+        lines = [f"第 {p} 页后：{reasons.get(p, '')}" for p in pts[:20]]
+        if len(pts) > 20:
+            lines.append(f"…… 共 {len(pts)} 个拆分点")
+        QMessageBox.information(self, "智能建议", f"{origin}，将生成 {len(pts)+1} 个文件\n\n" + "\n".join(lines))
+
+    def _on_suggest_failed(self, pdf_path: str, msg: str):
+        self._finish_suggest()
+        if pdf_path == self.pdf_path:
+            self.status_label.setText(f"智能建议失败：{msg}")
 
     def on_start_split(self):
         if not self.pdf_path:
@@ -761,7 +843,10 @@ class PDFSplitWindow(QWidget):
     def _apply_responsive_sizes(self):
         """为常用控件设置最小高度，并以字体度量作下限防止裁剪。"""
         try:
-            f = self._calc_size_factor()
+            # 尺寸因子按档位量化；缩放与档位均未变化时跳过控件尺寸重算
+            f = factor_bucket(self._calc_size_factor())
+            if not size_bucket_changed(self, self.scale, f):
+                return
             def H(base: int) -> int:
                 return int(dp(self.scale, base) * f)
 
@@ -875,4 +960,5 @@ def main():
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
@@ -49,7 +49,7 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt, QThread, Signal, QTimer
 from PySide6.QtGui import QPixmap, QImage
 
-from ui_style_nb import build_style, compute_scale, dp
+from ui_style_nb import apply_style, compute_scale, dp
 
 def _dbg(msg: str) -> None:
     try:
@@ -58,31 +58,14 @@ def _dbg(msg: str) -> None:
         pass
 
 
-def _ensure_models_dir() -> None:
+def _ensure_models_dir():
+    """后台释放 rapidocr_models（不阻塞），返回就绪任务以便按需等待具体模型。"""
     try:
-        frozen = getattr(sys, "frozen", False)
-        base = os.path.dirname(sys.executable) if frozen else os.getcwd()
-        dst = os.path.join(base, "rapidocr_models")
-        if os.path.isdir(dst):
-            return
-        src = None
-        # 优先从内嵌资源（_MEIPASS）复制
-        meipass = getattr(sys, "_MEIPASS", None)
-        if meipass:
-            cand = os.path.join(meipass, "rapidocr_models")
-            if os.path.isdir(cand):
-                src = cand
-        # 开发模式的备用源
-        if src is None:
-            dev_src = os.path.join(base, "rapidocr_models")
-            if os.path.isdir(dev_src):
-                src = dev_src
-        if src and os.path.isdir(src):
-            import shutil
-            shutil.copytree(src, dst, dirs_exist_ok=True)
-            _dbg(f"已从资源复制 rapidocr_models 到：{dst}")
+        from resource_provision import start_provision
+        return start_provision("rapidocr_models")
     except Exception as e:
         _dbg(f"自动创建 rapidocr_models 失败：{e}")
+        return None
 
 def _resource_path(rel: str) -> str:
     """仅在 exe 同目录解析资源路径（用户要求）。
@@ -135,8 +118,16 @@ def _get_rapid_engine() -> Optional[object]:
         return None
     if _rapid_engine is not None:
         return _rapid_engine
-    # 确保运行时存在 rapidocr_models 目录（优先从内嵌资源复制）
-    _ensure_models_dir()
+    # 确保运行时存在 rapidocr_models 目录（后台释放），此处只等待 ONNX 模型文件
+    prov = _ensure_models_dir()
+    if prov is not None:
+        try:
+            onnx = [f for f in prov.files(timeout=30) if f.lower().endswith(".onnx")]
+            if not prov.wait(onnx, timeout=120):
+                failed = prov.failures()
+                _dbg(f"rapidocr_models 模型释放失败：{failed}" if failed else "等待 rapidocr_models 模型就绪超时")
+        except Exception as e:
+            _dbg(f"等待 rapidocr_models 失败：{e}")
     model_root = _resource_path("rapidocr_models")
     if not os.path.isdir(model_root):
         _dbg(f"未找到 rapidocr_models 目录：{model_root}")
@@ -450,7 +441,7 @@ class Png2ExcelWindow(QWidget):
         except Exception:
             pass
         self.scale = scale if scale is not None else compute_scale(QApplication.instance())
-        self.setStyleSheet(build_style(self.scale))
+        apply_style(self, self.scale)
         self.resize(dp(self.scale, 900), dp(self.scale, 600))
 
         self.image_path: Optional[str] = None
@@ -574,7 +565,7 @@ class Png2ExcelWindow(QWidget):
     def _apply_style(self):
         # 供主窗口缩放时调用，统一更新样式与尺寸
         try:
-            self.setStyleSheet(build_style(self.scale))
+            apply_style(self, self.scale)
         except Exception:
             pass
         try:
@@ -585,8 +576,14 @@ class Png2ExcelWindow(QWidget):
     def _on_pick_image(self):
         exts = "图片文件 (*.png *.jpg *.jpeg *.bmp *.webp)"
         path, _ = QFileDialog.getOpenFileName(self, "选择图片", os.path.join(os.getcwd(), "测试材料"), exts)
-        if not path:
+        if path:
+            self.open_files([path])
+
+    def open_files(self, paths: List[str]) -> None:
+        """外部打开文件（命令行参数或单实例转发），只取第一个文件。"""
+        if not paths:
             return
+        path = paths[0]
         self.image_path = path
         _dbg(f"选择图片：{path}")
         self.path_edit.setText(path)
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+逐页渲染的断点续传清单（供 pdf2images 输出到文件夹时使用，不依赖 Qt）
+
+- 清单（sidecar JSON）记录每页的源内容哈希、渲染参数与输出哈希
+- 重跑时只处理缺失、参数变化、输出损坏或源页内容变化的页
+- 源页哈希只读取页面内容流与所引用资源的原始数据，不做渲染，远快于重新出图
+"""
+
+import os
+import json
+import hashlib
+from typing import Dict, Optional
+
+import fitz  # PyMuPDF
+
+MANIFEST_VERSION = 1
+
+
+def page_fingerprint(doc: "fitz.Document", page: "fitz.Page", _xref_cache: Optional[Dict[int, bytes]] = None) -> str:
+    """页面内容哈希：页面尺寸/旋转 + 内容流 + 引用的图片/XObject/字体/注释。
+
+    _xref_cache 用于同一文档多页共享资源（字体、Logo 等）时避免重复读取与哈希。
+    """
+    cache = _xref_cache if _xref_cache is not None else {}
+
+    def xref_digest(xref: int, with_stream: bool) -> bytes:
+        d = cache.get(xref)
+        if d is None:
+            hx = hashlib.sha256()
+            try:
+                hx.update(doc.xref_object(xref, compressed=True).encode("utf-8", "ignore"))
+                if with_stream:
+                    raw = doc.xref_stream_raw(xref)
+                    if raw:
+                        hx.update(raw)
+            except Exception:
+                hx.update(f"xref:{xref}".encode())
+            d = hx.digest()
+            cache[xref] = d
+        return d
+
+    h = hashlib.sha256()
+    r = page.rect
+    h.update(f"{r.x0:.3f},{r.y0:.3f},{r.x1:.3f},{r.y1:.3f}|{page.rotation}|".encode())
+    try:
+        h.update(page.read_contents())
+    except Exception:
+        pass
+    try:
+        for item in page.get_images(full=True):
+            h.update(xref_digest(item[0], True))
+    except Exception:
+        pass
+    try:
+        for item in page.get_xobjects():
+            h.update(xref_digest(item[0], True))
+    except Exception:
+        pass
+    try:
+        for item in page.get_fonts(full=True):
+            h.update(xref_digest(item[0], False))
+    except Exception:
+        pass
+    try:
+        for annot in page.annots() or []:
+            h.update(xref_digest(annot.xref, False))
+    except Exception:
+        pass
+    return h.hexdigest()
+
+
+def file_sha256(path: str, chunk: int = 1024 * 1024) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while True:
+            b = f.read(chunk)
+            if not b:
+                break
+            h.update(b)
+    return h.hexdigest()
+
+
+def file_stat(path: str) -> Optional[list]:
+    try:
+        st = os.stat(path)
+        return [int(st.st_size), int(st.st_mtime_ns)]
+    except OSError:
+        return None
+
+
+class RenderManifest:
+    """sidecar 清单：{"version", "source", "pages": {键: {"src", "params", "out", "stat"}}, ...}。"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.data: dict = {"version": MANIFEST_VERSION, "pages": {}}
+
+    @classmethod
+    def load(cls, path: str) -> "RenderManifest":
+        m = cls(path)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, dict) and data.get("version") == MANIFEST_VERSION and isinstance(data.get("pages"), dict):
+                m.data = data
+        except Exception:
+            pass
+        return m
+
+    @property
+    def pages(self) -> Dict[str, dict]:
+        return self.data["pages"]
+
+    def get(self, key: str) -> Optional[dict]:
+        return self.pages.get(key)
+
+    def matches(self, key: str, src_hash: str, params: dict) -> bool:
+        e = self.pages.get(key)
+        return bool(e) and e.get("src") == src_hash and e.get("params") == params
+
+    def file_valid(self, key: str, path: str) -> bool:
+        """输出文件是否仍是上次写入的结果：大小+修改时间一致直接通过，否则回退为内容哈希比对。"""
+        e = self.pages.get(key)
+        if not e or not os.path.exists(path):
+            return False
+        st = file_stat(path)
+        if st is not None and st == e.get("stat"):
+            return True
+        try:
+            if file_sha256(path) == e.get("out"):
+                e["stat"] = st
+                return True
+        except OSError:
+            pass
+        return False
+
+    def record(self, key: str, src_hash: str, params: dict, out_hash: str, path: Optional[str] = None) -> None:
+        entry = {"src": src_hash, "params": params, "out": out_hash}
+        if path:
+            entry["stat"] = file_stat(path)
+        self.pages[key] = entry
+
+    def save(self) -> None:
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.data, f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+        except Exception:
+            pass
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+资源目录后台就绪（打包后从内嵌资源释放到 exe 同目录）
+
+- 后台线程处理，不阻塞窗口显示
+- 优先硬链接，其次符号链接（仅当源目录持久存在时），最后才复制
+- 启动时只扫描文件列表与大小，随即可用 files() / wait()；逐个文件校验，校验通过或释放完成即标记就绪
+- 通过清单（构建标识 + 文件相对路径 + 大小）判断是否已就绪：构建标识取 exe 的大小与修改时间，
+  onefile 每次启动都会重新解压 _MEIPASS，源文件的修改时间不可靠，不参与校验；
+  同一构建只比较大小，构建变化后才逐个比较内容哈希，只重新释放内容不同的文件
+- 使用方只等待自己需要的文件：wait(names=[...])，被等待的文件优先处理；释放失败时 wait 返回 False
+"""
+
+import os
+import sys
+import json
+import shutil
+import hashlib
+import tempfile
+import threading
+from typing import Dict, Iterable, List, Optional
+
+MANIFEST_NAME = ".provision_manifest.json"
+
+
+def _dbg(msg: str) -> None:
+    try:
+        print(f"[Provision] {msg}", flush=True)
+    except Exception:
+        pass
+
+
+def _base_dir() -> str:
+    return os.path.dirname(sys.executable) if getattr(sys, "frozen", False) else os.getcwd()
+
+
+def _file_hash(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _build_id() -> str:
+    """当前构建的标识：exe 的大小与修改时间（exe 不在 _MEIPASS 中，只随重新打包变化）。"""
+    if not getattr(sys, "frozen", False):
+        return ""
+    try:
+        st = os.stat(sys.executable)
+        return f"{st.st_size}:{st.st_mtime_ns}"
+    except OSError:
+        return ""
+
+
+def _scan_source(src: str) -> Dict[str, int]:
+    """生成源文件列表：{相对路径: 大小}（不读取内容）。"""
+    entries: Dict[str, int] = {}
+    for root, _dirs, files in os.walk(src):
+        for f in files:
+            p = os.path.join(root, f)
+            rel = os.path.relpath(p, src).replace(os.sep, "/")
+            try:
+                entries[rel] = int(os.path.getsize(p))
+            except OSError:
+                pass
+    return entries
+
+
+def _checksum(build: str, entries: Dict[str, int]) -> str:
+    h = hashlib.sha256(f"{build}\n".encode("utf-8"))
+    for rel in sorted(entries):
+        h.update(f"{rel}\0{entries[rel]}\n".encode("utf-8"))
+    return h.hexdigest()
+
+
+def _is_persistent_source(src: str) -> bool:
+    """onefile 打包的 _MEIPASS 位于临时目录，进程退出即删除，不能用符号链接指向它。"""
+    try:
+        tmp = os.path.realpath(tempfile.gettempdir())
+        return os.path.commonpath([os.path.realpath(src), tmp]) != tmp
+    except Exception:
+        return False
+
+
+class Provision:
+    """单个资源目录的后台就绪任务。"""
+
+    def __init__(self, dir_name: str, src: Optional[str], dst: str):
+        self.dir_name = dir_name
+        self.src = src
+        self.dst = dst
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+        self._pending: List[str] = []
+        self._priority: List[str] = []
+        self._done: set[str] = set()
+        self._failed: Dict[str, str] = {}
+        self._entries: Dict[str, int] = {}
+        self._scanned = False
+        self._finished = False
+        self._thread: Optional[threading.Thread] = None
+        self.mode = "none"
+
+    # ---- 对外接口 ----
+    def start(self) -> "Provision":
+        self._thread = threading.Thread(target=self._run, name=f"provision-{self.dir_name}", daemon=True)
+        self._thread.start()
+        return self
+
+    def files(self, timeout: Optional[float] = None) -> List[str]:
+        """返回源目录中的文件列表（相对路径），必要时等待扫描完成。"""
+        with self._cond:
+            self._cond.wait_for(lambda: self._scanned or self._finished, timeout=timeout)
+            return sorted(self._entries)
+
+    def wait(self, names: Optional[Iterable[str]] = None, timeout: Optional[float] = None) -> bool:
+        """等待指定文件（相对路径）就绪；names 为空时等待整个目录。被等待的文件会被优先处理。
+
+        超时或其中有文件释放失败时返回 False（失败原因见 failures()）。
+        """
+        wanted = [n.replace("\\", "/") for n in names] if names is not None else None
+        with self._cond:
+            if wanted:
+                # 将需要的文件提到队列最前（扫描尚未完成时先记下，排队时再前置）
+                self._priority.extend(n for n in wanted if n not in self._priority)
+                front = [n for n in wanted if n in self._pending]
+                if front:
+                    self._pending = front + [n for n in self._pending if n not in front]
+            if not self._cond.wait_for(lambda: self._ready(wanted), timeout=timeout):
+                return False
+            return not any(n in self._failed for n in (wanted if wanted is not None else self._failed))
+
+    def failures(self) -> Dict[str, str]:
+        """释放失败的文件：{相对路径: 错误信息}。"""
+        with self._lock:
+            return dict(self._failed)
+
+    def is_finished(self) -> bool:
+        with self._lock:
+            return self._finished
+
+    # ---- 内部实现 ----
+    def _ready(self, wanted: Optional[List[str]]) -> bool:
+        if self._finished:
+            return True
+        if wanted is None:
+            return False
+        return all(n in self._done or n in self._failed for n in wanted)
+
+    def _finish(self) -> None:
+        with self._cond:
+            self._finished = True
+            self._cond.notify_all()
+
+    def _read_manifest(self) -> Optional[dict]:
+        try:
+            with open(os.path.join(self.dst, MANIFEST_NAME), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            return None
+
+    def _write_manifest(self, checksum: str) -> None:
+        try:
+            with open(os.path.join(self.dst, MANIFEST_NAME), "w", encoding="utf-8") as f:
+                json.dump({"checksum": checksum, "mode": self.mode}, f, ensure_ascii=False)
+        except Exception as e:
+            _dbg(f"写入清单失败：{self.dir_name}: {e}")
+
+    def _dst_valid(self, rel: str) -> bool:
+        p = os.path.join(self.dst, rel)
+        try:
+            return os.path.getsize(p) == self._entries[rel]
+        except OSError:
+            return False
+
+    def _dst_same(self, rel: str) -> bool:
+        """目标文件是否与源内容一致：大小相同后，是同一文件（硬链接）或内容哈希相同。"""
+        if not self._dst_valid(rel):
+            return False
+        s = os.path.join(self.src, rel)
+        d = os.path.join(self.dst, rel)
+        try:
+            return os.path.samefile(s, d) or _file_hash(d) == _file_hash(s)
+        except OSError:
+            return False
+
+    def _place(self, rel: str, allow_symlink: bool) -> None:
+        s = os.path.join(self.src, rel)
+        d = os.path.join(self.dst, rel)
+        os.makedirs(os.path.dirname(d), exist_ok=True)
+        if os.path.lexists(d):
+            os.remove(d)
+        try:
+            os.link(s, d)
+            self.mode = "hardlink" if self.mode in ("none", "hardlink") else "mixed"
+            return
+        except OSError:
+            pass
+        if allow_symlink:
+            try:
+                os.symlink(s, d)
+                self.mode = "symlink" if self.mode in ("none", "symlink") else "mixed"
+                return
+            except OSError:
+                pass
+        shutil.copy2(s, d)
+        self.mode = "copy" if self.mode in ("none", "copy") else "mixed"
+
+    def _run(self) -> None:
+        try:
+            if not self.src or not os.path.isdir(self.src):
+                return
+            entries = _scan_source(self.src)
+            checksum = _checksum(_build_id(), entries)
+            manifest = self._read_manifest()
+            # 同一构建、文件列表与大小均未变：只做廉价的大小校验；否则逐个比较内容哈希
+            same_build = bool(manifest) and manifest.get("checksum") == checksum
+            with self._cond:
+                self._entries = entries
+                self._scanned = True
+                # 先处理已被等待的文件，其余按体积从小到大
+                self._pending = sorted(entries, key=lambda r: (r not in self._priority, entries[r]))
+                self._cond.notify_all()
+
+            allow_symlink = _is_persistent_source(self.src)
+            placed = 0
+            while True:
+                with self._cond:
+                    if not self._pending:
+                        break
+                    rel = self._pending.pop(0)
+                try:
+                    if not (self._dst_valid(rel) if same_build else self._dst_same(rel)):
+                        os.makedirs(self.dst, exist_ok=True)
+                        self._place(rel, allow_symlink)
+                        placed += 1
+                except Exception as e:
+                    _dbg(f"释放失败：{self.dir_name}/{rel}: {e}")
+                    with self._cond:
+                        self._failed[rel] = str(e)
+                        self._cond.notify_all()
+                    continue
+                with self._cond:
+                    self._done.add(rel)
+                    self._cond.notify_all()
+            if self._failed:
+                # 有文件未就绪：不记录清单，下次启动重新校验
+                return
+            if placed or not same_build:
+                if not placed and manifest:
+                    self.mode = manifest.get("mode", self.mode)
+                self._write_manifest(checksum)
+            if placed:
+                _dbg(f"已就绪 {self.dir_name}（{self.mode}，释放 {placed} 个文件）：{self.dst}")
+        except Exception as e:
+            _dbg(f"自动创建资源目录失败：{self.dir_name}: {e}")
+        finally:
+            self._finish()
+
+
+_PROVISIONS: Dict[str, Provision] = {}
+_PROVISIONS_LOCK = threading.Lock()
+
+
+def start_provision(dir_name: str) -> Provision:
+    """启动（或返回已启动的）资源目录后台就绪任务，立即返回。"""
+    with _PROVISIONS_LOCK:
+        prov = _PROVISIONS.get(dir_name)
+        if prov is not None:
+            return prov
+        dst = os.path.join(_base_dir(), dir_name)
+        src = None
+        meipass = getattr(sys, "_MEIPASS", None)
+        if meipass:
+            cand = os.path.join(meipass, dir_name)
+            if os.path.isdir(cand) and os.path.realpath(cand) != os.path.realpath(dst):
+                src = cand
+        prov = Provision(dir_name, src, dst)
+        _PROVISIONS[dir_name] = prov
+    return prov.start()
+
+
+def wait_for(dir_name: str, names: Optional[Iterable[str]] = None, timeout: Optional[float] = None) -> bool:
+    """阻塞直至指定目录中的某些文件就绪（未启动时自动启动）。"""
+    return start_provision(dir_name).wait(names, timeout=timeout)
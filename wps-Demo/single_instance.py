@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+单实例：通过本地套接字（Windows 命名管道 / Unix 域套接字）把再次启动的请求转交给已运行的主窗口
+
+- 启动时先尝试连接已运行实例：连上则发送一行 JSON {"files": [...], "tool": "..."}，收到 ok 后直接退出，
+  不再创建 QApplication、不重建窗口，已加载的模块与缓存继续复用
+- 连不上则由本进程监听；上次异常退出遗留的 Unix 套接字文件会先清理
+- 服务名按当前用户区分，多用户同时登录互不干扰
+- 转发发生在创建 QApplication 之前，第二个进程只付出解释器与 Qt 基础模块的导入开销
+"""
+
+import getpass
+import hashlib
+import json
+from typing import List, Optional
+
+from PySide6.QtCore import QObject, Signal
+from PySide6.QtNetwork import QLocalServer, QLocalSocket
+
+CONNECT_TIMEOUT_MS = 300
+ACK_TIMEOUT_MS = 2000
+MAX_MESSAGE_BYTES = 1024 * 1024
+
+
+def server_name(app_id: str = "LZ-PDFToolkit") -> str:
+    try:
+        user = getpass.getuser()
+    except Exception:
+        user = ""
+    return f"{app_id}-{hashlib.sha1(user.encode('utf-8')).hexdigest()[:12]}"
+
+
+def forward_to_running(files: List[str], tool: str = "", name: Optional[str] = None) -> bool:
+    """已有实例在运行时把文件与目标功能转交给它并返回 True；否则返回 False。"""
+    sock = QLocalSocket()
+    sock.connectToServer(name or server_name())
+    if not sock.waitForConnected(CONNECT_TIMEOUT_MS):
+        return False
+    try:
+        payload = json.dumps({"files": list(files), "tool": tool or ""}, ensure_ascii=False)
+        sock.write((payload + "\n").encode("utf-8"))
+        if not sock.waitForBytesWritten(ACK_TIMEOUT_MS):
+            return False
+        # 等待确认：已运行实例无响应（卡死）时由本进程自行启动
+        while not sock.canReadLine():
+            if not sock.waitForReadyRead(ACK_TIMEOUT_MS):
+                return False
+        return bytes(sock.readLine()).strip() == b"ok"
+    finally:
+        sock.disconnectFromServer()
+
+
+class InstanceServer(QObject):
+    """监听后续启动的转发请求，收到后发出 request(文件列表, 目标功能)。"""
+
+    request = Signal(list, str)
+
+    def __init__(self, name: Optional[str] = None, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.name = name or server_name()
+        self._server = QLocalServer(self)
+        self._server.setSocketOptions(QLocalServer.UserAccessOption)
+        self._server.newConnection.connect(self._on_new_connection)
+        self._buffers: dict = {}
+
+    def listen(self) -> bool:
+        if self._server.listen(self.name):
+            return True
+        # 遗留的套接字文件（上次异常退出）：确认无人监听后清理重试
+        if self._server.serverError() == QLocalSocket.AddressInUseError:
+            probe = QLocalSocket()
+            probe.connectToServer(self.name)
+            if probe.waitForConnected(CONNECT_TIMEOUT_MS):
+                probe.disconnectFromServer()
+                return False
+            QLocalServer.removeServer(self.name)
+            return self._server.listen(self.name)
+        print(f"单实例监听失败：{self._server.errorString()}")
+        return False
+
+    def close(self) -> None:
+        self._server.close()
+
+    def _on_new_connection(self) -> None:
+        while self._server.hasPendingConnections():
+            sock = self._server.nextPendingConnection()
+            self._buffers[sock] = b""
+            sock.readyRead.connect(lambda s=sock: self._on_ready_read(s))
+            sock.disconnected.connect(lambda s=sock: self._drop(s))
+
+    def _on_ready_read(self, sock: QLocalSocket) -> None:
+        buf = self._buffers.get(sock, b"") + bytes(sock.readAll())
+        if len(buf) > MAX_MESSAGE_BYTES:
+            sock.abort()
+            self._drop(sock)
+            return
+        self._buffers[sock] = buf
+        if b"\n" not in buf:
+            return
+        line = buf.split(b"\n", 1)[0]
+        try:
+            msg = json.loads(line.decode("utf-8"))
+            files = [str(p) for p in msg.get("files") or []]
+            tool = str(msg.get("tool") or "")
+        except Exception as e:
+            print(f"单实例请求解析失败：{e}")
+            sock.abort()
+            self._drop(sock)
+            return
+        sock.write(b"ok\n")
+        sock.flush()
+        sock.disconnectFromServer()
+        self.request.emit(files, tool)
+
+    def _drop(self, sock: QLocalSocket) -> None:
+        if self._buffers.pop(sock, None) is not None:
+            sock.deleteLater()
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+智能拆分建议（PDF 拆分页使用，不依赖 Qt）
+
+- 有书签时：按顶层书签（章节）起始页拆分；顶层只有一项时改用下一层
+- 无书签时：以极小缩放渲染全部页面（多进程并行），用 NumPy 统计每页墨迹：
+  * 空白页（几乎无墨迹）视为分隔页，在其后拆分
+  * 墨迹远少于正文页、集中在一小块区域且起始位置明显低于正文页上边距的页视为章节标题页，在其前拆分
+    （章末不满一页的正文页从正常上边距开始，不会被误判）
+- 都没有结果时返回空列表，由调用方回退为按页数均分（pdf_split.compute_smart_split_points）
+
+拆分点与 split_pdf 一致：新一段起始页的 0 基序号（即“第 p 页之后拆分”）。
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import fitz  # PyMuPDF
+import numpy as np
+
+# 分析用渲染缩放：A4 约 70×100 像素，足以判断墨迹分布
+ANALYSIS_ZOOM = 0.12
+# 灰度低于该值视为墨迹
+INK_LEVEL = 200
+# 墨迹像素占比低于该值视为空白页
+BLANK_INK_RATIO = 0.002
+# 标题页：墨迹不超过正文页中位数的该比例，有墨迹的行跨度不超过页高的该比例，
+# 且首个墨迹行比正文页（中位数）低出页高的该比例以上
+TITLE_INK_FACTOR = 0.35
+TITLE_ROW_SPAN = 0.45
+TITLE_TOP_OFFSET = 0.08
+# 拆分后每段至少的页数
+MIN_SEGMENT_PAGES = 2
+# 页数不超过该值时在当前进程内分析，省去进程启动开销
+INPROCESS_MAX_PAGES = 150
+MAX_WORKERS = 8
+
+
+PageStats = Tuple[float, float, float]
+
+
+def _page_stats(pix: "fitz.Pixmap") -> PageStats:
+    """返回 (墨迹像素占比, 有墨迹的行跨度占页高比例, 首个墨迹行位置占页高比例)。"""
+    a = np.frombuffer(pix.samples, dtype=np.uint8)
+    if pix.stride != pix.width * pix.n:
+        a = a.reshape(pix.height, pix.stride)[:, : pix.width * pix.n]
+    a = a.reshape(pix.height, pix.width, pix.n)
+    gray = a[..., 0] if pix.n == 1 else a[..., :3].min(axis=2)
+    ink = gray < INK_LEVEL
+    ratio = float(ink.mean()) if ink.size else 0.0
+    rows = np.flatnonzero(ink.any(axis=1))
+    if not rows.size:
+        return ratio, 0.0, 1.0
+    return ratio, float(rows[-1] - rows[0] + 1) / pix.height, float(rows[0]) / pix.height
+
+
+def _analyze_range(pdf_path: str, start: int, stop: int, zoom: float) -> List[PageStats]:
+    """分析 [start, stop) 页；作为进程池任务，每个进程自行打开文档。"""
+    doc = fitz.open(pdf_path)
+    try:
+        mat = fitz.Matrix(zoom, zoom)
+        out = []
+        for i in range(start, stop):
+            try:
+                pix = doc[i].get_pixmap(matrix=mat, colorspace=fitz.csGRAY, alpha=False, annots=False)
+                out.append(_page_stats(pix))
+            except Exception:
+                # 渲染失败的页不参与判断（视为普通正文页）
+                out.append((-1.0, 1.0, 0.0))
+        return out
+    finally:
+        doc.close()
+
+
+def analyze_pages(pdf_path: str, total_pages: int, zoom: float = ANALYSIS_ZOOM,
+                  max_workers: Optional[int] = None) -> List[PageStats]:
+    """按页返回 (墨迹占比, 行跨度, 首行位置)；页数较多时按区间分给多个进程并行渲染。"""
+    workers = max(1, min(max_workers or os.cpu_count() or 1, MAX_WORKERS))
+    if total_pages <= INPROCESS_MAX_PAGES or workers == 1:
+        return _analyze_range(pdf_path, 0, total_pages, zoom)
+    # 每个进程分几段，前面的段先完成也不会让其他进程空闲太久
+    chunks = workers * 3
+    step = max(1, -(-total_pages // chunks))
+    ranges = [(s, min(total_pages, s + step)) for s in range(0, total_pages, step)]
+    stats: List[PageStats] = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for part in pool.map(_analyze_range, [pdf_path] * len(ranges), [r[0] for r in ranges],
+                             [r[1] for r in ranges], [zoom] * len(ranges)):
+            stats.extend(part)
+    return stats
+
+
+def points_from_stats(stats: List[PageStats], min_segment: int = MIN_SEGMENT_PAGES) -> Dict[int, str]:
+    """由每页统计得出 {拆分点: 原因}。"""
+    total = len(stats)
+    arr = np.array(stats, dtype=np.float64).reshape(-1, 3)
+    body = arr[arr[:, 0] >= BLANK_INK_RATIO]
+    median_ink = float(np.median(body[:, 0])) if body.size else 0.0
+    median_top = float(np.median(body[:, 2])) if body.size else 0.0
+
+    found: Dict[int, str] = {}
+    for i, (ratio, span, top) in enumerate(stats):
+        if ratio < 0:
+            continue
+        if ratio < BLANK_INK_RATIO:
+            # 连续空白页取最后一页之后
+            if i + 1 < total and 0 <= stats[i + 1][0] < BLANK_INK_RATIO:
+                continue
+            found.setdefault(i + 1, f"第 {i + 1} 页为空白页")
+        elif (median_ink and ratio <= median_ink * TITLE_INK_FACTOR and span <= TITLE_ROW_SPAN
+              and top >= median_top + TITLE_TOP_OFFSET):
+            # 前一页是空白页时，空白页规则已给出同一拆分点
+            found.setdefault(i, f"第 {i + 1} 页疑似章节标题页")
+    return _enforce_min_segment(found, total, min_segment)
+
+
+def _enforce_min_segment(found: Dict[int, str], total: int, min_segment: int) -> Dict[int, str]:
+    kept: Dict[int, str] = {}
+    last = 0
+    for p in sorted(found):
+        if p - last >= min_segment and total - p >= min_segment:
+            kept[p] = found[p]
+            last = p
+    return kept
+
+
+def toc_split_points(toc: List[list], total_pages: int, min_segment: int = MIN_SEGMENT_PAGES) -> Dict[int, str]:
+    """按书签拆分：从最高层级开始，找到能拆出至少两段的那一层。"""
+    levels = sorted({int(it[0]) for it in toc if len(it) >= 3})
+    for level in levels:
+        found: Dict[int, str] = {}
+        for it in toc:
+            if len(it) < 3 or int(it[0]) != level:
+                continue
+            p = int(it[2]) - 1  # 书签页码为 1 基，拆分点为新段起始页的 0 基序号
+            if 1 <= p < total_pages:
+                found.setdefault(p, f"书签：{it[1]}")
+        found = _enforce_min_segment(found, total_pages, min_segment)
+        if found:
+            return found
+    return {}
+
+
+def suggest_split_points(pdf_path: str, max_workers: Optional[int] = None) -> Tuple[List[int], Dict[int, str], str]:
+    """返回 (拆分点, {拆分点: 原因}, 来源)；来源为 "toc" / "analysis"，未找到时为 ([], {}, "")。"""
+    doc = fitz.open(pdf_path)
+    try:
+        total = len(doc)
+        toc = doc.get_toc(simple=True) or []
+    finally:
+        doc.close()
+
+    if toc:
+        found = toc_split_points(toc, total)
+        if found:
+            return sorted(found), found, "toc"
+    if total > MIN_SEGMENT_PAGES * 2:
+        found = points_from_stats(analyze_pages(pdf_path, total, max_workers=max_workers))
+        if found:
+            return sorted(found), found, "analysis"
+    return [], {}, ""
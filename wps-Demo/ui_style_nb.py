@@ -30,7 +30,64 @@ def apply_base_font(app: QApplication, scale: float) -> None:
     app.setFont(font)
 
 
+# 样式表缓存：按缩放档位（0.05 一档）与配色文件修改时间缓存，滑杆拖动时不再重复生成
+_STYLE_STEP = 0.05
+_STYLE_CACHE: Dict[tuple, str] = {}
+_PALETTE_CACHE: Dict[str, object] = {"mtime": None, "palette": None}
+
+
+def style_bucket(scale: float) -> float:
+    return round(round(float(scale) / _STYLE_STEP) * _STYLE_STEP, 4)
+
+
+def _palette_path() -> str:
+    return os.path.join(os.path.dirname(__file__), "ui_palette.json")
+
+
+def _palette_mtime() -> Optional[float]:
+    try:
+        return os.path.getmtime(_palette_path())
+    except OSError:
+        return None
+
+
+def _load_file_palette() -> Optional[Dict[str, str]]:
+    mtime = _palette_mtime()
+    if _PALETTE_CACHE["mtime"] == mtime and mtime is not None:
+        return _PALETTE_CACHE["palette"]  # type: ignore[return-value]
+    file_palette = None
+    try:
+        p = _palette_path()
+        if os.path.exists(p):
+            with open(p, "r", encoding="utf-8") as f:
+                file_palette = json.load(f)
+    except Exception:
+        file_palette = None
+    _PALETTE_CACHE["mtime"] = mtime
+    _PALETTE_CACHE["palette"] = file_palette
+    return file_palette
+
+
 def build_style(scale: float, palette: Optional[Dict[str, str]] = None) -> str:
+    """生成样式表；未传入 palette 时按缩放档位缓存。"""
+    if palette is not None:
+        return _build_style(scale, palette)
+    key = (style_bucket(scale), _palette_mtime())
+    css = _STYLE_CACHE.get(key)
+    if css is None:
+        css = _build_style(key[0], None)
+        _STYLE_CACHE[key] = css
+    return css
+
+
+def apply_style(widget, scale: float) -> None:
+    """仅当样式表实际变化时才设置，避免同档位下重复触发整棵控件树的重新 polish。"""
+    css = build_style(scale)
+    if widget.styleSheet() != css:
+        widget.setStyleSheet(css)
+
+
+def _build_style(scale: float, palette: Optional[Dict[str, str]] = None) -> str:
     # Sizes
     b = dp(scale, 1)
     r_card = dp(scale, 10)
@@ -54,14 +111,7 @@ def build_style(scale: float, palette: Optional[Dict[str, str]] = None) -> str:
     }
 
     # 允许通过外部 JSON（ui_palette.json）或传入参数覆盖配色
-    file_palette = None
-    try:
-        p = os.path.join(os.path.dirname(__file__), "ui_palette.json")
-        if os.path.exists(p):
-            with open(p, "r", encoding="utf-8") as f:
-                file_palette = json.load(f)
-    except Exception:
-        file_palette = None
+    file_palette = _load_file_palette()
 
     final_palette = {**default_palette, **(file_palette or {}), **(palette or {})}
 